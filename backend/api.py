@@ -1,20 +1,96 @@
-from fastapi import FastAPI, HTTPException, Query, Body
+from fastapi import FastAPI, HTTPException, Query, Request, UploadFile, File, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ValidationError, field_validator
 from typing import List, Optional, Dict, Any
 import logging
+import asyncio
 import contextlib
+import json
 import os
-from datetime import datetime, timedelta, date
+import threading
+from datetime import datetime, timedelta
 
 # Relative imports
-from database import db
-from parser import parser
-from scheduler import scheduler, KOLKATA
+# Endpoints await adb; db is for blocking helpers already running on the DB threads
+from database import db, adb, Database, TIMELINE_GROUPS, DEFAULT_USER
+from database.times import to_epoch
+from parser import parser, parse_message, create_parse_executor
+from scheduler import scheduler, KOLKATA, REMINDER_JOBSTORE
+from notifier import notifier
+from recurrence import rule_for
+from calendar_cache import calendar_cache
+from reminder_cache import reminder_cache
+from serialization import json_response
+import importer
+import metrics
+from metrics import Histogram, Callback, RequestTimer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("api")
 
+# Statuses that still have a pending scheduler job
+ACTIVE_STATUSES = ('active', 'snoozed')
+
+# Notification stream: keep-alive comment interval and client reconnect delay
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_RETRY_MS = 3000
+# SCHEDULER_MODE=external: how often a worker polls for notifications the scheduler service wrote
+NOTIFICATION_RELAY_INTERVAL = int(os.getenv("NOTIFICATION_RELAY_MS", "500")) / 1000
+
+# Default page size for GET /notifications
+NOTIFICATION_PAGE_SIZE = 100
+
+# Default rows per bucket for GET /tasks/timeline
+TIMELINE_PAGE_SIZE = 50
+
+# Upper bound on messages accepted by POST /chat/batch
+MAX_BATCH_MESSAGES = 200
+
+# Limits for POST /tasks/bulk and POST /tasks/import
+MAX_BULK_TASKS = 5000
+MAX_IMPORT_BYTES = 2 * 1024 * 1024
+
+REPEAT_TYPES = ('once', 'daily', 'weekly', 'monthly')
+
+# Longest accepted user name (X-User header / user query parameter)
+MAX_USER_NAME = 64
+
+# Bounded pool for parser.parse, created in lifespan. None = loop's default executor.
+parse_executor = None
+
+# How often the event loop probe schedules itself; lateness beyond this is loop lag
+LOOP_PROBE_INTERVAL = 0.5
+
+# --- Metrics ---
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time from request to response start, by endpoint.", ("method", "route", "status")
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Database method calls, by method.", ("method",), buckets=metrics.FAST_BUCKETS
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a timer it was due to run.", buckets=metrics.FAST_BUCKETS
+)
+# Times every db.* and adb.* call made by this process
+metrics.instrument(Database, DB_QUERY_DURATION)
+
+def _scheduler_jobs():
+    if not scheduler.is_running:
+        return None
+    return {
+        (REMINDER_JOBSTORE,): scheduler.jobstore.count_jobs(),
+        ('default',): len(scheduler.scheduler.get_jobs(jobstore='default')),
+    }
+
+Callback("sqlite_connections_opened_total", "SQLite connections opened by the pool.", lambda: db.pool.opened, kind='counter')
+Callback("scheduler_jobs", "APScheduler jobs by job store.", _scheduler_jobs, ("jobstore",))
+Callback(
+    "reminder_dispatcher_pending", "Reminders waiting on the heap dispatcher (DISPATCH_ENGINE=heap).",
+    lambda: scheduler.dispatcher.pending if scheduler.dispatcher and scheduler.is_running else None
+)
+
 # --- Pydantic Models ---
 
 class ChatRequest(BaseModel):
@@ -27,8 +103,16 @@ class TaskCreate(BaseModel):
     run_time: str # ISO string
     description: Optional[str] = None
     repeat_type: Optional[str] = 'once'
+    # Recurrence details beyond repeat_type: interval, weekdays, month_days, until, count
+    repeat_payload: Optional[Dict[str, Any]] = None
     priority: Optional[int] = 1
 
+    @field_validator('repeat_type')
+    @classmethod
+    def _null_repeat_is_once(cls, value):
+        # Clients send an explicit null for a one-off, as they always could
+        return 'once' if value is None else value
+
 class TaskUpdate(BaseModel):
     task: Optional[str] = None
     description: Optional[str] = None
@@ -36,21 +120,59 @@ class TaskUpdate(BaseModel):
     priority: Optional[int] = None
     status: Optional[str] = None
 
+class NotificationAck(BaseModel):
+    ids: Optional[List[int]] = None
+    from_id: Optional[int] = None # inclusive range, either end may be open
+    to_id: Optional[int] = None
+
 class ChatResponse(BaseModel):
     type: str # 'reminder_created', 'text', 'error', 'preview', 'confirmation_card'
     message: str
     data: Optional[dict] = None
 
+class ChatBatchRequest(BaseModel):
+    messages: List[str]
+    local_time: Optional[str] = None
+
 # --- Lifecycle ---
 
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
+    global parse_executor
     logger.info("📦 Backend initializing...")
-    scheduler.start()
-    scheduler.load_jobs_from_db()
+    # Load dateparser off the request path so the first /chat after a cold start is fast
+    threading.Thread(target=parser.warm_up, name="parser-warm-up", daemon=True).start()
+    parse_executor = create_parse_executor()
+    probe = asyncio.create_task(_probe_event_loop())
+    relay = None
+    if scheduler.delegated:
+        # Reminders fire in scheduler_service.py; this worker only relays their notifications
+        relay = asyncio.create_task(_relay_notifications())
+        logger.info("📨 Scheduling delegated to the scheduler service.")
+    else:
+        scheduler.start()
+        scheduler.load_jobs_from_db()
     logger.info("✅ Startup complete. System ready.")
     yield
     logger.info("🛑 Backend shutting down.")
+    probe.cancel()
+    if relay:
+        relay.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await relay
+    else:
+        scheduler.shutdown()
+    adb.shutdown()
+    parse_executor.shutdown(wait=False, cancel_futures=True)
+    parse_executor = None
+
+async def _probe_event_loop():
+    """Record how late each sleep wakes: time the loop spent on something else."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LOOP_PROBE_INTERVAL)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - LOOP_PROBE_INTERVAL))
 
 app = FastAPI(title="AI BUDDY API", lifespan=lifespan)
 
@@ -63,6 +185,44 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestTimer, histogram=HTTP_LATENCY)
+
+# --- Identity ---
+# The user name is taken as given: nothing here authenticates it, so anyone who
+# can reach the API can act as any user by naming them. Deploy behind a proxy
+# that authenticates the client and sets X-User (and strips any it sent).
+
+def _user_name(x_user, user):
+    """The requesting user's name, from the X-User header or, where a client cannot
+    set headers (EventSource), the user query parameter.
+
+    Requests that name no one act as the default user, who owns the data
+    from before there were users.
+    """
+    name = (x_user or user or DEFAULT_USER).strip()
+    if not name or len(name) > MAX_USER_NAME:
+        raise HTTPException(status_code=400, detail=f"User name must be 1-{MAX_USER_NAME} characters")
+    return name
+
+async def current_user(x_user: Optional[str] = Header(None), user: Optional[str] = Query(None)) -> int:
+    """Id of the requesting user, created on first use. Only for endpoints that store new reminders."""
+    return await adb.get_user_id(_user_name(x_user, user))
+
+async def known_user(x_user: Optional[str] = Header(None), user: Optional[str] = Query(None)) -> int:
+    """Id of the requesting user, who must already exist (404 otherwise).
+
+    Reads and changes to existing rows never create users, so naming
+    arbitrary users cannot fill the users table.
+    """
+    user_id = await adb.find_user_id(_user_name(x_user, user))
+    if user_id is None:
+        raise HTTPException(status_code=404, detail="Unknown user")
+    return user_id
+
+@app.post("/users")
+async def register_user(user_id: int = Depends(current_user)):
+    """Create the requesting user if needed (the login does this before any read)."""
+    return {"id": user_id}
 
 # --- Endpoints ---
 
@@ -74,19 +234,44 @@ def home():
 def health():
     return {"status": "ok", "timestamp": datetime.now().isoformat()}
 
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus scrape endpoint: this worker's counters and histograms."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 # --- Chat & AI Logic ---
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(req: ChatRequest):
+async def chat(req: ChatRequest, user_id: int = Depends(known_user)):
     user_text = req.message.lower().strip()
     
     # Simple silencers
     if user_text in ['done', 'ok', 'stop', 'thanks', 'thank you', 'okay', 'cool']:
-        db.mark_all_notifications_read()
+        await adb.mark_all_notifications_read(user_id)
         return ChatResponse(type="text", message="👍 Notifications silenced.")
 
-    result = parser.parse(req.message, req.local_time)
-    
+    result = await _parse(req.message, req.local_time)
+    return _chat_reply(result, req.message)
+
+@app.post("/chat/batch", response_model=List[ChatResponse])
+async def chat_batch(req: ChatBatchRequest):
+    """Parse many messages (a pasted to-do list, an import) in parallel.
+
+    Returns one confirmation card or error per message, in input order.
+    Nothing is saved; the client confirms each card through POST /tasks.
+    """
+    if len(req.messages) > MAX_BATCH_MESSAGES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_MESSAGES} messages per batch")
+    messages = [m for m in req.messages if m.strip()]
+    results = await asyncio.gather(*(_parse(m, req.local_time) for m in messages))
+    return [_chat_reply(result, m) for result, m in zip(results, messages)]
+
+async def _parse(text, local_time):
+    # parse is CPU-bound and may call dateparser; never run it on the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(parse_executor, parse_message, text, local_time)
+
+def _chat_reply(result, original_text):
     if 'error' in result:
         # Fallback: if no date found but text exists, maybe ask for time?
         return ChatResponse(type="error", message=result['error'])
@@ -107,241 +292,417 @@ async def chat(req: ChatRequest):
             "run_time": result['run_time'].isoformat(),
             "repeat_type": result['repeat_type'],
             "is_vague": result['is_vague'],
-            "original_text": req.message
+            "original_text": original_text
         }
     )
 
 # --- Task Management ---
 
+def _parse_run_time(run_time: str):
+    """Client run_time string -> aware datetime in the configured timezone."""
+    try:
+        # Incoming is UTC (from frontend new Date().toISOString())
+        utc_dt = datetime.fromisoformat(run_time.replace('Z', '+00:00'))
+        
+        # Convert to configured timezone (Kolkata) or system local
+        if KOLKATA:
+            return utc_dt.astimezone(KOLKATA)
+        return utc_dt.astimezone()
+    except ValueError:
+        # Fallback for simple formats if ISO fails
+        dt = datetime.strptime(run_time, "%Y-%m-%d %H:%M:%S")
+        if KOLKATA:
+            dt = KOLKATA.localize(dt)
+        return dt
+
+def _recurrence_payload(repeat_type, payload, dt):
+    """Validate a task's recurrence. Returns the repeat_payload JSON to store, or None."""
+    if repeat_type not in REPEAT_TYPES:
+        raise ValueError(f"Unsupported repeat_type '{repeat_type}'")
+    if repeat_type == 'once':
+        if payload:
+            raise ValueError("repeat_payload needs a recurring repeat_type")
+        return None
+    if not payload:
+        return None
+    # Anchored at the first run_time so intervals and counts survive completions
+    return rule_for(repeat_type, json.dumps(payload), dt.replace(tzinfo=None)).to_json()
+
 @app.post("/tasks", response_model=ChatResponse)
-def create_task(task_data: TaskCreate):
+async def create_task(task_data: TaskCreate, user_id: int = Depends(current_user)):
     """Direct task creation endpoint (used by UI confirmation or manual add)"""
     try:
-        # Parse ISO string to datetime
-        try:
-            # Incoming is UTC (from frontend new Date().toISOString())
-            utc_dt = datetime.fromisoformat(task_data.run_time.replace('Z', '+00:00'))
-            
-            # Convert to configured timezone (Kolkata) or system local
-            if KOLKATA:
-                dt = utc_dt.astimezone(KOLKATA)
-            else:
-                dt = utc_dt.astimezone()
+        dt = _parse_run_time(task_data.run_time)
+        repeat_payload = _recurrence_payload(task_data.repeat_type, task_data.repeat_payload, dt)
 
-            # For DB, we store naive string (local time representation)
-            # If dt is aware, strftime('%Y-%m-%d %H:%M:%S') creates the correct naive local string
-            
-        except ValueError:
-            # Fallback for simple formats if ISO fails
-            dt = datetime.strptime(task_data.run_time, "%Y-%m-%d %H:%M:%S")
-            if KOLKATA:
-                dt = KOLKATA.localize(dt)
-
-        # For the DB, we pass the datetime object. 
-        # The DB adapter converts it. If it's aware, it might format it with offset depending on logic.
-        # But our DB code manually formatted it using .strftime('%Y...').
-        # So passing 'dt' (aware) -> strftime (naive-looking string of local time) is correct.
-        
-        r_id = db.add_reminder(
-            task=task_data.task,
-            run_time=dt,
-            repeat_type=task_data.repeat_type,
-            description=task_data.description,
-            priority=task_data.priority
-        )
-        # Scheduler handles aware datetimes correctly now
-        scheduler.schedule_reminder(r_id, task_data.task, dt, task_data.repeat_type)
-        
+        r_id = await adb.run(_create_task, task_data, dt, repeat_payload, user_id)
         return ChatResponse(
             type="reminder_created",
             message=f"Reminder set for {task_data.task}.",
             data={"id": r_id}
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Create Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/tasks/timeline")
-def get_timeline():
-    """Returns tasks grouped by Past, Today, Upcoming"""
-    all_reminders = db.get_active_reminders()
-    overdue = db.get_overdue_reminders()
-    
-    now = datetime.now()
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    today_end = today_start + timedelta(days=1)
-    
-    past = []
-    today = []
-    upcoming = []
-    
-    # Process Overdue (from DB method which already filters run_time < now)
-    for r in overdue:
-         r['group'] = 'past'
-         past.append(r)
-
-    # Process Active/Snoozed
-    for r in all_reminders:
-        # DB active reminders are sorted by time.
-        # We need to filter out ones that are already in 'overdue' list if overlaps exist?
-        # Actually proper logic:
-        # Past = Status Active AND Time < Now (handled by get_overdue_reminders)
-        # Today = Time >= Now AND Time < Tomorrow
-        # Upcoming = Time >= Tomorrow
-        
-        rt_str = r['run_time']
-        if isinstance(rt_str, str):
-            rt = datetime.strptime(rt_str.split('.')[0], '%Y-%m-%d %H:%M:%S')
-        else:
-            rt = rt_str
-            
-        if rt < now:
-            # Should have been caught by overdue, but specific status check might differ
-            # If status is 'snoozed', it might be in future
+def _create_task(task_data, dt, repeat_payload, user_id):
+    # For the DB, we pass the datetime object; it is stored as epoch seconds
+    r_id = db.add_reminder(
+        task=task_data.task,
+        run_time=dt,
+        repeat_type=task_data.repeat_type,
+        description=task_data.description,
+        priority=task_data.priority,
+        repeat_payload=repeat_payload,
+        user_id=user_id
+    )
+    reminder_cache.wrote(user_id, [r_id])
+    # Scheduler handles aware datetimes correctly now; its job store is SQLite too
+    scheduler.schedule_reminder(r_id, task_data.task, dt, task_data.repeat_type, repeat_payload, task_data.priority)
+    return r_id
+
+@app.post("/tasks/bulk")
+async def create_tasks_bulk(tasks: List[TaskCreate], user_id: int = Depends(current_user)):
+    """Create many tasks in one transaction. Invalid rows are reported, not fatal."""
+    return await adb.run(_create_tasks, tasks, user_id)
+
+@app.post("/tasks/import")
+async def import_tasks(file: UploadFile = File(...), user_id: int = Depends(current_user)):
+    """Import reminders from a .csv (task,run_time[,description,repeat_type,priority]) or .ics file."""
+    raw = await file.read()
+    if len(raw) > MAX_IMPORT_BYTES:
+        raise HTTPException(status_code=413, detail="Import file too large")
+    text = raw.decode('utf-8-sig', errors='replace')
+
+    name = (file.filename or '').lower()
+    if name.endswith('.ics') or 'calendar' in (file.content_type or '') or text.lstrip().startswith('BEGIN:VCALENDAR'):
+        records = importer.parse_ics(text, KOLKATA)
+    elif name.endswith('.csv') or 'csv' in (file.content_type or ''):
+        records = importer.parse_csv(text)
+    else:
+        raise HTTPException(status_code=415, detail="Upload a .csv or .ics file")
+
+    return await adb.run(_create_tasks, records, user_id)
+
+def _create_tasks(records, user_id):
+    """Validate, insert for user_id in one transaction and schedule in one pass. Blocking; run on the DB threads.
+
+    records are TaskCreate models or importer dicts (which may carry 'error').
+    """
+    if len(records) > MAX_BULK_TASKS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_TASKS} tasks per request")
+
+    valid = []
+    errors = []
+    for index, record in enumerate(records):
+        try:
+            if isinstance(record, dict):
+                if 'error' in record:
+                    raise ValueError(record['error'])
+                record = TaskCreate(**record)
+            if not record.task.strip():
+                raise ValueError("Task text is empty")
+            dt = _parse_run_time(record.run_time)
+            repeat_payload = _recurrence_payload(record.repeat_type, record.repeat_payload, dt)
+        except (ValueError, ValidationError) as e:
+            errors.append({"index": index, "error": str(e)})
             continue
-            
-        if rt < today_end:
-            r['group'] = 'today'
-            today.append(r)
-        else:
-            r['group'] = 'upcoming'
-            upcoming.append(r)
+        valid.append((index, record, dt, repeat_payload))
+
+    ids = db.add_reminders([
+        {'task': r.task, 'run_time': dt, 'repeat_type': r.repeat_type, 'repeat_payload': payload,
+         'description': r.description, 'priority': r.priority}
+        for _, r, dt, payload in valid
+    ], user_id)
+    reminder_cache.wrote(user_id, ids)
+    scheduler.schedule_reminders(
+        (r_id, r.task, dt, r.repeat_type, payload, r.priority) for r_id, (_, r, dt, payload) in zip(ids, valid)
+    )
 
+    logger.info(f"Bulk create: {len(ids)} created, {len(errors)} rejected")
     return {
-        "past": past,
-        "today": today,
-        "upcoming": upcoming
+        "created": [{"index": index, "id": r_id} for r_id, (index, _, _, _) in zip(ids, valid)],
+        "errors": errors
     }
 
+@app.get("/tasks/timeline")
+async def get_timeline(
+    limit: int = Query(TIMELINE_PAGE_SIZE, ge=1, le=500),
+    group: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    user_id: int = Depends(known_user),
+):
+    """Returns the user's tasks grouped by Past, Today, Upcoming, a page per group.
+
+    Without group, the first page of every bucket plus per-bucket counts.
+    With group and cursor (a "next" value from a previous response), the
+    following page of that bucket only.
+    """
+    if group is not None and group not in TIMELINE_GROUPS:
+        raise HTTPException(status_code=400, detail=f"group must be one of {', '.join(TIMELINE_GROUPS)}")
+    cursors = {}
+    if cursor:
+        if group is None:
+            raise HTTPException(status_code=400, detail="cursor needs a group")
+        run_time, _, reminder_id = cursor.partition('|')
+        if not run_time.isdigit() or not reminder_id.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        cursors[group] = (int(run_time), int(reminder_id))
+
+    # "Today" ends at midnight in the scheduler's timezone
+    now = scheduler._now()
+    today_end = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+    groups = (group,) if group else TIMELINE_GROUPS
+    # Served from the in-memory active set after a data version check
+    pages, counts = await adb.run(reminder_cache.timeline, user_id, now, today_end, limit, groups, cursors)
+
+    # Items are Reminder records, serialized directly; the bucket key is their group
+    result = {"next": {}}
+    for name, (items, has_more) in pages.items():
+        result[name] = items
+        result["next"][name] = f"{to_epoch(items[-1].run_time)}|{items[-1].id}" if has_more else None
+    if group is None:
+        result["counts"] = counts
+    return json_response(result)
+
 @app.get("/tasks/calendar")
-def get_calendar(month: int = Query(...), year: int = Query(...)):
-    """Returns tasks for a specific month"""
+async def get_calendar(
+    request: Request,
+    month: int = Query(..., ge=1, le=12),
+    year: int = Query(..., ge=1, le=9998),
+    user_id: int = Depends(known_user),
+):
+    """A month's reminders grouped by day ({"days": {"YYYY-MM-DD": [...]}}), recurring ones expanded.
+
+    Revalidate with If-None-Match: an unchanged month is a 304 without touching the reminders table.
+    """
+    headers = {"Cache-Control": "no-cache"}
+    etag = calendar_cache.etag(user_id, year, month, await adb.get_data_version(user_id))
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
     try:
-        start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1)
-        else:
-            end_date = date(year, month + 1, 1)
-            
-        # Convert to strings for DB query
-        start_str = start_date.strftime("%Y-%m-%d 00:00:00")
-        end_str = end_date.strftime("%Y-%m-%d 00:00:00")
-        
-        tasks = db.get_reminders_by_date_range(start_str, end_str)
-        return tasks
+        # A miss builds the month from the reminders table
+        etag, body = await adb.run(calendar_cache.get, user_id, year, month)
     except Exception as e:
         logger.error(f"Calendar Error: {e}")
-        return []
+        raise HTTPException(status_code=500, detail="Could not load calendar")
+    return Response(content=body, media_type="application/json", headers={**headers, "ETag": etag})
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(',')]
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    return '*' in tags or etag in (t[2:] if t.startswith('W/') else t for t in tags)
 
 @app.put("/tasks/{id}")
-def update_task(id: int, update: TaskUpdate):
+async def update_task(id: int, update: TaskUpdate, user_id: int = Depends(known_user)):
     data = {k: v for k, v in update.model_dump().items() if v is not None}
     
-    # consistency check for run_time
     if 'run_time' in data:
-         try:
-            utc_dt = datetime.fromisoformat(data['run_time'].replace('Z', '+00:00'))
-            # Convert to local time
-            if KOLKATA:
-                dt = utc_dt.astimezone(KOLKATA)
-            else:
-                dt = utc_dt.astimezone()
-            
-            # Format to naive string for DB update
-            data['run_time'] = dt.strftime('%Y-%m-%d %H:%M:%S')
-         except:
-            pass
-            
-    success = db.update_reminder(id, data)
-    if not success:
+        # Storage takes the aware datetime as is; anything else would fail to convert
+        try:
+            data['run_time'] = _parse_run_time(data['run_time'])
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid run_time {data['run_time']!r}")
+
+    if not await adb.run(_update_task, id, data, user_id):
         raise HTTPException(status_code=404, detail="Task not found")
-    
+    return {"status": "updated"}
+
+def _update_task(id, data, user_id):
+    if not db.update_reminder(id, data, user_id=user_id):
+        return False
+    reminder_cache.wrote(user_id, [id])
+
     # If time changed, reschedule
     if 'run_time' in data or 'task' in data or 'status' in data:
-         # simplified reschedule: reload job if active
-         reminders = db.get_active_reminders()
-         r = next((x for x in reminders if x['id'] == id), None)
-         if r:
-             dt = datetime.strptime(r['run_time'], '%Y-%m-%d %H:%M:%S')
-             if KOLKATA:
-                 dt = KOLKATA.localize(dt)
-                 
-             scheduler.schedule_reminder(id, r['task'], dt, r['repeat_type'])
-         else:
-             scheduler.cancel_job(id)
-             
-    return {"status": "updated"}
+        # simplified reschedule: reload job if active
+        r = db.get_reminder(id, user_id)
+        if r and r.status in ACTIVE_STATUSES:
+            scheduler.schedule_reminder(id, r.task, r.run_time, r.repeat_type, r.repeat_payload, r.priority)
+        else:
+            scheduler.cancel_job(id)
+    return True
 
 @app.post("/tasks/{id}/complete")
-def complete_task(id: int):
+async def complete_task(id: int, user_id: int = Depends(known_user)):
+    # Serialized like Reminder records: next_run is aware, ISO 8601 with its offset
+    return json_response(await adb.run(_complete_task, id, user_id))
+
+def _complete_task(id, user_id):
     # Logic similar to old endpoint but cleaner
-    reminders = db.get_active_reminders()
-    r = next((x for x in reminders if x['id'] == id), None)
-    
-    if not r:
-        # Check if it was overdue
-        overdue = db.get_overdue_reminders()
-        r = next((x for x in overdue if x['id'] == id), None)
+    r = db.get_reminder(id, user_id)
 
-    if not r:
+    if not r or r.status not in ACTIVE_STATUSES:
         return {"status": "error", "message": "Reminder not found"}
 
-    if r['repeat_type'] == 'once':
+    if r.repeat_type == 'once':
         db.complete_reminder(id)
+        reminder_cache.wrote(user_id, [id])
         scheduler.cancel_job(id)
         return {"status": "completed"}
     else:
-        # Recurring logic
-        rt = r['run_time']
-        if isinstance(rt, str):
-            rt = datetime.strptime(rt.split('.')[0], '%Y-%m-%d %H:%M:%S')
-        
-        next_run = rt
-        if r['repeat_type'] == 'daily':
-            next_run = rt + timedelta(days=1)
-        elif r['repeat_type'] == 'weekly':
-            next_run = rt + timedelta(weeks=1)
-            
-        # If next run is still in past (e.g. missed multiple days), push to future?
-        # For simplicity, just add interval.
-        if next_run < datetime.now():
-            next_run = datetime.now() + timedelta(minutes=1) # basic fallback
-            
+        # Recurring: move to the first occurrence after both this one and now,
+        # so a series that missed several days resumes on its own schedule
+        rt = r.run_time.replace(tzinfo=None)
+        rule = rule_for(r.repeat_type, r.repeat_payload, rt)
+        # run_time need not itself be an occurrence (e.g. a Sunday start for a weekday rule)
+        current = rule.first_at_or_after(rt) or rt
+        next_run = rule.next_after(max(current, scheduler._now().replace(tzinfo=None)))
+        if next_run is None:
+            # Series ended (until/count)
+            db.complete_reminder(id)
+            reminder_cache.wrote(user_id, [id])
+            scheduler.cancel_job(id)
+            return {"status": "completed"}
+
+        next_run = scheduler._localize(next_run)
         db.update_reminder_time(id, next_run)
-        scheduler.schedule_reminder(id, r['task'], next_run, r['repeat_type'])
-        return {"status": "next_scheduled", "next_run": next_run.isoformat()}
+        reminder_cache.wrote(user_id, [id])
+        scheduler.schedule_reminder(id, r.task, next_run, r.repeat_type, r.repeat_payload, r.priority)
+        return {"status": "next_scheduled", "next_run": next_run}
 
 @app.post("/tasks/{id}/snooze")
-def snooze_task(id: int, minutes: int = 10):
-    snooze_until = datetime.now() + timedelta(minutes=minutes)
-    db.snooze_reminder(id, snooze_until)
-    
-    # Reschedule
-    # Need to fetch task info, might not be in active if it was overdue
-    # Just force schedule a once-off job
-    # We can query specific reminder but DB class doesn't have get_one yet.
-    # Hack: use get_active or get_overdue
-    all_r = db.get_active_reminders() + db.get_overdue_reminders()
-    r = next((x for x in all_r if x['id'] == id), None)
-    if r:
-        scheduler.schedule_reminder(id, r['task'], snooze_until, 'once')
+async def snooze_task(id: int, minutes: int = 10, user_id: int = Depends(known_user)):
+    snooze_until = scheduler._now() + timedelta(minutes=minutes)
+    return await adb.run(_snooze_task, id, snooze_until, user_id)
+
+def _snooze_task(id, snooze_until, user_id):
+    if not db.snooze_reminder(id, snooze_until, user_id=user_id):
+        return {"status": "error", "message": "Task not found"}
+    reminder_cache.wrote(user_id, [id])
+
+    # Reschedule as a once-off job for the snooze time
+    r = db.get_reminder(id, user_id)
+    if r and r.status in ACTIVE_STATUSES:
+        scheduler.schedule_reminder(id, r.task, snooze_until, 'once', None, r.priority)
         return {"status": "snoozed", "until": snooze_until.isoformat()}
-        
+
     return {"status": "error", "message": "Task not found"}
 
 @app.delete("/tasks/{id}")
-def delete_task(id: int):
-    db.delete_reminder(id)
-    scheduler.cancel_job(id)
+async def delete_task(id: int, user_id: int = Depends(known_user)):
+    if not await adb.run(_delete_task, id, user_id):
+        raise HTTPException(status_code=404, detail="Task not found")
     return {"status": "deleted"}
 
+def _delete_task(id, user_id):
+    # Another user's reminder is left alone, and so is its job
+    if not db.delete_reminder(id, user_id=user_id):
+        return False
+    reminder_cache.wrote(user_id, [id])
+    scheduler.cancel_job(id)
+    return True
+
 # --- Notifications ---
 
 @app.get("/notifications")
-def get_notifs():
-    return db.get_unread_notifications()
+async def get_notifs(
+    since_id: int = Query(0, ge=0),
+    limit: int = Query(NOTIFICATION_PAGE_SIZE, ge=1, le=500),
+    user_id: int = Depends(known_user),
+):
+    """The user's unread notifications after since_id, oldest first. Use the last id as the next cursor."""
+    return json_response(await adb.get_unread_notifications(user_id, since_id=since_id, limit=limit))
+
+@app.post("/notifications/read")
+async def read_notifs(ack: NotificationAck, user_id: int = Depends(known_user)):
+    """Bulk acknowledge: a list of ids and/or an id range, in one transaction."""
+    if not ack.ids and ack.from_id is None and ack.to_id is None:
+        raise HTTPException(status_code=400, detail="Provide ids or an id range")
+    count = await adb.mark_notifications_read(user_id, ack.ids or (), ack.from_id, ack.to_id)
+    return {"status": "read", "count": count}
 
 @app.post("/notifications/{id}/read")
-def read_notif(id: int):
-    db.mark_notification_read(id)
+async def read_notif(id: int, user_id: int = Depends(known_user)):
+    await adb.mark_notification_read(user_id, id)
     return {"status": "read"}
+
+@app.get("/notifications/stream")
+async def stream_notifs(
+    request: Request,
+    last_event_id: Optional[int] = Query(None),
+    user_id: int = Depends(known_user),
+):
+    """Server-sent events feed of the user's notifications. Polling /notifications is the fallback.
+
+    EventSource cannot send X-User, so browsers name the user with ?user=.
+
+    On reconnect the browser sends Last-Event-ID and everything after it is
+    replayed from the database; a fresh connection starts with the unread
+    backlog. Each notification is marked read once it has been written out.
+    """
+    header_id = request.headers.get('last-event-id')
+    if header_id and header_id.isdigit():
+        last_event_id = int(header_id)
+
+    return StreamingResponse(
+        _notification_events(request, user_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _relay_notifications():
+    """Publish notifications another process wrote to this worker's stream subscribers."""
+    last_id = await adb.get_last_notification_id()
+    while True:
+        await asyncio.sleep(NOTIFICATION_RELAY_INTERVAL)
+        try:
+            if not notifier.subscriber_count:
+                # Nobody to deliver to; a new subscriber starts from the table's backlog
+                last_id = await adb.get_last_notification_id()
+                continue
+            for notification_id, user_id, message in await adb.get_new_notifications(last_id):
+                notifier.publish({'id': notification_id, 'message': message}, user_id)
+                last_id = notification_id
+        except Exception as e:
+            logger.warning(f"Notification relay failed: {e}")
+
+async def _notification_events(request: Request, user_id: int, last_event_id: Optional[int]):
+    # Subscribe before reading the backlog so nothing published in between is lost;
+    # duplicates are filtered by id below.
+    sub = notifier.subscribe(user_id)
+    last_sent = last_event_id or 0
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+
+        async def backlog_page():
+            # Fresh connections get what is unread, resumed ones everything after the last event
+            if last_event_id is None:
+                return await adb.get_unread_notifications(user_id, last_sent, NOTIFICATION_PAGE_SIZE)
+            return await adb.get_notifications_after(user_id, last_sent, NOTIFICATION_PAGE_SIZE)
+
+        pending = await backlog_page()
+        # The whole backlog goes out, page by page, before any live event:
+        # once last_sent moves past a live id, older rows would never be sent
+        paging = True
+        while True:
+            delivered = []
+            for notif in pending:
+                if notif['id'] <= last_sent:
+                    continue
+                yield f"id: {notif['id']}\ndata: {json.dumps(notif)}\n\n"
+                last_sent = notif['id']
+                delivered.append(notif['id'])
+            if delivered:
+                await adb.mark_notifications_read(user_id, delivered)
+
+            if sub.overflowed or await request.is_disconnected():
+                break
+            if paging:
+                paging = len(pending) == NOTIFICATION_PAGE_SIZE
+                if paging:
+                    pending = await backlog_page()
+                    continue
+            event = await sub.get(STREAM_HEARTBEAT_SECONDS)
+            if event is None:
+                yield ": keep-alive\n\n"
+                pending = []
+            else:
+                pending = [event]
+    finally:
+        notifier.unsubscribe(sub)
@@ -0,0 +1,200 @@
+"""Load test: sync endpoints on the threadpool vs async endpoints on adb, over HTTP.
+
+"sync" is api.app with the benchmarked routes served by the previous
+handlers (plain def, blocking Database calls, one threadpool slot per
+request); "async" is api.app itself, whose handlers await adb. Each runs
+under uvicorn in its own process on a copy of the same seeded database.
+
+Each level keeps that many requests in flight for DURATION seconds,
+cycling through the timeline, the notification list and a snooze (a write
+that also reschedules the job). "probe" is the p95 of GET /health, a plain
+def endpoint, sent every PROBE_INTERVAL alongside the load: it needs a
+threadpool slot, which the sync handlers hold for their whole database work.
+
+Run from the backend directory:  python benchmarks/bench_async_db.py
+"""
+import asyncio
+import logging
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+REMINDERS = 10_000
+NOTIFICATIONS = 200
+CONCURRENCY = (1, 16, 64, 256)
+DURATION = 3.0  # seconds per level
+PROBE_INTERVAL = 0.05
+
+
+def build_sync_app():
+    """api.app with the benchmarked routes swapped for their previous sync versions."""
+    from fastapi import FastAPI, Query
+    import api
+    from database import db, DEFAULT_USER_ID
+    from database.times import to_epoch
+    from scheduler import scheduler
+    from serialization import json_response
+
+    def sync_timeline(limit: int = Query(api.TIMELINE_PAGE_SIZE, ge=1, le=500)):
+        now = scheduler._now()
+        today_end = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        pages = db.get_timeline(DEFAULT_USER_ID, now, today_end, limit)
+        result = {"next": {}}
+        for name, (items, has_more) in pages.items():
+            result[name] = items
+            result["next"][name] = f"{to_epoch(items[-1].run_time)}|{items[-1].id}" if has_more else None
+        result["counts"] = db.count_timeline(DEFAULT_USER_ID, now, today_end)
+        return json_response(result)
+
+    def sync_notifications(since_id: int = Query(0, ge=0), limit: int = Query(api.NOTIFICATION_PAGE_SIZE, ge=1, le=500)):
+        return json_response(db.get_unread_notifications(DEFAULT_USER_ID, since_id=since_id, limit=limit))
+
+    def sync_snooze(id: int, minutes: int = 10):
+        snooze_until = scheduler._now() + timedelta(minutes=minutes)
+        db.snooze_reminder(id, snooze_until, user_id=DEFAULT_USER_ID)
+        r = db.get_reminder(id, DEFAULT_USER_ID)
+        if r and r.status in api.ACTIVE_STATUSES:
+            scheduler.schedule_reminder(id, r.task, snooze_until, 'once')
+            return {"status": "snoozed", "until": snooze_until.isoformat()}
+        return {"status": "error", "message": "Task not found"}
+
+    handlers = {
+        ("GET", "/tasks/timeline"): sync_timeline,
+        ("GET", "/notifications"): sync_notifications,
+        ("POST", "/tasks/{id}/snooze"): sync_snooze,
+    }
+    # Same lifespan, middleware and route table; only the three handlers differ
+    app = FastAPI(lifespan=api.lifespan)
+    app.user_middleware = list(api.app.user_middleware)
+    for route in api.app.router.routes:
+        methods = getattr(route, "methods", None) or ()
+        handler = next((handlers[(m, route.path)] for m in methods if (m, route.path) in handlers), None)
+        if handler is None:
+            app.router.routes.append(route)
+        else:
+            app.add_api_route(route.path, handler, methods=list(methods))
+    return app
+
+
+def serve(mode, port):
+    import uvicorn
+    if mode == "sync":
+        app = build_sync_app()
+    else:
+        from api import app
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def seed(path):
+    # Future reminders only, so neither server has missed reminders to catch up on at boot
+    code = (
+        "import logging; logging.disable(logging.INFO)\n"
+        "from datetime import datetime, timedelta\n"
+        "from database import db\n"
+        "start = datetime.now() + timedelta(hours=1)\n"
+        f"db.add_reminders([{{'task': f'task {{i}}', 'run_time': start + timedelta(minutes=i)}} for i in range({REMINDERS})])\n"
+        f"for i in range({NOTIFICATIONS}): db.add_notification(f'notification {{i}}')\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=dict(os.environ, DB_PATH=path), check=True)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(client):
+    for _ in range(200):
+        try:
+            (await client.get("/health")).raise_for_status()
+            return
+        except Exception:
+            await asyncio.sleep(0.05)
+    raise RuntimeError("server did not start")
+
+
+async def load(client, concurrency):
+    latencies = []
+    probes = []
+    deadline = time.perf_counter() + DURATION
+
+    async def worker(n):
+        i = n
+        while time.perf_counter() < deadline:
+            kind = i % 3
+            start = time.perf_counter()
+            if kind == 0:
+                response = await client.get("/tasks/timeline")
+            elif kind == 1:
+                response = await client.get("/notifications")
+            else:
+                response = await client.post(f"/tasks/{REMINDERS // 2 + i % 500}/snooze")
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+            i += 1
+
+    async def probe():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            (await client.get("/health")).raise_for_status()
+            probes.append(time.perf_counter() - start)
+            await asyncio.sleep(PROBE_INTERVAL)
+
+    await asyncio.gather(probe(), *(worker(n) for n in range(concurrency)))
+    return len(latencies) / DURATION, p95(latencies), p95(probes)
+
+
+def p95(samples):
+    return statistics.quantiles(samples, n=20)[-1] * 1000
+
+
+async def run_mode(mode, seeded):
+    import httpx
+    path = os.path.join(tempfile.mkdtemp(), f"{mode}.db")
+    shutil.copy(seeded, path)
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", mode, str(port)],
+        cwd=BACKEND_DIR, env=dict(os.environ, DB_PATH=path),
+    )
+    limits = httpx.Limits(max_connections=max(CONCURRENCY) + 1)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            await wait_ready(client)
+            return [await load(client, concurrency) for concurrency in CONCURRENCY]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    seeded = os.path.join(tempfile.mkdtemp(), "seeded.db")
+    seed(seeded)
+    results = {mode: asyncio.run(run_mode(mode, seeded)) for mode in ("sync", "async")}
+
+    print(f"{'':>10}{'---------- sync ----------':>27}{'---------- async ---------':>27}")
+    print(f"{'in flight':>10}" + f"{'req/s':>9}{'p95 ms':>9}{'probe ms':>9}" * 2)
+    for i, concurrency in enumerate(CONCURRENCY):
+        row = f"{concurrency:>10}"
+        for mode in ("sync", "async"):
+            rps, latency, probe = results[mode][i]
+            row += f"{rps:>9.0f}{latency:>9.1f}{probe:>9.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--serve"]:
+        logging.disable(logging.WARNING)
+        serve(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,53 @@
+"""Batch parse throughput with 1/4/8 workers, thread and process pools.
+
+Every message is unique so the parse cache never short-circuits the work.
+
+Run from the backend directory:  python benchmarks/bench_chat_batch.py
+"""
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parser, parse_message, create_parse_executor  # noqa: E402
+
+logging.disable(logging.INFO)
+
+BATCH = 200
+TEMPLATES = [
+    "remind me to call contact {i} at 5pm",            # fast path
+    "in {n} minutes check item {i}",                   # fast path
+    "buy item {i} on friday at 6pm",                   # dateparser
+    "dentist visit {i} on 12/{d} at 4pm",              # dateparser
+]
+WORKERS = (1, 4, 8)
+
+
+def messages():
+    return [TEMPLATES[i % len(TEMPLATES)].format(i=i, n=i % 50 + 1, d=i % 28 + 1) for i in range(BATCH)]
+
+
+def run(kind, workers):
+    with create_parse_executor(workers, kind) as ex:
+        if kind == 'process':
+            # Make sure every worker has started and warmed up before timing
+            list(ex.map(parse_message, ["warm at 5pm on friday"] * workers * 2))
+        batch = messages()
+        start = time.perf_counter()
+        list(ex.map(parse_message, batch, chunksize=8 if kind == 'process' else 1))
+        return BATCH / (time.perf_counter() - start)
+
+
+def main():
+    parser.warm_up()
+    print(f"{'pool':<10}{'workers':>8}{'msgs/s':>10}")
+    for kind in ('thread', 'process'):
+        for workers in WORKERS:
+            parser.clear_cache()
+            print(f"{kind:<10}{workers:>8}{run(kind, workers):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Import time and first-request parse latency, each in a fresh interpreter.
+
+Run from the backend directory:  python benchmarks/bench_cold_start.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Needs dateparser, so it never takes the fast path
+FIRST_MESSAGE = "remind me to buy milk on friday at 6pm"
+
+SNIPPET = """
+import json, logging, sys, time
+logging.disable(logging.INFO)
+sys.path.insert(0, {backend!r})
+start = time.perf_counter()
+if {eager}:
+    import dateparser.search
+from parser import parser
+imported = time.perf_counter() - start
+if {warm}:
+    parser.warm_up()
+start = time.perf_counter()
+parser.parse({message!r}, "2026-10-17T18:30:15")
+first = time.perf_counter() - start
+print(json.dumps({{"import": imported, "first": first}}))
+"""
+
+SCENARIOS = [
+    # label, eager import, PARSER_LANGUAGES, warm_up before first parse
+    ("before: eager import, all languages", True, "", False),
+    ("lazy import, en, no warm-up", False, "en", False),
+    ("lazy import, en, warmed up", False, "en", True),
+]
+
+
+def run(eager, languages, warm):
+    code = SNIPPET.format(backend=BACKEND_DIR, eager=eager, warm=warm, message=FIRST_MESSAGE)
+    env = dict(os.environ, PARSER_LANGUAGES=languages)
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'scenario':<38}{'import s':>10}{'first parse s':>15}")
+    for label, eager, languages, warm in SCENARIOS:
+        result = run(eager, languages, warm)
+        print(f"{label:<38}{result['import']:>10.3f}{result['first']:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""A burst of reminders due in the same second: APScheduler jobs vs the heap dispatcher.
+
+Each run is a fresh interpreter with DISPATCH_ENGINE set. It schedules SIZE
+one-off reminders (one in PRIORITY_EVERY high priority) due in the same
+second through scheduler.schedule_reminders, then waits for them to fire.
+Notifications are recorded in memory instead of written, so only the
+dispatch path is timed. Reported: scheduling cost per reminder, memory held,
+fire lag (firing time minus run_time), the rate from the due second until
+the last one fired, how many never fired and how many high-priority
+reminders fired after a normal one.
+APScheduler is not run at the largest size.
+
+Run from the backend directory:  python benchmarks/bench_dispatch.py
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = (10_000, 100_000, 1_000_000)
+APSCHEDULER_MAX = 100_000
+PRIORITY_EVERY = 10
+CALIBRATE = 1_000
+WAIT_LIMIT = 180  # seconds after the burst is due
+
+SNIPPET = """
+import json, logging, sys, time
+from datetime import timedelta
+logging.disable(logging.WARNING)
+sys.path.insert(0, {backend!r})
+from scheduler import scheduler
+from notification_writer import notification_writer
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4096 / 2**20
+
+fired = []
+# Record instead of writing: the same sink for both engines
+notification_writer.submit = lambda reminder_id, message, mark_done: fired.append((time.time(), reminder_id))
+
+size = {size}
+scheduler.start()
+scheduler.load_jobs_from_db()
+now = scheduler._now().replace(microsecond=0)
+
+# Time a small batch first, to put the burst just past the end of scheduling
+start = time.perf_counter()
+scheduler.schedule_reminders((-i, "calibrate", now + timedelta(days=1), 'once', None, 1) for i in range(1, {calibrate} + 1))
+per_add = (time.perf_counter() - start) / {calibrate}
+for i in range(1, {calibrate} + 1):
+    scheduler.cancel_job(-i)
+
+due = now + timedelta(seconds=int(3 + 2 * per_add * size))
+priority = {{i: 2 if i % {priority_every} == 0 else 1 for i in range(size)}}
+before = rss_mb()
+start = time.perf_counter()
+scheduler.schedule_reminders((i, f"task {{i}}", due, 'once', None, priority[i]) for i in range(size))
+add = time.perf_counter() - start
+memory = rss_mb() - before
+late = time.time() > due.timestamp()
+
+deadline = due.timestamp() + {wait_limit}
+while len(fired) < size and time.time() < deadline:
+    time.sleep(0.2)
+time.sleep(0.5)
+
+lags = sorted(t - due.timestamp() for t, _ in fired)
+inversions = 0
+seen_normal = False
+for _, reminder_id in fired:
+    if priority[reminder_id] == 1:
+        seen_normal = True
+    elif seen_normal:
+        inversions += 1
+drain = fired[-1][0] - due.timestamp() if fired else 0
+print(json.dumps({{
+    "add_us": add / size * 1e6, "rss": memory, "late": late,
+    "p50": lags[len(lags) // 2] if lags else None, "p95": lags[int(len(lags) * 0.95)] if lags else None,
+    "max": lags[-1] if lags else None, "rate": len(fired) / drain if drain else None,
+    "missed": size - len(set(r for _, r in fired)), "inversions": inversions,
+}}))
+scheduler.scheduler.shutdown(wait=False)
+if scheduler.dispatcher:
+    scheduler.dispatcher.stop()
+"""
+
+
+def run(engine, size):
+    path = os.path.join(tempfile.mkdtemp(), f"{engine}.db")
+    code = SNIPPET.format(backend=BACKEND_DIR, size=size, calibrate=CALIBRATE,
+                          priority_every=PRIORITY_EVERY, wait_limit=WAIT_LIMIT)
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        env=dict(os.environ, DB_PATH=path, DISPATCH_ENGINE=engine),
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def seconds(value):
+    return "-" if value is None else f"{value * 1000:.0f}"
+
+
+def main():
+    print(f"one-off reminders due in one second, 1 in {PRIORITY_EVERY} high priority; lag in ms")
+    print(f"{'engine':<12}{'size':>9}{'add us':>8}{'MB':>7}{'lag p50':>9}{'p95':>8}{'max':>8}"
+          f"{'fired/s':>10}{'missed':>8}{'inverted':>10}")
+    for size in SIZES:
+        for engine in ("apscheduler", "heap"):
+            if engine == "apscheduler" and size > APSCHEDULER_MAX:
+                continue
+            r = run(engine, size)
+            rate = "-" if r["rate"] is None else f"{r['rate']:.0f}"
+            print(f"{engine:<12}{size:>9}{r['add_us']:>8.1f}{r['rss']:>7.0f}{seconds(r['p50']):>9}"
+                  f"{seconds(r['p95']):>8}{seconds(r['max']):>8}{rate:>10}{r['missed']:>8}{r['inversions']:>10}"
+                  + ("  (scheduling overran the due time)" if r["late"] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""10k reminders firing at once: per-reminder writes vs the batched writer.
+
+Simulates the 9:00 pile-up by calling the scheduler callback from a pool the
+size of APScheduler's default executor and times both write paths. The
+correctness checks also run in CI as tests/test_fire_burst.py.
+
+Run from the backend directory:  python benchmarks/bench_fire_burst.py
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "burst.db")
+
+from database import db  # noqa: E402
+from notification_writer import notification_writer  # noqa: E402
+from scheduler import scheduler  # noqa: E402
+
+logging.disable(logging.WARNING)
+
+TRIGGERS = 10_000
+WORKERS = 10  # APScheduler's default thread pool
+
+
+def direct_callback(reminder_id, task, repeat_type):
+    # The callback as it was: two autocommitted writes per reminder
+    db.add_notification(f"🔔 Reminder: {task}")
+    if repeat_type == 'once':
+        db.update_status(reminder_id, 'done')
+
+
+def reset(ids):
+    conn = db._get_conn()
+    with conn:
+        conn.execute("DELETE FROM notifications")
+        conn.execute("UPDATE reminders SET status = 'active'")
+    return [(i, f"standup {i}", 'once') for i in ids]
+
+
+def check():
+    conn = db._get_conn()
+    notifications = conn.execute("SELECT COUNT(*), COUNT(DISTINCT message) FROM notifications").fetchone()
+    done = conn.execute("SELECT COUNT(*) FROM reminders WHERE status = 'done'").fetchone()[0]
+    assert notifications == (TRIGGERS, TRIGGERS), notifications
+    assert done == TRIGGERS, done
+
+
+def run(label, callback, ids, finish=lambda: None):
+    triggers = reset(ids)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        for args in triggers:
+            pool.submit(callback, *args)
+    finish()
+    elapsed = time.perf_counter() - start
+    check()
+    print(f"{label:<10}{elapsed:>9.2f}{TRIGGERS / elapsed:>10.0f}")
+
+
+def main():
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    ids = db.add_reminders([{'task': f"standup {i}", 'run_time': now} for i in range(TRIGGERS)])
+    print(f"{'mode':<10}{'secs':>9}{'fired/s':>10}")
+    run("direct", direct_callback, ids)
+    notification_writer.start()
+    run("batched", scheduler._job_callback, ids, finish=notification_writer.flush)
+    notification_writer.stop()
+    print(f"batched writes: {notification_writer.batches} transactions for {notification_writer.written} reminders")
+
+
+if __name__ == "__main__":
+    main()
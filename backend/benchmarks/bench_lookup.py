@@ -0,0 +1,78 @@
+"""Action endpoint latency as the reminders table grows.
+
+Compares the old "load every active reminder and search for the id" lookup
+with Database.get_reminder, and times the snooze/complete handlers (awaited
+on one event loop, so each includes its trips through the DB executor).
+
+Run from the backend directory:  python benchmarks/bench_lookup.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_lookup.db")
+
+import api  # noqa: E402
+from database import db, DEFAULT_USER_ID  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000)
+ROUNDS = 50
+
+
+def grow_to(size):
+    conn = db._get_conn()
+    have = conn.execute("SELECT COUNT(*) FROM reminders").fetchone()[0]
+    base = datetime.now() + timedelta(days=1)
+    rows = [
+        (f"task {i}", base + timedelta(minutes=i), 'daily' if i % 10 == 0 else 'once')
+        for i in range(have, size)
+    ]
+    with conn:
+        conn.executemany(
+            "INSERT INTO reminders (task, run_time, repeat_type, status) VALUES (?, ?, ?, 'active')", rows
+        )
+
+
+def scan_lookup(reminder_id):
+    reminders = db.get_active_reminders()
+    return next((x for x in reminders if x.id == reminder_id), None)
+
+
+def per_call_ms(fn, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn(*args)
+    return (time.perf_counter() - start) * 1000 / ROUNDS
+
+
+def per_request_ms(loop, handler, *args):
+    async def rounds():
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            await handler(*args, user_id=DEFAULT_USER_ID)
+        return (time.perf_counter() - start) * 1000 / ROUNDS
+    return loop.run_until_complete(rounds())
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    print(f"{'rows':>8}{'scan lookup ms':>16}{'get_reminder ms':>17}{'snooze ms':>11}{'complete ms':>13}")
+    for size in SIZES:
+        grow_to(size)
+        target = size // 2 - (size // 2) % 10 + 1  # a daily reminder, so complete keeps it active
+        print(
+            f"{size:>8}"
+            f"{per_call_ms(scan_lookup, target):>16.3f}"
+            f"{per_call_ms(db.get_reminder, target):>17.3f}"
+            f"{per_request_ms(loop, api.snooze_task, target):>11.3f}"
+            f"{per_request_ms(loop, api.complete_task, target):>13.3f}"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
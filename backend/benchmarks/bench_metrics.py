@@ -0,0 +1,110 @@
+"""What recording metrics costs on the hot paths.
+
+Each row times the same call with and without its instrumentation:
+a Histogram.observe on its own, a Database method through
+metrics.instrument, ReminderParser.parse on the fast path, and a minimal
+FastAPI request with and without the RequestTimer middleware (called as
+ASGI directly, no server or client in between). Medians of ROUNDS rounds.
+
+Run from the backend directory:  python benchmarks/bench_metrics.py
+"""
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_metrics.db")
+
+from fastapi import FastAPI  # noqa: E402
+from database import db, Database  # noqa: E402
+from parser import parser  # noqa: E402
+import metrics  # noqa: E402
+from metrics import Histogram, RequestTimer  # noqa: E402
+
+logging.disable(logging.INFO)
+
+ROUNDS = 7
+CALLS = 20_000
+REQUESTS = 5_000
+
+
+def per_call(fn, calls):
+    """Median microseconds per call of fn over ROUNDS rounds of calls."""
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(samples)
+
+
+def app_with(timer):
+    app = FastAPI()
+
+    @app.get("/tasks/{id}")
+    def task(id: int):
+        return {"id": id}
+
+    if timer:
+        app.add_middleware(RequestTimer, histogram=Histogram("bench_http_seconds", "bench", ("method", "route", "status")))
+    return app
+
+
+def request_cost(app):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/tasks/7", "raw_path": b"/tasks/7", "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def requests():
+        for _ in range(REQUESTS):
+            await app(dict(scope), receive, send)
+
+    loop = asyncio.new_event_loop()
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        loop.run_until_complete(requests())
+        samples.append((time.perf_counter() - start) / REQUESTS * 1e6)
+    loop.close()
+    return statistics.median(samples)
+
+
+def main():
+    reminder_id = db.add_reminder("bench", datetime.now() + timedelta(hours=1))
+    plain_get = Database.get_reminder
+    plain_parse = type(parser).parse.__wrapped__
+    metrics.instrument(Database, Histogram("bench_db_seconds", "bench", ("method",), buckets=metrics.FAST_BUCKETS))
+    series = Histogram("bench_observe_seconds", "bench").labels()
+    labelled = Histogram("bench_labelled_seconds", "bench", ("method",))
+
+    rows = [
+        ("observe", lambda: None, lambda: series.observe(0.001), CALLS),
+        ("labels().observe", lambda: None, lambda: labelled.labels("get_reminder").observe(0.001), CALLS),
+        ("db.get_reminder", lambda: plain_get(db, reminder_id), lambda: db.get_reminder(reminder_id), CALLS),
+        ("parser.parse (fast path)", lambda: plain_parse(parser, "call mom at 5pm"),
+         lambda: parser.parse("call mom at 5pm"), CALLS // 10),
+    ]
+    print(f"{'call':<26}{'plain us':>10}{'timed us':>10}{'added us':>10}")
+    for label, plain, timed, calls in rows:
+        a, b = per_call(plain, calls), per_call(timed, calls)
+        print(f"{label:<26}{a:>10.2f}{b:>10.2f}{b - a:>10.2f}")
+    a, b = request_cost(app_with(False)), request_cost(app_with(True))
+    print(f"{'GET /tasks/{id} (ASGI)':<26}{a:>10.2f}{b:>10.2f}{b - a:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
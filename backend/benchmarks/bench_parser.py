@@ -0,0 +1,80 @@
+"""p50/p99 ReminderParser.parse latency over a corpus of typical chat messages.
+
+Compares dateparser-only parsing with the fast path + cache.
+
+Run from the backend directory:  python benchmarks/bench_parser.py
+"""
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parser  # noqa: E402
+
+logging.disable(logging.INFO)
+
+CORPUS = [
+    "remind me to call mom at 5pm",
+    "remind me to drink water in 20 minutes",
+    "in 2 hours check the oven",
+    "remind me to call John tomorrow at 9",
+    "tomorrow at 9am standup",
+    "every day at 7 take pills",
+    "remind me to stretch every day at 7am",
+    "meeting at 17:30",
+    "remind me at 10:15 am to pay rent",
+    "walk the dog tomorrow morning",
+    "tonight watch a movie",
+    "in an hour eat lunch",
+    "daily at 9pm journal",
+    "remind me to buy milk on friday at 6pm",
+    "remind me to sleep at 22:58 pm",
+    "every week at 10am review goals",
+    "remind me in 3 days to renew the license",
+    "call dad later",
+    "next week plan the sprint",
+    "dentist on 12/03 at 4pm",
+]
+ROUNDS = 20
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def measure(label, fast_path, cached, advance_base):
+    parser.use_fast_path = fast_path
+    parser.clear_cache()
+    base = datetime(2026, 10, 17, 18, 30, 15)
+    samples = []
+    for _ in range(ROUNDS):
+        for text in CORPUS:
+            if not cached:
+                parser.clear_cache()
+            start = time.perf_counter()
+            parser.parse(text, base.isoformat())
+            samples.append((time.perf_counter() - start) * 1000)
+            if advance_base:
+                base += timedelta(seconds=1)
+    print(f"{label:<34}{statistics.median(samples):>9.3f}{percentile(samples, 99):>10.3f}")
+
+
+def main():
+    # First call pays dateparser's language loading; keep it out of the numbers
+    parser.parse("warm up at 5pm tomorrow on friday")
+
+    print(f"{'mode':<34}{'p50 ms':>9}{'p99 ms':>10}")
+    measure("dateparser only (before)", fast_path=False, cached=False, advance_base=True)
+    measure("fast path, cold cache", fast_path=True, cached=False, advance_base=True)
+    measure("fast path + cache, base moving", fast_path=True, cached=True, advance_base=True)
+    measure("fast path + cache, same minute", fast_path=True, cached=True, advance_base=False)
+    parser.use_fast_path = True
+
+
+if __name__ == "__main__":
+    main()
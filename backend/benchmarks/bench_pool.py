@@ -0,0 +1,84 @@
+"""Throughput of the polling paths' database reads, fresh connections vs the pool.
+
+The endpoints are async since they moved onto adb, so each path is measured
+as the Database calls its handler makes, for the default user.
+
+Run from the backend directory:  python benchmarks/bench_pool.py
+"""
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_pool.db")
+
+import api  # noqa: E402
+from database import db, DEFAULT_USER_ID  # noqa: E402
+
+THREADS = 8          # roughly uvicorn's threadpool under load
+DURATION = 3.0       # seconds per scenario
+REMINDERS = 500
+NOTIFICATIONS = 50
+
+
+def seed():
+    now = datetime.now()
+    for i in range(REMINDERS):
+        db.add_reminder(f"task {i}", now + timedelta(minutes=i - REMINDERS // 4))
+    for i in range(NOTIFICATIONS):
+        db.add_notification(f"notification {i}")
+
+
+def notifications():
+    return db.get_unread_notifications(DEFAULT_USER_ID, limit=api.NOTIFICATION_PAGE_SIZE)
+
+
+def timeline():
+    now = datetime.now()
+    today_end = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return (
+        db.get_timeline(DEFAULT_USER_ID, now, today_end, api.TIMELINE_PAGE_SIZE),
+        db.count_timeline(DEFAULT_USER_ID, now, today_end),
+    )
+
+
+def unpooled_conn():
+    # The pre-pool behaviour: a brand-new connection and pragma-free session per call.
+    return sqlite3.connect(db.db_path, check_same_thread=False)
+
+
+def run(handler):
+    deadline = time.perf_counter() + DURATION
+
+    def worker():
+        n = 0
+        while time.perf_counter() < deadline:
+            handler()
+            n += 1
+        return n
+
+    with ThreadPoolExecutor(THREADS) as ex:
+        total = sum(f.result() for f in [ex.submit(worker) for _ in range(THREADS)])
+    return total / DURATION
+
+
+def main():
+    seed()
+    paths = {"/notifications": notifications, "/tasks/timeline": timeline}
+    pooled_get_conn = db._get_conn
+
+    print(f"{'path':<18}{'fresh conn rps':>16}{'pooled rps':>14}{'speedup':>10}")
+    for name, handler in paths.items():
+        db._get_conn = unpooled_conn
+        before = run(handler)
+        db._get_conn = pooled_get_conn
+        after = run(handler)
+        print(f"{name:<18}{before:>16.0f}{after:>14.0f}{after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
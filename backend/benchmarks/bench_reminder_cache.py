@@ -0,0 +1,111 @@
+"""Timeline read latency under concurrent writes: SQL vs the active reminder cache.
+
+One user owns REMINDERS reminders spread around now. A reader thread keeps
+asking for the first timeline page plus counts: "sql" is
+Database.get_timeline + count_timeline, "cache" is reminder_cache.timeline.
+Writer threads meanwhile snooze or reschedule that user's reminders, each
+write followed by the write-through, about WRITE_RATE times a second each.
+Other users' rows sit in the same table and are never read.
+
+At the end the cached slice is verified against the table and the cached
+pages compared with the SQL ones.
+
+Run from the backend directory:  python benchmarks/bench_reminder_cache.py
+"""
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_reminder_cache.db")
+
+from database import db  # noqa: E402
+from reminder_cache import reminder_cache  # noqa: E402
+
+logging.disable(logging.INFO)
+
+USER = 1
+REMINDERS = 2_000
+OTHER_ROWS = 50_000
+PAGE = 50
+WRITERS = (0, 1, 4)
+WRITE_RATE = 50  # per writer, per second
+DURATION = 3.0
+
+
+def seed(now):
+    minutes = lambda: timedelta(minutes=random.randrange(-30 * 24 * 60, 60 * 24 * 60))  # noqa: E731
+    ids = db.add_reminders([{'task': f"task {i}", 'run_time': now + minutes()} for i in range(REMINDERS)], USER)
+    db.add_reminders([{'task': f"other {i}", 'run_time': now + minutes()} for i in range(OTHER_ROWS)], USER + 1)
+    return ids
+
+
+def writer(ids, now, stop):
+    rng = random.Random()
+    while not stop.is_set():
+        reminder_id = rng.choice(ids)
+        when = now + timedelta(minutes=rng.randrange(-3 * 24 * 60, 30 * 24 * 60))
+        if rng.random() < 0.5:
+            db.snooze_reminder(reminder_id, when, user_id=USER)
+        else:
+            db.update_reminder_time(reminder_id, when, user_id=USER)
+        reminder_cache.wrote(USER, [reminder_id])
+        time.sleep(1 / WRITE_RATE)
+
+
+def read_sql(now, today_end):
+    return db.get_timeline(USER, now, today_end, PAGE), db.count_timeline(USER, now, today_end)
+
+
+def read_cache(now, today_end):
+    return reminder_cache.timeline(USER, now, today_end, PAGE)
+
+
+def measure(read, writers, ids, now, today_end):
+    stop = threading.Event()
+    threads = [threading.Thread(target=writer, args=(ids, now, stop)) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    samples = []
+    deadline = time.perf_counter() + DURATION
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        read(now, today_end)
+        samples.append(time.perf_counter() - start)
+    stop.set()
+    for t in threads:
+        t.join()
+    return statistics.median(samples) * 1e6, statistics.quantiles(samples, n=20)[-1] * 1e6
+
+
+def main():
+    random.seed(21)
+    now = datetime.now().replace(microsecond=0)
+    today_end = now.replace(hour=0, minute=0, second=0) + timedelta(days=1)
+    ids = seed(now)
+
+    print(f"{REMINDERS} reminders for the user, {WRITE_RATE} writes/s per writer; us per read")
+    print(f"{'writers':>8}{'sql p50':>10}{'sql p95':>10}{'cache p50':>11}{'cache p95':>11}{'reloads':>9}")
+    for writers in WRITERS:
+        sql = measure(read_sql, writers, ids, now, today_end)
+        misses = reminder_cache.misses
+        cache = measure(read_cache, writers, ids, now, today_end)
+        print(f"{writers:>8}{sql[0]:>10.0f}{sql[1]:>10.0f}{cache[0]:>11.0f}{cache[1]:>11.0f}{reminder_cache.misses - misses:>9}")
+
+    pages, counts = read_cache(now, today_end)
+    sql_pages, sql_counts = read_sql(now, today_end)
+    same = counts == sql_counts and all(
+        [r.id for r in pages[g][0]] == [r.id for r in sql_pages[g][0]] for g in pages
+    )
+    print(f"write-throughs {reminder_cache.writes}, invalidations {reminder_cache.invalidations}")
+    print(f"verify: {reminder_cache.verify(USER)}, pages match SQL: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Retention on a year of history: rows archived, space reclaimed, hot-table scans before and after.
+
+Each size gets a fresh fixture built through the app's migrations: that many
+reminders, run times spread over the past year and the next 120 days (past
+ones done, 1 in 10 cancelled, 1% daily), and as many notifications, one
+created every so often over the past year, 2% still unread. A fresh
+interpreter then times full scans of both hot tables, runs
+scheduler._apply_retention once with the default policies (pauses between
+batches switched off, so the time is the work itself) and times the scans
+again. "incremental" is a file created by this version; "convert" is the
+same data in a file from before incremental auto_vacuum, converted by the
+one-time full VACUUM (RETENTION_CONVERT_VACUUM=1). File sizes are after a
+WAL checkpoint. Scan times are medians of ROUNDS warm runs.
+
+Run from the backend directory:  python benchmarks/bench_retention.py
+"""
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = (100_000, 1_000_000)
+USERS = 100
+YEAR = 365 * 86400
+FUTURE = 120 * 86400
+
+FIXTURE_SQL = """
+WITH RECURSIVE seq(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i + 1 < :size)
+INSERT INTO {table}
+"""
+
+SNIPPET = """
+import json, logging, statistics, sys, time
+logging.disable(logging.WARNING)
+sys.path.insert(0, {backend!r})
+import scheduler as scheduling
+from database import db
+
+scheduling.RETENTION_PAUSE = 0
+conn = db._get_conn()
+SCANS = {{
+    "reminders": "SELECT MAX(length(task)) FROM reminders",
+    "notifications": "SELECT MAX(length(message)) FROM notifications",
+}}
+
+def measure():
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    stats = db.storage_stats()
+    scans = {{}}
+    for name, sql in SCANS.items():
+        samples = []
+        for _ in range({rounds}):
+            start = time.perf_counter()
+            conn.execute(sql).fetchone()
+            samples.append(time.perf_counter() - start)
+        scans[name] = statistics.median(samples)
+    rows = {{t: conn.execute(f"SELECT COUNT(*) FROM {{t}}").fetchone()[0]
+            for t in ("reminders", "notifications", "reminders_archive", "notifications_archive")}}
+    return {{"bytes": stats["page_count"] * stats["page_size"], "free": stats["freelist_count"],
+            "auto_vacuum": stats["auto_vacuum"], "scans": scans, "rows": rows}}
+
+before = measure()
+start = time.perf_counter()
+scheduling.scheduler._apply_retention()
+took = time.perf_counter() - start
+after = measure()
+active_archived = conn.execute(
+    "SELECT COUNT(*) FROM reminders_archive WHERE status NOT IN ('done', 'cancelled')"
+).fetchone()[0]
+print(json.dumps({{"before": before, "after": after, "seconds": took, "active_archived": active_archived}}))
+"""
+
+
+def build_fixture(path, size, legacy):
+    """Schema through the app's migrations, then a year of rows by SQL."""
+    subprocess.run(
+        [sys.executable, "-c", "import database"], cwd=BACKEND_DIR, env=dict(os.environ, DB_PATH=path),
+        check=True, capture_output=True,
+    )
+    now = int(time.time())
+    params = {"size": size, "users": USERS, "now": now, "span": YEAR + FUTURE, "past": YEAR}
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(FIXTURE_SQL.format(table="users (name)") + "SELECT 'bench' || (i + 2) FROM seq WHERE i < :users - 1",
+                     params)
+        # Finished rows were last changed at their run time
+        conn.execute(FIXTURE_SQL.format(
+            table="reminders (user_id, task, run_time, repeat_type, is_recurring, status, created_at, updated_at)") + """
+            SELECT 1 + i % :users, 'task ' || i, run_time,
+                   CASE WHEN i % 100 = 0 THEN 'daily' ELSE 'once' END, i % 100 = 0,
+                   CASE WHEN i % 100 = 0 OR run_time >= :now THEN 'active'
+                        WHEN i % 10 = 1 THEN 'cancelled' ELSE 'done' END,
+                   datetime(run_time - 86400, 'unixepoch'), datetime(MIN(run_time, :now), 'unixepoch')
+            FROM (SELECT i, :now - :past + (i * 7919) % :span AS run_time FROM seq)""", params)
+        # Ids grow with created_at, as they do in the app
+        conn.execute(FIXTURE_SQL.format(table="notifications (user_id, message, is_read, created_at)") + """
+            SELECT 1 + i % :users, '🔔 Reminder: task ' || i, i % 50 != 0,
+                   datetime(:now - :past + i * :past / :size, 'unixepoch') FROM seq""", params)
+    if legacy:
+        conn.execute("PRAGMA auto_vacuum = NONE")
+        conn.execute("VACUUM")
+    conn.close()
+
+
+def run(size, mode):
+    path = os.path.join(tempfile.mkdtemp(), f"retention_{mode}.db")
+    start = time.perf_counter()
+    build_fixture(path, size, legacy=mode == "convert")
+    built = time.perf_counter() - start
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(backend=BACKEND_DIR, rounds=5)], cwd=BACKEND_DIR,
+        capture_output=True, text=True, check=True,
+        env=dict(os.environ, DB_PATH=path, RETENTION_CONVERT_VACUUM="1" if mode == "convert" else "0"),
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["built"] = built
+    return result
+
+
+def mb(value):
+    return f"{value / 2**20:.1f}"
+
+
+def main():
+    print("one retention pass with the default policies (notifications 30 days, reminders 90 days)")
+    print(f"{'size':>9}  {'mode':<12}{'archived rem':>13}{'notif':>9}{'pass s':>8}{'file MB':>16}"
+          f"{'reclaimed':>11}{'rem scan ms':>16}{'notif scan ms':>16}")
+    for size in SIZES:
+        for mode in ("incremental", "convert"):
+            r = run(size, mode)
+            b, a = r["before"], r["after"]
+            scans = [f"{b['scans'][t] * 1000:.1f} → {a['scans'][t] * 1000:.1f}" for t in ("reminders", "notifications")]
+            print(f"{size:>9}  {mode:<12}{a['rows']['reminders_archive']:>13}{a['rows']['notifications_archive']:>9}"
+                  f"{r['seconds']:>8.1f}{mb(b['bytes']) + ' → ' + mb(a['bytes']):>16}{mb(b['bytes'] - a['bytes']):>11}"
+                  f"{scans[0]:>16}{scans[1]:>16}"
+                  + (f"  ({r['active_archived']} unfinished reminders archived!)" if r["active_archived"] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Scheduler boot time and resident memory against table size.
+
+"full" sets the horizon to ten years, which materializes every future
+reminder the way load_jobs_from_db used to; "horizon" is the default
+one-hour window. "restart" boots a second time on the same file, reusing
+the persisted job store. Each run is a fresh interpreter.
+
+Run from the backend directory:  python benchmarks/bench_scheduler_boot.py
+"""
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = (1_000, 10_000, 100_000)
+RECURRING_EVERY = 100  # 1% daily reminders
+TEN_YEARS = str(10 * 365 * 24 * 60)
+# label, horizon minutes, boots on the same file (only the last is reported)
+MODES = (("full", TEN_YEARS, 1), ("horizon", "60", 1), ("restart", "60", 2))
+
+SNIPPET = """
+import json, logging, sys, time
+logging.disable(logging.WARNING)
+sys.path.insert(0, {backend!r})
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4096 / 2**20
+from scheduler import scheduler
+before = rss_mb()
+start = time.perf_counter()
+scheduler.start()
+scheduler.load_jobs_from_db()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"boot": elapsed, "rss": rss_mb() - before, "jobs": scheduler.jobstore.count_jobs()}}))
+scheduler.scheduler.shutdown(wait=False)
+"""
+
+
+def seed(path, size):
+    # Create the schema through the app, then bulk insert
+    subprocess.run(
+        [sys.executable, "-c", f"import sys; sys.path.insert(0, {BACKEND_DIR!r}); import database"],
+        env=dict(os.environ, DB_PATH=path), check=True, capture_output=True,
+    )
+    now = int(time.time())
+    rows = [
+        (
+            f"task {i}",
+            # Spread over the next year, as epoch seconds
+            now + 60 * (5 + i * 525_600 // size),
+            'daily' if i % RECURRING_EVERY == 0 else 'once',
+        )
+        for i in range(size)
+    ]
+    conn = sqlite3.connect(path)
+    with conn:
+        # Rows last touched yesterday, so a restart has nothing to reconcile
+        conn.executemany(
+            "INSERT INTO reminders (task, run_time, repeat_type, status, is_recurring, updated_at) "
+            "VALUES (?, ?, ?, 'active', ? != 'once', datetime('now', '-1 day'))",
+            [(t, rt, rep, rep) for t, rt, rep in rows],
+        )
+    conn.close()
+
+
+def main():
+    print(f"{'rows':>8}{'mode':>9}{'jobs':>9}{'boot s':>9}{'RSS MB':>9}")
+    for size in SIZES:
+        seeded = os.path.join(tempfile.mkdtemp(), "seeded.db")
+        seed(seeded, size)
+        for mode, horizon, boots in MODES:
+            path = os.path.join(tempfile.mkdtemp(), "bench_boot.db")
+            shutil.copy(seeded, path)
+            env = dict(os.environ, DB_PATH=path, SCHEDULE_HORIZON_MINUTES=horizon)
+            for _ in range(boots):
+                out = subprocess.run(
+                    [sys.executable, "-c", SNIPPET.format(backend=BACKEND_DIR)],
+                    env=env, capture_output=True, text=True, check=True,
+                )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{size:>8}{mode:>9}{r['jobs']:>9}{r['boot']:>9.2f}{r['rss']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Fetch + serialize 50k reminders: per-row dicts through FastAPI's encoder vs Reminder records.
+
+"dicts" is the old path: rows built into 13-key dicts and returned from the
+endpoint, so FastAPI runs jsonable_encoder over every field before
+json.dumps. "records" is Database returning Reminder records and the
+endpoint handing them to serialization.dumps. Peak memory is the tracemalloc
+high-water mark of one fetch + serialize.
+
+Run from the backend directory:  python benchmarks/bench_serialize.py
+"""
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_serialize.db")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from database import db  # noqa: E402
+from database.records import REMINDER_FIELDS  # noqa: E402
+import serialization  # noqa: E402
+
+logging.disable(logging.INFO)
+
+ROWS = 50_000
+RUNS = 5
+
+
+def as_dicts():
+    rows = db._get_conn().execute("SELECT * FROM reminders WHERE status = 'active' ORDER BY run_time").fetchall()
+    items = [dict(zip(REMINDER_FIELDS, r)) for r in rows]
+    # What Starlette's JSONResponse does with the encoded content
+    return json.dumps(jsonable_encoder(items), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def as_records():
+    return serialization.dumps(db.get_active_reminders())
+
+
+def measure(call):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    body = call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(samples) * 1000, peak / 2**20, len(body)
+
+
+def main():
+    now = datetime.now()
+    db.add_reminders([
+        {'task': f"task {i}", 'description': "details", 'run_time': now + timedelta(minutes=i)}
+        for i in range(ROWS)
+    ])
+    encoder = "orjson" if serialization.orjson else "json"
+    print(f"{ROWS} reminders, encoder {encoder}")
+    print(f"{'path':>8}{'ms':>10}{'peak MB':>10}{'body MB':>10}")
+    for label, call in (("dicts", as_dicts), ("records", as_records)):
+        ms, peak, size = measure(call)
+        print(f"{label:>8}{ms:>10.1f}{peak:>10.1f}{size / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
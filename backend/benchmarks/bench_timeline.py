@@ -0,0 +1,74 @@
+"""GET /tasks/timeline data access: old two-query Python bucketing vs get_timeline.
+
+Rows are spread from a month ago to a year ahead, so "upcoming" holds most
+of them. "paged" is the first page of every bucket plus the counts, which
+is what the endpoint now runs per request.
+
+Run from the backend directory:  python benchmarks/bench_timeline.py
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(), "unused.db"))
+
+from database.database import Database, DEFAULT_USER_ID  # noqa: E402
+
+logging.disable(logging.INFO)
+
+SIZES = (1_000, 10_000, 100_000)
+PAGE = 50
+RUNS = 5
+
+
+def old_timeline(db, now):
+    # The endpoint as it was: two overlapping reads, bucketed in Python
+    all_reminders = db.get_active_reminders()
+    overdue = db.get_overdue_reminders()
+    today_end = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    past, today, upcoming = list(overdue), [], []
+    for r in all_reminders:
+        rt = r.run_time.replace(tzinfo=None)
+        if rt < now:
+            continue
+        (today if rt < today_end else upcoming).append(r)
+    return past, today, upcoming
+
+
+def paged_timeline(db, now):
+    today_end = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return db.get_timeline(DEFAULT_USER_ID, now, today_end, PAGE), db.count_timeline(DEFAULT_USER_ID, now, today_end)
+
+
+def timed(call):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    now = datetime.now()
+    print(f"{'rows':>8}{'old ms':>10}{'paged ms':>10}")
+    for size in SIZES:
+        db = Database(os.path.join(tempfile.mkdtemp(), "timeline.db"))
+        span = 395 * 24 * 60
+        db.add_reminders([
+            {'task': f"task {i}", 'run_time': now + timedelta(minutes=i * span // size - 30 * 24 * 60)}
+            for i in range(size)
+        ])
+        old = timed(lambda: old_timeline(db, now))
+        paged = timed(lambda: paged_timeline(db, now))
+        print(f"{size:>8}{old:>10.1f}{paged:>10.2f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
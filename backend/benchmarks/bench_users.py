@@ -0,0 +1,132 @@
+"""Per-user query cost as the number of users grows to 10k.
+
+Every user owns the same slice (REMINDERS_PER_USER reminders spread around
+now, NOTIFICATIONS_PER_USER notifications, half of them read), so with
+user_id leading the indexes a user's timeline, unread notifications and
+calendar month should cost the same at 10 users as at 10k. "global" is the
+same schema with only the pre-user indexes (status/run_time, unread id),
+where the user filter is applied to every user's rows.
+
+Times are medians over SAMPLE random users, in microseconds per call.
+
+Run from the backend directory:  python benchmarks/bench_users.py
+"""
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(), "unused.db"))
+
+from database.database import Database  # noqa: E402
+from database.times import to_epoch  # noqa: E402
+import calendar_cache  # noqa: E402
+
+logging.disable(logging.INFO)
+
+USER_COUNTS = (10, 100, 1_000, 10_000)
+REMINDERS_PER_USER = 20
+NOTIFICATIONS_PER_USER = 10
+SAMPLE = 200
+PAGE = 50
+
+USER_INDEXES = (
+    "idx_reminders_user_status_run_time",
+    "idx_reminders_user_run_time",
+    "idx_reminders_user_recurring",
+    "idx_notifications_user_id",
+    "idx_notifications_user_unread",
+)
+GLOBAL_INDEXES = (
+    "CREATE INDEX idx_reminders_run_time ON reminders(run_time)",
+    "CREATE INDEX idx_notifications_unread_id ON notifications(id) WHERE is_read = 0",
+)
+
+
+def open_db(mode):
+    db = Database(os.path.join(tempfile.mkdtemp(), f"users_{mode}.db"))
+    if mode == "global":
+        conn = db._get_conn()
+        with conn:
+            for name in USER_INDEXES:
+                conn.execute(f"DROP INDEX {name}")
+            for sql in GLOBAL_INDEXES:
+                conn.execute(sql)
+    return db
+
+
+def add_users(db, first, last, now):
+    """Users first..last-1 (ids first + 1..last), each with their slice of rows."""
+    conn = db._get_conn()
+    span = 60 * 24 * 3600
+    start = to_epoch(now) - span // 2
+    with conn:
+        conn.executemany("INSERT INTO users (name) VALUES (?)", [(f"user {u}",) for u in range(first, last)])
+        ids = [r[0] for r in conn.execute("SELECT id FROM users WHERE id > ? ORDER BY id", (first,))]
+        conn.executemany(
+            "INSERT INTO reminders (user_id, task, run_time, repeat_type, status) VALUES (?, ?, ?, ?, 'active')",
+            [
+                (user_id, f"task {i}", start + random.randrange(span), 'daily' if i == 0 else 'once')
+                for user_id in ids for i in range(REMINDERS_PER_USER)
+            ]
+        )
+        conn.executemany(
+            "INSERT INTO notifications (user_id, message, is_read) VALUES (?, ?, ?)",
+            [
+                (user_id, f"notification {i}", i % 2)
+                for i in range(NOTIFICATIONS_PER_USER) for user_id in ids
+            ]
+        )
+    return ids
+
+
+def per_call_us(call, user_ids):
+    samples = []
+    for user_id in user_ids:
+        start = time.perf_counter()
+        call(user_id)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def measure(db, user_ids, now):
+    today_end = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    sample = random.sample(user_ids, min(SAMPLE, len(user_ids)))
+    # build_month reads through the module's db
+    calendar_cache.db = db
+    return (
+        per_call_us(lambda u: (db.get_timeline(u, now, today_end, PAGE), db.count_timeline(u, now, today_end)), sample),
+        per_call_us(lambda u: db.get_unread_notifications(u, limit=PAGE), sample),
+        per_call_us(lambda u: calendar_cache.build_month(u, now.year, now.month), sample),
+    )
+
+
+def main():
+    random.seed(19)
+    now = datetime.now().replace(microsecond=0)
+    results = {}
+    for mode in ("user", "global"):
+        db = open_db(mode)
+        user_ids = [1]
+        for count in USER_COUNTS:
+            user_ids += add_users(db, len(user_ids), count + 1, now)
+            results[mode, count] = measure(db, user_ids[1:], now)
+        db.close()
+
+    print(f"{REMINDERS_PER_USER} reminders and {NOTIFICATIONS_PER_USER} notifications per user; us per call")
+    print(f"{'':>8}{'------ user_id-leading -----':>30}{'-------- global only --------':>30}")
+    print(f"{'users':>8}" + f"{'timeline':>10}{'unread':>10}{'calendar':>10}" * 2)
+    for count in USER_COUNTS:
+        row = f"{count:>8}"
+        for mode in ("user", "global"):
+            row += "".join(f"{us:>10.0f}" for us in results[mode, count])
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Fail unless every reminder fires exactly once with several API workers.
+
+"external" runs uvicorn with WORKERS workers in SCHEDULER_MODE=external plus
+two scheduler_service.py processes. A batch of reminders is created through
+the API and left to fire. Then the leader is killed with SIGKILL and a
+second batch fires once the standby has taken over the lease. "embedded"
+runs the same workers with their own in-process schedulers and no service,
+for comparison; it is reported, not checked.
+
+Run from the backend directory:  python benchmarks/check_scheduler_service.py
+"""
+import os
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKERS = 2
+REMINDERS = 20
+LEASE_SECONDS = 3
+LEAD_TIME = 3  # seconds from creating a batch to its reminders firing
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def environment(path, mode):
+    return dict(
+        os.environ, DB_PATH=path, SCHEDULER_MODE=mode,
+        SCHEDULER_LEASE_SECONDS=str(LEASE_SECONDS), SCHEDULE_QUEUE_POLL_MS="200",
+    )
+
+
+def start_api(path, mode, port):
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--workers", str(WORKERS), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=environment(path, mode), stderr=subprocess.DEVNULL,
+    )
+
+
+def start_service(path):
+    return subprocess.Popen(
+        [sys.executable, "scheduler_service.py"],
+        cwd=BACKEND_DIR, env=environment(path, "external"), stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_ready(client):
+    for _ in range(200):
+        try:
+            client.get("/health").raise_for_status()
+            return
+        except Exception:
+            time.sleep(0.1)
+    raise RuntimeError("API did not start")
+
+
+def create_batch(client, label):
+    """REMINDERS one-off reminders due LEAD_TIME seconds from now. Returns their task names."""
+    run_time = (datetime.now(timezone.utc) + timedelta(seconds=LEAD_TIME)).isoformat()
+    tasks = [f"{label} {i}" for i in range(REMINDERS)]
+    for task in tasks:
+        client.post("/tasks", json={"task": task, "run_time": run_time}).raise_for_status()
+    return tasks
+
+
+def fired(path, tasks):
+    """How many notifications each task produced."""
+    with sqlite3.connect(path) as conn:
+        counts = Counter(message.removeprefix("🔔 Reminder: ") for (message,) in conn.execute("SELECT message FROM notifications"))
+    return [counts[task] for task in tasks]
+
+
+def lease_holder_pid(path):
+    with sqlite3.connect(path) as conn:
+        row = conn.execute("SELECT holder FROM leases WHERE name = 'scheduler'").fetchone()
+    return int(row[0].rsplit(":", 1)[1]) if row else None
+
+
+def report(label, counts):
+    spread = Counter(counts)
+    print(f"{label:<38}" + ", ".join(f"{n}x: {spread[n]}" for n in sorted(spread)))
+    return all(n == 1 for n in counts)
+
+
+def run_external(client, path):
+    services = [start_service(path) for _ in range(2)]
+    try:
+        deadline = time.time() + 10
+        while lease_holder_pid(path) is None and time.time() < deadline:
+            time.sleep(0.1)
+        first = create_batch(client, "first")
+        time.sleep(LEAD_TIME + 2)
+        ok = report("external, leader running", fired(path, first))
+
+        leader = lease_holder_pid(path)
+        os.kill(leader, signal.SIGKILL)
+        second = create_batch(client, "second")
+        # The standby waits out the dead leader's lease, then catches up on the queue
+        time.sleep(LEASE_SECONDS + LEAD_TIME + 3)
+        ok &= report("external, after killing the leader", fired(path, second))
+        ok &= lease_holder_pid(path) not in (None, leader)
+        return ok
+    finally:
+        for service in services:
+            service.terminate()
+            service.wait()
+
+
+def main():
+    import httpx
+    ok = True
+    for mode in ("external", "embedded"):
+        path = os.path.join(tempfile.mkdtemp(), f"{mode}.db")
+        # Create the schema once, before several processes race to migrate it
+        subprocess.run([sys.executable, "-c", "import database"], cwd=BACKEND_DIR, env=environment(path, mode),
+                       check=True, stderr=subprocess.DEVNULL)
+        port = free_port()
+        api = start_api(path, mode, port)
+        try:
+            with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+                wait_ready(client)
+                if mode == "external":
+                    ok = run_external(client, path)
+                else:
+                    tasks = create_batch(client, "embedded")
+                    time.sleep(LEAD_TIME + 2)
+                    report(f"embedded, {WORKERS} workers (unchecked)", fired(path, tasks))
+        finally:
+            api.terminate()
+            api.wait()
+    print("ok" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Load test: simulated browser sessions against the app, in process, at several table sizes.
+
+For each size a synthetic SQLite fixture is generated: that many reminders
+and as many notifications, spread over max(10, size / 1000) users so each
+user's share stays about the same as the table grows. Generation is plain
+arithmetic on the row number, laid out around the current time, so every
+run gets the same data. The app then boots on the fixture in a fresh
+interpreter, lifespan and scheduler included, and CLIENTS sessions run
+against it through httpx's ASGI transport (no server or sockets). Each
+session is one user doing what the frontend does:
+
+  poll   useNotifications' fallback: GET /notifications every 2 s, then
+         POST /notifications/read for whatever came back
+  views  GET /tasks/timeline, the next "upcoming" page, GET /tasks/calendar
+  chat   POST /chat, then POST /tasks with the confirmation card
+
+Views and chat alternate back to back (--think adds a pause), so the
+request rate is what the app sustains with client and server sharing one
+process. The results, per size and endpoint (throughput, p50/p95/p99 ms,
+errors), are written as JSON. With --baseline, an earlier JSON file, the
+run exits 1 when an endpoint's p95 grew or its throughput fell by more
+than --max-regression (throughput only for the unpaced endpoints, and
+only between runs with the same clients, think time and duration).
+
+Run from the backend directory:
+  python benchmarks/loadtest.py --sizes 1k,100k,1m --output loadtest.json
+  python benchmarks/loadtest.py --sizes 1k --baseline loadtest.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+USER_SHARE = 1_000  # reminders per user once there are more than 10 users
+POLL_INTERVAL = 2.0  # useNotifications' POLL_INTERVAL_MS
+# Requests on a timer: their rate is set by the clients, so only latency is compared
+PACED = ("GET /notifications", "POST /notifications/read")
+# Load settings two runs must share to be compared
+COMPARED_CONFIG = ("clients", "think", "duration")
+TIMELINE_SPAN_DAYS = 120
+PAST_DAYS = 30
+# Settings that change what is measured, recorded with the results
+RECORDED_ENV = ("SCHEDULER_MODE", "DISPATCH_ENGINE", "PARSE_POOL", "PARSE_WORKERS", "DB_WORKERS", "REMINDER_CACHE_USERS")
+
+TASK_WORDS = ("call mom", "pay rent", "water the plants", "stretch", "submit the report", "book tickets",
+              "take medicine", "email Priya", "renew the passport", "buy groceries", "walk the dog", "team sync")
+# Fast-path forms, dateparser forms and a recurring one, roughly as people type them
+CHAT_FORMS = ("remind me to {} at 5pm", "remind me to {} in 20 minutes", "{} tomorrow at 9am",
+              "remind me to {} on friday at 10am", "remind me to {} next monday", "{} daily at 8am")
+
+
+# --- Fixtures ---
+
+FIXTURE_SQL = """
+WITH RECURSIVE seq(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i + 1 < :size)
+INSERT INTO {table}
+"""
+
+
+def build_fixture(path, size, users):
+    """Schema through the app's migrations, then rows by SQL. Returns (seconds taken, user names by id)."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "import database"], cwd=BACKEND_DIR, env=dict(os.environ, DB_PATH=path),
+        check=True, capture_output=True,
+    )
+    now = int(time.time())
+    span, past = TIMELINE_SPAN_DAYS * 86400, PAST_DAYS * 86400
+    params = {"size": size, "users": users, "now": now, "span": span, "past": past}
+    conn = sqlite3.connect(path)
+    with conn:
+        # User 1 is the app's default user; the rest are named load<id>
+        conn.execute(FIXTURE_SQL.format(table="users (name)") + "SELECT 'load' || (i + 2) FROM seq WHERE i < :users - 1",
+                     params)
+        # 1% daily and 0.5% weekly; past one-offs are done, the rest active; 1 in 10 high priority
+        conn.execute(FIXTURE_SQL.format(
+            table="reminders (user_id, task, run_time, repeat_type, is_recurring, priority, status)") + """
+            SELECT 1 + i % :users, 'task ' || i, :now + (i * 7919) % :span - :past,
+                   CASE WHEN i % 100 = 0 THEN 'daily' WHEN i % 200 = 1 THEN 'weekly' ELSE 'once' END,
+                   i % 100 = 0 OR i % 200 = 1,
+                   CASE WHEN i % 10 = 0 THEN 2 ELSE 1 END,
+                   CASE WHEN i % 100 = 0 OR i % 200 = 1 OR (i * 7919) % :span >= :past THEN 'active' ELSE 'done' END
+            FROM seq""", params)
+        # 2% still unread
+        conn.execute(FIXTURE_SQL.format(table="notifications (user_id, message, is_read)") + """
+            SELECT 1 + i % :users, '🔔 Reminder: task ' || i, i % 50 != 0 FROM seq""", params)
+    names = [name for (name,) in conn.execute("SELECT name FROM users ORDER BY id")]
+    conn.close()
+    return time.perf_counter() - start, names
+
+
+# --- Load (runs in the child interpreter) ---
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+
+    async def call(self, label, request):
+        start = time.perf_counter()
+        try:
+            response = await request
+            ok = response.status_code < 400
+        except Exception:
+            response, ok = None, False
+        self.samples.setdefault(label, []).append(time.perf_counter() - start)
+        if not ok:
+            self.errors[label] = self.errors.get(label, 0) + 1
+        return response if ok else None
+
+
+async def poll(client, rec, headers, stop):
+    loop = asyncio.get_running_loop()
+    while loop.time() < stop:
+        started = loop.time()
+        r = await rec.call("GET /notifications", client.get("/notifications", params={"since_id": 0, "limit": 100},
+                                                             headers=headers))
+        unread = r.json() if r is not None else []
+        if unread:
+            await rec.call("POST /notifications/read",
+                           client.post("/notifications/read", json={"ids": [n["id"] for n in unread]}, headers=headers))
+        await asyncio.sleep(max(0.0, POLL_INTERVAL - (loop.time() - started)))
+
+
+async def views(client, rec, headers):
+    r = await rec.call("GET /tasks/timeline", client.get("/tasks/timeline", headers=headers))
+    cursor = r.json()["next"].get("upcoming") if r is not None else None
+    if cursor:
+        await rec.call("GET /tasks/timeline next", client.get(
+            "/tasks/timeline", params={"group": "upcoming", "cursor": cursor}, headers=headers))
+    today = datetime.now()
+    await rec.call("GET /tasks/calendar", client.get(
+        "/tasks/calendar", params={"month": today.month, "year": today.year}, headers=headers))
+
+
+async def chat(client, rec, headers, rng):
+    message = rng.choice(CHAT_FORMS).format(rng.choice(TASK_WORDS))
+    local_time = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    r = await rec.call("POST /chat", client.post(
+        "/chat", json={"message": message, "preview": False, "local_time": local_time}, headers=headers))
+    card = r.json() if r is not None else {}
+    if card.get("type") == "confirmation_card":
+        data = card["data"]
+        await rec.call("POST /tasks", client.post("/tasks", json={
+            "task": data["task"], "run_time": data["run_time"], "repeat_type": data["repeat_type"]}, headers=headers))
+
+
+async def session(client, rec, user, seed, think, stop):
+    headers = {"X-User": user}
+    rng = random.Random(seed)
+    poller = asyncio.create_task(poll(client, rec, headers, stop))
+    loop = asyncio.get_running_loop()
+    while loop.time() < stop:
+        await (views(client, rec, headers) if rng.random() < 0.6 else chat(client, rec, headers, rng))
+        await asyncio.sleep(think)
+    await poller
+
+
+async def drive(users, clients, duration, think, seed):
+    import httpx
+    import api
+    boot = time.perf_counter()
+    async with api.lifespan(api.app):
+        boot = time.perf_counter() - boot
+        rec = Recorder()
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+            loop = asyncio.get_running_loop()
+            stop = loop.time() + duration
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                session(client, rec, users[i % len(users)], seed + i, think, stop) for i in range(clients)
+            ))
+            elapsed = time.perf_counter() - started
+    return boot, elapsed, rec
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def child(args):
+    import logging
+    logging.disable(logging.WARNING)
+    sys.path.insert(0, BACKEND_DIR)
+    users = json.loads(args.users)
+    boot, elapsed, rec = asyncio.run(drive(users, args.clients, args.duration, args.think, args.seed))
+    endpoints = {}
+    for label, samples in sorted(rec.samples.items()):
+        ordered = sorted(samples)
+        endpoints[label] = {
+            "requests": len(samples), "errors": rec.errors.get(label, 0), "rps": len(samples) / elapsed,
+            "p50_ms": percentile(ordered, .50) * 1000, "p95_ms": percentile(ordered, .95) * 1000,
+            "p99_ms": percentile(ordered, .99) * 1000,
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    print(json.dumps({"boot_seconds": boot, "seconds": elapsed, "requests": total, "rps": total / elapsed,
+                      "endpoints": endpoints}))
+
+
+# --- Suite ---
+
+
+def run_size(label, size, args, directory):
+    users = max(10, size // USER_SHARE)
+    path = os.path.join(directory, f"fixture-{label}.db")
+    fixture_seconds, names = build_fixture(path, size, users)
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--users", json.dumps(names),
+         "--clients", str(args.clients), "--duration", str(args.duration), "--think", str(args.think),
+         "--seed", str(args.seed)],
+        cwd=BACKEND_DIR, env=dict(os.environ, DB_PATH=path), capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"load run for {label} failed:\n{out.stderr[-2000:]}")
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return dict({"size": size, "label": label, "users": users, "fixture_seconds": fixture_seconds}, **result)
+
+
+def report(result):
+    print(f"\n{result['label']}: {result['size']} reminders and notifications, {result['users']} users; "
+          f"fixture {result['fixture_seconds']:.1f}s, boot {result['boot_seconds']:.1f}s, "
+          f"{result['rps']:.0f} req/s overall", file=sys.stderr)
+    print(f"  {'endpoint':<28}{'requests':>9}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}",
+          file=sys.stderr)
+    for name, e in result["endpoints"].items():
+        print(f"  {name:<28}{e['requests']:>9}{e['rps']:>8.1f}{e['p50_ms']:>9.1f}{e['p95_ms']:>9.1f}"
+              f"{e['p99_ms']:>9.1f}{e['errors']:>8}", file=sys.stderr)
+
+
+def regressions(results, baseline, tolerance):
+    """Endpoints whose p95 grew, or throughput fell, by more than tolerance against the baseline run."""
+    before = {r["label"]: r for r in baseline["results"]}
+    found = []
+    for result in results:
+        old = before.get(result["label"])
+        if old is None:
+            continue
+        for name, e in result["endpoints"].items():
+            o = old["endpoints"].get(name)
+            if o is None:
+                continue
+            if e["p95_ms"] > o["p95_ms"] * (1 + tolerance):
+                found.append(f"{result['label']} {name}: p95 {o['p95_ms']:.1f} -> {e['p95_ms']:.1f} ms")
+            if name not in PACED and e["rps"] < o["rps"] * (1 - tolerance):
+                found.append(f"{result['label']} {name}: {o['rps']:.1f} -> {e['rps']:.1f} req/s")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="1k,100k,1m", help="comma separated: " + ", ".join(SIZES))
+    parser.add_argument("--clients", type=int, default=20, help="concurrent user sessions")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load per size")
+    parser.add_argument("--think", type=float, default=0, help="pause between a session's actions, seconds")
+    parser.add_argument("--seed", type=int, default=24)
+    parser.add_argument("--output", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--fixtures", help="keep the generated fixtures in this directory")
+    parser.add_argument("--baseline", help="earlier --output to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed p95/throughput change")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--users", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    labels = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in labels if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size {', '.join(unknown)}; choose from {', '.join(SIZES)}")
+    directory = args.fixtures or tempfile.mkdtemp(prefix="loadtest-")
+    os.makedirs(directory, exist_ok=True)
+    try:
+        results = []
+        for label in labels:
+            results.append(run_size(label, SIZES[label], args, directory))
+            report(results[-1])
+    finally:
+        if not args.fixtures:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    document = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+        "config": {"clients": args.clients, "duration": args.duration, "think": args.think, "seed": args.seed,
+                   "env": {k: os.environ[k] for k in RECORDED_ENV if k in os.environ}},
+        "results": results,
+    }
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        differs = [k for k in COMPARED_CONFIG if baseline["config"].get(k) != document["config"][k]]
+        if differs:
+            print(f"Baseline was run with different {', '.join(differs)}; not comparing", file=sys.stderr)
+            sys.exit(2)
+        found = regressions(results, baseline, args.max_regression)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        sys.exit(1 if found else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""cProfile of the timeline endpoint and db.get_timeline at 100k reminders.
+
+Pages are 500 rows per bucket so per-row costs (conversion, sorting) show
+up above the fixed per-query overhead.
+
+Run from the backend directory:  python benchmarks/profile_timeline.py
+"""
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "profile_timeline.db")
+
+from database import db, DEFAULT_USER_ID  # noqa: E402
+import api  # noqa: E402
+
+logging.disable(logging.INFO)
+
+ROWS = 100_000
+PAGE = 500
+CALLS = 200
+
+
+def main():
+    now = datetime.now().replace(microsecond=0)
+    span = 395 * 24 * 60
+    db.add_reminders([
+        {'task': f"task {i}", 'run_time': now + timedelta(minutes=i * span // ROWS - 30 * 24 * 60)}
+        for i in range(ROWS)
+    ])
+    today_end = now.replace(hour=0, minute=0, second=0) + timedelta(days=1)
+    # The endpoint is a coroutine; one loop serves every call
+    loop = asyncio.new_event_loop()
+
+    for label, call in (
+        ("db.get_timeline", lambda: db.get_timeline(DEFAULT_USER_ID, now, today_end, PAGE)),
+        ("GET /tasks/timeline", lambda: loop.run_until_complete(
+            api.get_timeline(limit=PAGE, group=None, cursor=None, user_id=DEFAULT_USER_ID)
+        )),
+    ):
+        call()
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            call()
+        per_call = (time.perf_counter() - start) / CALLS * 1000
+        print(f"\n== {label}: {per_call:.2f} ms/call ==")
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        for _ in range(CALLS):
+            call()
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("tottime").print_stats(8)
+
+
+if __name__ == "__main__":
+    main()
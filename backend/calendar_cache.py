@@ -0,0 +1,98 @@
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from database import db
+from recurrence import rule_for
+from serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Serialized months kept in memory, shared by all users; each one paging
+# around touches a handful
+CACHE_SIZE = 256
+
+def build_month(user_id, year, month):
+    """A user's reminders of a month grouped by local day, recurring ones expanded per occurrence.
+
+    Each entry is {id, task, time (HH:MM), repeat_type, status, priority}.
+    """
+    month_start = datetime(year, month, 1)
+    month_end = datetime(year + month // 12, month % 12 + 1, 1)
+
+    # Occurrences are keyed by ISO timestamp: local wall-clock time whether
+    # or not it carries an offset, so it sorts and slices cheaply.
+    occurrences = []
+    # Epoch seconds make an inclusive bound exact; midnight on the 1st belongs to next month
+    for r in db.get_reminders_by_date_range(user_id, month_start, month_end - timedelta(seconds=1)):
+        if r.repeat_type == 'once':
+            occurrences.append((r.run_time.isoformat(), r))
+    for r in db.get_recurring_reminders(user_id):
+        try:
+            # Rows come back aware in the app timezone; rules run on its wall clock
+            rt = r.run_time.replace(tzinfo=None)
+            rule = rule_for(r.repeat_type, r.repeat_payload, rt)
+            for occurrence in rule.between(max(month_start, rt), month_end):
+                occurrences.append((occurrence.isoformat(), r))
+        except ValueError as e:
+            logger.warning(f"Skipping recurrence of reminder {r.id}: {e}")
+    occurrences.sort(key=lambda o: o[0])
+
+    days = {}
+    for stamp, r in occurrences:
+        days.setdefault(stamp[:10], []).append({
+            'id': r.id,
+            'task': r.task,
+            'time': stamp[11:16],
+            'repeat_type': r.repeat_type,
+            'status': r.status,
+            'priority': r.priority,
+        })
+    return days
+
+class CalendarCache:
+    """Serialized calendar months keyed by (user, year, month, the user's reminders data version).
+
+    Any write to a user's reminders bumps their version (a trigger maintains
+    it), so entries are never served stale and never need explicit
+    invalidation; superseded ones simply age out of the LRU.
+    """
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def etag(self, user_id, year, month, version=None):
+        """ETag for a user's month as of their current data version. Costs one primary-key lookup."""
+        if version is None:
+            version = db.get_data_version(user_id)
+        return f'"cal-{user_id}-{year}-{month:02d}-{version}"'
+
+    def get(self, user_id, year, month):
+        """(etag, JSON body bytes) for a user's month, built on a miss."""
+        version = db.get_data_version(user_id)
+        key = (user_id, year, month, version)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self.etag(user_id, year, month, version), body
+
+        payload = {'year': year, 'month': month, 'days': build_month(user_id, year, month)}
+        body = dumps(payload)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = body
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return self.etag(user_id, year, month, version), body
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+calendar_cache = CalendarCache()
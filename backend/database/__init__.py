@@ -1 +1,3 @@
-from .database import db
+from .database import db, Database, TIMELINE_GROUPS, DEFAULT_USER, DEFAULT_USER_ID
+from .records import Reminder
+from .async_db import adb, AsyncDatabase
@@ -0,0 +1,65 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .database import db
+
+logger = logging.getLogger(__name__)
+
+# Threads serving async callers; the default matches AnyIO's threadpool (40),
+# which served the same handlers before they were async. A small pool left
+# requests queued behind each other's waits on SQLite's busy lock and on the
+# GIL, and throughput fell well below the sync handlers'.
+DB_WORKERS = int(os.environ.get('DB_WORKERS', '40'))
+
+class AsyncDatabase:
+    """Awaitable view of a Database: every public method, run on dedicated DB threads.
+
+    await adb.get_reminder(id) does what db.get_reminder(id) does, without
+    blocking the event loop or taking one of the request threadpool's slots.
+    Each DB thread keeps its pooled connection for the life of the process.
+    """
+
+    def __init__(self, database, workers=DB_WORKERS):
+        self._db = database
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="db")
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking callable that works on the database (e.g. a job store write) on the DB threads."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(fn, *args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self._db, name)
+        if name.startswith('_') or not callable(method):
+            raise AttributeError(name)
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+
+        # Cache on the instance so later lookups skip __getattr__
+        setattr(self, name, call)
+        return call
+
+    def shutdown(self):
+        """Finish queued calls and stop the DB threads; the next call starts new ones."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+            logger.info("🛑 Async database threads stopped")
+
+# Global async DB instance, used by the API's async endpoints
+adb = AsyncDatabase(db)
@@ -1,23 +1,273 @@
-import sqlite3
 import logging
 import os
-import json
-from datetime import datetime
+import time
+from .pool import ConnectionPool
+from .times import to_epoch
+from .records import Reminder
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Resolve DB path relative to this file for production stability (Render/Vercel safe)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "reminders_web.db")
+DB_PATH = os.getenv("DB_PATH", os.path.join(BASE_DIR, "reminders_web.db"))
+
+# Declared EPOCH so the registered converter returns them as datetimes
+EPOCH_COLUMNS = ('run_time', 'snooze_until', 'completion_time')
+
+def _epoch_or_none(value, reminder_id, column):
+    """to_epoch for migration 7: a legacy value that will not parse is logged and becomes None."""
+    try:
+        return to_epoch(value)
+    except (TypeError, ValueError):
+        logger.warning(f"Reminder {reminder_id}: cannot convert {column} {value!r}")
+        return None
+
+def _store_reminder_times_as_epoch(cursor):
+    """Rebuild reminders with EPOCH time columns, converting the local-time strings.
+
+    SQLite cannot change a column's declared type in place, so this is the
+    create-copy-drop-rename rebuild; indexes and triggers are recreated from
+    their stored SQL. It runs as one transaction, so a failure leaves the old
+    table untouched for the next boot to retry. A run_time that will not
+    parse keeps its row, cancelled at epoch 0 (logged), so it never fires.
+    """
+    conn = cursor.connection
+    # Whatever the earlier migrations left open, so BEGIN starts ours
+    conn.commit()
+    cursor.execute("BEGIN")
+    try:
+        schema = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = 'reminders' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+        ).fetchall()
+        sequence = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'reminders'").fetchone()
+        # Left behind by an attempt that failed before this ran in a transaction
+        cursor.execute("DROP TABLE IF EXISTS reminders_epoch")
+        cursor.execute('''
+            CREATE TABLE reminders_epoch (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task TEXT NOT NULL,
+                description TEXT,
+                run_time EPOCH NOT NULL,
+                repeat_type TEXT DEFAULT 'once',
+                repeat_payload TEXT,
+                is_recurring BOOLEAN DEFAULT 0,
+                priority INTEGER DEFAULT 1,
+                status TEXT DEFAULT 'active',
+                snooze_until EPOCH,
+                completion_time EPOCH,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        rows = cursor.execute('''
+            SELECT id, task, description, run_time, repeat_type, repeat_payload, is_recurring,
+                   priority, status, snooze_until, completion_time, created_at, updated_at
+            FROM reminders
+        ''').fetchall()
+        converted = []
+        for r in rows:
+            run_time = _epoch_or_none(r[3], r[0], 'run_time')
+            status = r[8] if run_time is not None else 'cancelled'
+            converted.append((
+                *r[:3], run_time or 0, *r[4:8], status,
+                _epoch_or_none(r[9], r[0], 'snooze_until'), _epoch_or_none(r[10], r[0], 'completion_time'), *r[11:]
+            ))
+        cursor.executemany("INSERT INTO reminders_epoch VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", converted)
+        cursor.execute("DROP TABLE reminders")
+        cursor.execute("ALTER TABLE reminders_epoch RENAME TO reminders")
+        for (sql,) in schema:
+            cursor.execute(sql)
+        if sequence:
+            # Ids of deleted rows above the current maximum stay retired
+            cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'reminders'", (sequence[0],))
+        # The scheduler's horizon watermark is a reminder time too
+        loaded_until = cursor.execute("SELECT value FROM scheduler_state WHERE key = 'loaded_until'").fetchone()
+        if loaded_until:
+            try:
+                loaded_until = to_epoch(loaded_until[0])
+            except (TypeError, ValueError):
+                # Zero makes the next refill start from the current time
+                loaded_until = 0
+            cursor.execute("UPDATE scheduler_state SET value = ? WHERE key = 'loaded_until'", (str(loaded_until),))
+        cursor.execute("COMMIT")
+    except Exception:
+        conn.rollback()
+        raise
+    logger.info(f"Converted {len(rows)} reminders to epoch times")
+
+# Buckets of the timeline view, in display order
+TIMELINE_GROUPS = ('past', 'today', 'upcoming')
+
+# Owner of rows created before users existed, and of requests that name no
+# user. Set DEFAULT_USER to an existing login before upgrading to hand it that data.
+DEFAULT_USER = os.getenv("DEFAULT_USER", "default")
+DEFAULT_USER_ID = 1
+
+# Versioned schema changes applied on top of the base tables. Entry N brings
+# the schema to version N + 1; PRAGMA user_version records how far a file is.
+# Append only - never edit a shipped entry.
+MIGRATIONS = [
+    [
+        # get_active_reminders / get_overdue_reminders: status filter + run_time order
+        "CREATE INDEX IF NOT EXISTS idx_reminders_status_run_time ON reminders(status, run_time)",
+        # get_reminders_by_date_range: run_time range across all statuses
+        "CREATE INDEX IF NOT EXISTS idx_reminders_run_time ON reminders(run_time)",
+        # get_unread_notifications: only unread rows are ever indexed
+        "CREATE INDEX IF NOT EXISTS idx_notifications_unread ON notifications(created_at) WHERE is_read = 0",
+    ],
+    [
+        # Unread notifications are now paged by id cursor rather than sorted by created_at
+        "DROP INDEX IF EXISTS idx_notifications_unread",
+        "CREATE INDEX IF NOT EXISTS idx_notifications_unread_id ON notifications(id) WHERE is_read = 0",
+    ],
+    [
+        # get_recurring_reminders: recurring jobs are always registered with the scheduler
+        "CREATE INDEX IF NOT EXISTS idx_reminders_recurring ON reminders(status) WHERE repeat_type != 'once'",
+    ],
+    [
+        # Durable APScheduler jobs (jobstore.SQLiteJobStore)
+        '''CREATE TABLE IF NOT EXISTS apscheduler_jobs (
+            id TEXT PRIMARY KEY,
+            next_run_time REAL,
+            job_state BLOB NOT NULL
+        )''',
+        "CREATE INDEX IF NOT EXISTS idx_apscheduler_jobs_next_run_time ON apscheduler_jobs(next_run_time)",
+        # Scheduler bookkeeping: heartbeat, reconciliation watermark, loaded horizon
+        "CREATE TABLE IF NOT EXISTS scheduler_state (key TEXT PRIMARY KEY, value TEXT)",
+        # get_reminders_updated_since: incremental reconciliation on boot
+        "CREATE INDEX IF NOT EXISTS idx_reminders_updated_at ON reminders(updated_at)",
+    ],
+    [
+        # Recurring jobs moved from CronTrigger to RecurrenceTrigger: dropping the
+        # watermark makes the next boot rebuild the job store from the table
+        "DELETE FROM scheduler_state WHERE key = 'reconciled_at'",
+    ],
+    [
+        # Change counter per table, bumped by triggers on every write path so
+        # read caches (get_data_version) can tell when they are stale
+        "CREATE TABLE IF NOT EXISTS data_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)",
+        "INSERT OR IGNORE INTO data_versions (name, version) VALUES ('reminders', 0)",
+    ] + [
+        f'''CREATE TRIGGER IF NOT EXISTS reminders_version_{event.lower()} AFTER {event} ON reminders
+        BEGIN
+            UPDATE data_versions SET version = version + 1 WHERE name = 'reminders';
+        END'''
+        for event in ('INSERT', 'UPDATE', 'DELETE')
+    ],
+    [
+        # Reminder times become integer epoch seconds (see database/times.py)
+        _store_reminder_times_as_epoch,
+    ],
+    [
+        # Users own reminders and notifications; existing rows go to the default user
+        '''CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )''',
+        lambda cursor: cursor.execute(
+            "INSERT OR IGNORE INTO users (id, name) VALUES (?, ?)", (DEFAULT_USER_ID, DEFAULT_USER)
+        ),
+        f"ALTER TABLE reminders ADD COLUMN user_id INTEGER NOT NULL DEFAULT {DEFAULT_USER_ID}",
+        f"ALTER TABLE notifications ADD COLUMN user_id INTEGER NOT NULL DEFAULT {DEFAULT_USER_ID}",
+        # Everything a request reads is one user's slice: user_id leads each index
+        # so its cost depends on that user's rows, not on how many users there are.
+        # get_timeline / count_timeline
+        "CREATE INDEX IF NOT EXISTS idx_reminders_user_status_run_time ON reminders(user_id, status, run_time)",
+        # get_reminders_by_date_range (the calendar); nothing scans run_time across users
+        "DROP INDEX IF EXISTS idx_reminders_run_time",
+        "CREATE INDEX IF NOT EXISTS idx_reminders_user_run_time ON reminders(user_id, run_time)",
+        # get_recurring_reminders(user_id) for the calendar; the scheduler keeps idx_reminders_recurring
+        "CREATE INDEX IF NOT EXISTS idx_reminders_user_recurring ON reminders(user_id, status) WHERE repeat_type != 'once'",
+        # get_notifications_after (stream resume)
+        "CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications(user_id, id)",
+        # get_unread_notifications / mark_*_read. Created after the full index on
+        # purpose: the planner breaks the tie between them in favour of the newer one.
+        "DROP INDEX IF EXISTS idx_notifications_unread_id",
+        "CREATE INDEX IF NOT EXISTS idx_notifications_user_unread ON notifications(user_id, id) WHERE is_read = 0",
+        # Data versions become per user ('reminders:<user_id>'), so one user's
+        # write leaves every other user's cached calendar valid
+        "DELETE FROM data_versions WHERE name = 'reminders'",
+    ] + [
+        sql
+        for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD'))
+        for sql in (
+            f"DROP TRIGGER IF EXISTS reminders_version_{event.lower()}",
+            f'''CREATE TRIGGER reminders_version_{event.lower()} AFTER {event} ON reminders
+            BEGIN
+                INSERT INTO data_versions (name, version) VALUES ('reminders:' || {row}.user_id, 1)
+                ON CONFLICT(name) DO UPDATE SET version = version + 1;
+            END''',
+        )
+    ],
+    [
+        # Scheduler service (SCHEDULER_MODE=external): the process holding the
+        # 'scheduler' lease fires reminders; the others stand by
+        "CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, holder TEXT NOT NULL, expires_at INTEGER NOT NULL)",
+        # Reminder ids whose jobs an API worker changed, drained by the lease holder
+        "CREATE TABLE IF NOT EXISTS schedule_queue (id INTEGER PRIMARY KEY AUTOINCREMENT, reminder_id INTEGER NOT NULL)",
+    ],
+    [
+        # Retention (SchedulerManager._apply_retention) moves old read notifications
+        # and finished reminders here. No secondary indexes: nothing reads them hot.
+        '''CREATE TABLE IF NOT EXISTS reminders_archive (
+            id INTEGER PRIMARY KEY,
+            task TEXT NOT NULL,
+            description TEXT,
+            run_time EPOCH NOT NULL,
+            repeat_type TEXT,
+            repeat_payload TEXT,
+            is_recurring BOOLEAN,
+            priority INTEGER,
+            status TEXT,
+            snooze_until EPOCH,
+            completion_time EPOCH,
+            created_at DATETIME,
+            updated_at DATETIME,
+            user_id INTEGER NOT NULL,
+            archived_at INTEGER NOT NULL
+        )''',
+        '''CREATE TABLE IF NOT EXISTS notifications_archive (
+            id INTEGER PRIMARY KEY,
+            message TEXT NOT NULL,
+            is_read BOOLEAN,
+            created_at DATETIME,
+            user_id INTEGER NOT NULL,
+            archived_at INTEGER NOT NULL
+        )''',
+        # archive_reminders: only finished rows, oldest change first
+        "CREATE INDEX IF NOT EXISTS idx_reminders_finished ON reminders(updated_at) WHERE status IN ('done', 'cancelled')",
+    ],
+]
+
+# Columns moved by retention, in the order both the hot and archive tables name them
+REMINDER_COLUMNS = (
+    "id, task, description, run_time, repeat_type, repeat_payload, is_recurring, priority, "
+    "status, snooze_until, completion_time, created_at, updated_at, user_id"
+)
+NOTIFICATION_COLUMNS = "id, message, is_read, created_at, user_id"
+
+def _owner_filter(user_id):
+    """SQL suffix and parameters restricting a by-id statement to one user's rows; None = any user."""
+    if user_id is None:
+        return "", ()
+    return " AND user_id = ?", (user_id,)
 
 class Database:
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path)
+        # User names never change id, so lookups are cached for the process
+        self._user_ids = {}
         self._init_db()
 
     def _get_conn(self):
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        """Return this thread's pooled connection. Callers must not close it."""
+        return self.pool.connection()
+
+    def close(self):
+        self.pool.close_all()
 
     def _init_db(self):
         """Initialize the database with the required schema."""
@@ -61,18 +311,32 @@ class Database:
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+
+        self._apply_migrations(cursor)
         
         conn.commit()
-        conn.close()
         logger.info(f"Database initialized at {self.db_path}")
 
+    def _apply_migrations(self, cursor):
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        for target, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            logger.info(f"⚡ Applying schema migration {target}...")
+            for sql in statements:
+                # Data migrations are callables that get the cursor
+                if callable(sql):
+                    sql(cursor)
+                else:
+                    cursor.execute(sql)
+            # PRAGMA does not accept bound parameters
+            cursor.execute(f"PRAGMA user_version = {target}")
+
     def _create_reminders_table(self, cursor):
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS reminders (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 task TEXT NOT NULL,
                 description TEXT,
-                run_time DATETIME NOT NULL,
+                run_time DATETIME NOT NULL, -- this and the other times become EPOCH in migration 7
                 repeat_type TEXT DEFAULT 'once', -- 'once', 'daily', 'weekly', 'custom'
                 repeat_payload TEXT, -- JSON for custom repeats
                 is_recurring BOOLEAN DEFAULT 0,
@@ -85,67 +349,186 @@ class Database:
             )
         ''')
 
-    def add_notification(self, message):
+    # --- Users ---
+
+    def get_user_id(self, name):
+        """Id of the named user, created on first use."""
+        user_id = self._user_ids.get(name)
+        if user_id is None:
+            conn = self._get_conn()
+            with conn:
+                conn.execute("INSERT OR IGNORE INTO users (name) VALUES (?)", (name,))
+            user_id = conn.execute("SELECT id FROM users WHERE name = ?", (name,)).fetchone()[0]
+            self._user_ids[name] = user_id
+        return user_id
+
+    def find_user_id(self, name):
+        """Id of the named user, or None if there is no such user yet."""
+        user_id = self._user_ids.get(name)
+        if user_id is None:
+            row = self._get_conn().execute("SELECT id FROM users WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            user_id = self._user_ids[name] = row[0]
+        return user_id
+
+    # --- Notifications ---
+
+    def add_notification(self, message, user_id=DEFAULT_USER_ID):
         conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO notifications (message) VALUES (?)", (message,))
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor = conn.execute("INSERT INTO notifications (user_id, message) VALUES (?, ?)", (user_id, message))
         logger.info(f"Notification added: {message}")
+        return cursor.lastrowid
 
-    def get_unread_notifications(self):
+    def record_fired(self, fired):
+        """Store notifications for fired reminders in one transaction.
+
+        fired is a list of (reminder_id, message, mark_done). Each notification
+        goes to the reminder's owner. Returns (notification_id, user_id) pairs
+        in the same order.
+        """
         conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, message FROM notifications WHERE is_read = 0 ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-        
-        notifications = [{'id': r[0], 'message': r[1]} for r in rows]
-        conn.close()
-        return notifications
+        stored = []
+        with conn:
+            for reminder_id, message, mark_done in fired:
+                user_id = conn.execute("SELECT user_id FROM reminders WHERE id = ?", (reminder_id,)).fetchone()
+                user_id = user_id[0] if user_id else DEFAULT_USER_ID
+                cursor = conn.execute("INSERT INTO notifications (user_id, message) VALUES (?, ?)", (user_id, message))
+                stored.append((cursor.lastrowid, user_id))
+            conn.executemany(
+                "UPDATE reminders SET status = 'done', updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                [(reminder_id,) for reminder_id, _, mark_done in fired if mark_done]
+            )
+        return stored
 
-    def mark_notification_read(self, notification_id):
+    def get_unread_notifications(self, user_id, since_id=0, limit=None):
+        """A user's unread notifications with id > since_id, oldest first.
+
+        Pass the last id of one page as since_id to fetch the next.
+        """
         conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE notifications SET is_read = 1 WHERE id = ?", (notification_id,))
-        conn.commit()
-        conn.close()
+        # LIMIT -1 means no limit in SQLite
+        rows = conn.execute(
+            "SELECT id, message FROM notifications WHERE user_id = ? AND is_read = 0 AND id > ? ORDER BY id ASC LIMIT ?",
+            (user_id, since_id, -1 if limit is None else limit)
+        ).fetchall()
+        return [{'id': r[0], 'message': r[1]} for r in rows]
 
-    def mark_all_notifications_read(self):
+    def get_notifications_after(self, user_id, last_id, limit=100):
+        """A user's notifications newer than last_id, read or not, oldest first. For stream resume."""
         conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE notifications SET is_read = 1 WHERE is_read = 0")
-        conn.commit()
-        conn.close()
+        rows = conn.execute(
+            "SELECT id, message FROM notifications WHERE user_id = ? AND id > ? ORDER BY id ASC LIMIT ?",
+            (user_id, last_id, limit)
+        ).fetchall()
+        return [{'id': r[0], 'message': r[1]} for r in rows]
+
+    def mark_notification_read(self, user_id, notification_id):
+        conn = self._get_conn()
+        with conn:
+            conn.execute("UPDATE notifications SET is_read = 1 WHERE id = ? AND user_id = ?", (notification_id, user_id))
+
+    def mark_notifications_read(self, user_id, ids=(), from_id=None, to_id=None):
+        """Mark a list of ids and/or an inclusive id range of a user's notifications read, in one transaction.
+
+        Returns the number of notifications that changed from unread to read.
+        """
+        conn = self._get_conn()
+        changed = 0
+        with conn:
+            if ids:
+                cursor = conn.executemany(
+                    "UPDATE notifications SET is_read = 1 WHERE id = ? AND user_id = ? AND is_read = 0",
+                    [(i, user_id) for i in ids]
+                )
+                changed += cursor.rowcount
+            if from_id is not None or to_id is not None:
+                cursor = conn.execute(
+                    "UPDATE notifications SET is_read = 1 WHERE user_id = ? AND id BETWEEN ? AND ? AND is_read = 0",
+                    (user_id, from_id or 0, to_id if to_id is not None else 2**63 - 1)
+                )
+                changed += cursor.rowcount
+        return changed
+
+    def mark_all_notifications_read(self, user_id):
+        conn = self._get_conn()
+        with conn:
+            conn.execute("UPDATE notifications SET is_read = 1 WHERE user_id = ? AND is_read = 0", (user_id,))
+
+    def get_last_notification_id(self):
+        row = self._get_conn().execute("SELECT MAX(id) FROM notifications").fetchone()
+        return row[0] or 0
+
+    def get_new_notifications(self, after_id, limit=500):
+        """Every user's notifications with id > after_id, oldest first, as (id, user_id, message).
+
+        For relaying notifications written by another process; a primary key
+        range, so its cost is the number of new rows.
+        """
+        conn = self._get_conn()
+        return conn.execute(
+            "SELECT id, user_id, message FROM notifications WHERE id > ? ORDER BY id ASC LIMIT ?", (after_id, limit)
+        ).fetchall()
 
     # --- Task / Reminder Methods ---
 
-    def add_reminder(self, task, run_time, repeat_type='once', description=None, priority=1):
+    def add_reminder(self, task, run_time, repeat_type='once', description=None, priority=1, repeat_payload=None,
+                     user_id=DEFAULT_USER_ID):
         conn = self._get_conn()
-        cursor = conn.cursor()
-        # Handle datetime objects
-        run_time_str = run_time if isinstance(run_time, str) else run_time.strftime('%Y-%m-%d %H:%M:%S')
         is_recurring = repeat_type != 'once'
         
-        cursor.execute('''
-            INSERT INTO reminders (task, run_time, repeat_type, status, description, is_recurring, priority)
-            VALUES (?, ?, ?, 'active', ?, ?, ?)
-        ''', (task, run_time_str, repeat_type, description, is_recurring, priority))
-        
-        reminder_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return reminder_id
+        with conn:
+            cursor = conn.execute('''
+                INSERT INTO reminders (user_id, task, run_time, repeat_type, repeat_payload, status, description, is_recurring, priority)
+                VALUES (?, ?, ?, ?, ?, 'active', ?, ?, ?)
+            ''', (user_id, task, to_epoch(run_time), repeat_type, repeat_payload, description, is_recurring, priority))
+        return cursor.lastrowid
+
+    def add_reminders(self, reminders, user_id=DEFAULT_USER_ID):
+        """Insert many reminders for one user in a single transaction. Returns their ids in input order.
+
+        Each item is a dict with task and run_time, plus optional repeat_type,
+        repeat_payload, description and priority, as for add_reminder.
+        """
+        rows = []
+        for r in reminders:
+            run_time = r['run_time']
+            repeat_type = r.get('repeat_type') or 'once'
+            rows.append((
+                user_id,
+                r['task'],
+                to_epoch(run_time),
+                repeat_type,
+                r.get('repeat_payload'),
+                r.get('description'),
+                repeat_type != 'once',
+                r.get('priority') or 1,
+            ))
+        if not rows:
+            return []
 
-    def update_reminder(self, reminder_id, data: dict):
-        """Generic update method for tasks."""
         conn = self._get_conn()
-        cursor = conn.cursor()
-        
+        with conn:
+            # Take the write lock up front so the new ids are exactly those after last_id
+            conn.execute("BEGIN IMMEDIATE")
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM reminders").fetchone()[0]
+            conn.executemany('''
+                INSERT INTO reminders (user_id, task, run_time, repeat_type, repeat_payload, status, description, is_recurring, priority)
+                VALUES (?, ?, ?, ?, ?, 'active', ?, ?, ?)
+            ''', rows)
+            ids = [r[0] for r in conn.execute("SELECT id FROM reminders WHERE id > ? ORDER BY id", (last_id,))]
+        return ids
+
+    def update_reminder(self, reminder_id, data: dict, user_id=None):
+        """Generic update method for tasks. False if no such reminder (of user_id, when given)."""
         fields = []
         values = []
-        for key, value in data.items():
+        # Sorted so the same set of fields always yields the same SQL text
+        # and hits the connection's statement cache.
+        for key in sorted(data):
             fields.append(f"{key} = ?")
-            values.append(value)
+            values.append(to_epoch(data[key]) if key in EPOCH_COLUMNS else data[key])
         
         # Always update 'updated_at'
         fields.append("updated_at = CURRENT_TIMESTAMP")
@@ -153,101 +536,406 @@ class Database:
         if not fields:
             return False
 
+        owner, owner_params = _owner_filter(user_id)
         values.append(reminder_id)
-        sql = f"UPDATE reminders SET {', '.join(fields)} WHERE id = ?"
+        values.extend(owner_params)
+        sql = f"UPDATE reminders SET {', '.join(fields)} WHERE id = ?{owner}"
         
-        cursor.execute(sql, values)
-        conn.commit()
-        conn.close()
-        return True
+        conn = self._get_conn()
+        with conn:
+            cursor = conn.execute(sql, values)
+        return cursor.rowcount > 0
 
-    def get_active_reminders(self):
-        """Get all scheduled valid reminders."""
+    def get_reminder(self, reminder_id, user_id=None):
+        """Single reminder by primary key (owned by user_id, when given), or None."""
+        owner, owner_params = _owner_filter(user_id)
         conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM reminders WHERE status IN ('active', 'snoozed') ORDER BY run_time ASC")
-        rows = cursor.fetchall()
-        conn.close()
-        return [self._row_to_dict(r) for r in rows]
+        row = conn.execute(f"SELECT * FROM reminders WHERE id = ?{owner}", (reminder_id, *owner_params)).fetchone()
+        return Reminder(*row) if row else None
+
+    def get_reminders(self, reminder_ids):
+        """Reminders for the given ids in one query, keyed by id. Missing ids are omitted."""
+        ids = list(dict.fromkeys(reminder_ids))
+        found = {}
+        conn = self._get_conn()
+        # Stay well under SQLite's bound-parameter limit on old builds
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            rows = conn.execute(f"SELECT * FROM reminders WHERE id IN ({placeholders})", chunk).fetchall()
+            for r in rows:
+                found[r[0]] = Reminder(*r)
+        return found
 
-    def get_reminders_by_date_range(self, start_date_str, end_date_str):
+    def get_active_reminders(self, user_id=None):
+        """Get all scheduled valid reminders, of one user or all."""
+        conn = self._get_conn()
+        if user_id is None:
+            rows = conn.execute("SELECT * FROM reminders WHERE status IN ('active', 'snoozed') ORDER BY run_time ASC").fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT * FROM reminders WHERE user_id = ? AND status IN ('active', 'snoozed') ORDER BY run_time ASC, id ASC",
+                (user_id,)
+            ).fetchall()
+        return [Reminder(*r) for r in rows]
+
+    def get_recurring_reminders(self, user_id=None):
+        """Active/snoozed reminders with a repeat rule, of one user or (for the scheduler) all."""
+        conn = self._get_conn()
+        if user_id is None:
+            rows = conn.execute("SELECT * FROM reminders WHERE repeat_type != 'once' AND status IN ('active', 'snoozed')").fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT * FROM reminders WHERE user_id = ? AND repeat_type != 'once' AND status IN ('active', 'snoozed')",
+                (user_id,)
+            ).fetchall()
+        return [Reminder(*r) for r in rows]
+
+    def get_one_off_reminders_due(self, start, end):
+        """One-off reminders that fire in [start, end): active by run_time, snoozed by snooze_until."""
+        conn = self._get_conn()
+        rows = conn.execute('''
+            SELECT * FROM reminders
+            WHERE status = 'active' AND run_time >= ? AND run_time < ? AND repeat_type = 'once'
+            ORDER BY run_time ASC
+        ''', (to_epoch(start), to_epoch(end))).fetchall()
+        rows += conn.execute('''
+            SELECT * FROM reminders
+            WHERE status = 'snoozed' AND snooze_until >= ? AND snooze_until < ? AND repeat_type = 'once'
+        ''', (to_epoch(start), to_epoch(end))).fetchall()
+        return [Reminder(*r) for r in rows]
+
+    def get_missed_one_off_reminders(self, now):
+        """One-off reminders whose time has passed without firing."""
+        conn = self._get_conn()
+        rows = conn.execute('''
+            SELECT * FROM reminders
+            WHERE status = 'active' AND run_time < ? AND repeat_type = 'once'
+            ORDER BY run_time ASC
+        ''', (to_epoch(now),)).fetchall()
+        rows += conn.execute('''
+            SELECT * FROM reminders
+            WHERE status = 'snoozed' AND COALESCE(snooze_until, run_time) < ? AND repeat_type = 'once'
+        ''', (to_epoch(now),)).fetchall()
+        return [Reminder(*r) for r in rows]
+
+    def get_reminders_updated_since(self, timestamp):
+        """Rows changed at or after a CURRENT_TIMESTAMP-format (UTC) watermark."""
+        conn = self._get_conn()
+        rows = conn.execute("SELECT * FROM reminders WHERE updated_at >= ?", (timestamp,)).fetchall()
+        return [Reminder(*r) for r in rows]
+
+    def expire_missed_reminders(self, now):
+        """Mark one-off reminders whose time passed while nothing was running as done."""
+        conn = self._get_conn()
+        with conn:
+            cursor = conn.execute('''
+                UPDATE reminders SET status = 'done', updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'active' AND run_time < ? AND repeat_type = 'once'
+            ''', (to_epoch(now),))
+            count = cursor.rowcount
+            cursor = conn.execute('''
+                UPDATE reminders SET status = 'done', updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'snoozed' AND COALESCE(snooze_until, run_time) < ? AND repeat_type = 'once'
+            ''', (to_epoch(now),))
+        return count + cursor.rowcount
+
+    def get_reminders_by_date_range(self, user_id, start_date, end_date):
         """For Calendar View."""
         conn = self._get_conn()
-        cursor = conn.cursor()
-        # run_time is stored as YYYY-MM-DD HH:MM:SS
-        cursor.execute('''
+        rows = conn.execute('''
             SELECT * FROM reminders 
-            WHERE run_time >= ? AND run_time <= ? AND status != 'cancelled'
+            WHERE user_id = ? AND run_time >= ? AND run_time <= ? AND status != 'cancelled'
             ORDER BY run_time ASC
-        ''', (start_date_str, end_date_str))
-        rows = cursor.fetchall()
-        conn.close()
-        return [self._row_to_dict(r) for r in rows]
+        ''', (user_id, to_epoch(start_date), to_epoch(end_date))).fetchall()
+        return [Reminder(*r) for r in rows]
 
     def get_overdue_reminders(self):
         """For 'Past' section in Timeline."""
         conn = self._get_conn()
-        cursor = conn.cursor()
-        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute('''
+        rows = conn.execute('''
             SELECT * FROM reminders 
             WHERE run_time < ? AND status = 'active'
             ORDER BY run_time DESC
-        ''', (now,))
-        rows = cursor.fetchall()
-        conn.close()
-        return [self._row_to_dict(r) for r in rows]
+        ''', (int(time.time()),)).fetchall()
+        return [Reminder(*r) for r in rows]
+
+    def get_timeline(self, user_id, now, today_end, limit, groups=TIMELINE_GROUPS, cursors=None):
+        """One page per timeline bucket of a user's reminders, in a single statement.
+
+        past is active rows before now, newest first; today and upcoming are
+        active or snoozed rows from now to today_end and after, soonest first.
+        Each bucket is a keyset page of at most limit rows after its cursor,
+        an (epoch run_time, id) pair from the previous page's last row.
+
+        Returns {group: (rows, has_more)}. The API serves the timeline from
+        reminder_cache; this and count_timeline are the SQL it must agree with
+        (tests/test_reminder_cache.py).
+        """
+        cursors = cursors or {}
+        now, today_end = to_epoch(now), to_epoch(today_end)
+        parts = []
+        params = []
+        for group in groups:
+            if group == 'past':
+                where, order, ranges = "run_time < ?", "DESC", [(now,)]
+                statuses = ('active',)
+            elif group == 'today':
+                where, order, ranges = "run_time >= ? AND run_time < ?", "ASC", [(now, today_end)]
+                statuses = ('active', 'snoozed')
+            else:
+                where, order, ranges = "run_time >= ?", "ASC", [(today_end,)]
+                statuses = ('active', 'snoozed')
+            cursor = cursors.get(group)
+            if cursor:
+                where += f" AND (run_time, id) {'<' if order == 'DESC' else '>'} (?, ?)"
+                ranges = [ranges[0] + tuple(cursor)]
+            # One subquery per status: equalities on user and status let each
+            # walk idx_reminders_user_status_run_time in order and stop after limit rows
+            for status in statuses:
+                parts.append(
+                    f"SELECT * FROM (SELECT ? AS grp, reminders.* FROM reminders WHERE user_id = ? AND status = ? AND {where} "
+                    f"ORDER BY run_time {order}, id {order} LIMIT ?)"
+                )
+                params.extend((group, user_id, status, *ranges[0], limit + 1))
+        if not parts:
+            return {}
+
+        rows = self._get_conn().execute(" UNION ALL ".join(parts), params).fetchall()
+        pages = {group: [] for group in groups}
+        for row in rows:
+            pages[row[0]].append(Reminder(*row[1:]))
+        result = {}
+        for group, items in pages.items():
+            # Merge the per-status pages back into one ordering
+            items.sort(key=lambda r: (r.run_time, r.id), reverse=(group == 'past'))
+            result[group] = (items[:limit], len(items) > limit)
+        return result
+
+    def count_timeline(self, user_id, now, today_end):
+        """Total rows per timeline bucket of a user's reminders, counted on the index."""
+        now, today_end = to_epoch(now), to_epoch(today_end)
+        row = self._get_conn().execute('''
+            SELECT
+                (SELECT COUNT(*) FROM reminders WHERE user_id = ? AND status = 'active' AND run_time < ?),
+                (SELECT COUNT(*) FROM reminders WHERE user_id = ? AND status IN ('active', 'snoozed') AND run_time >= ? AND run_time < ?),
+                (SELECT COUNT(*) FROM reminders WHERE user_id = ? AND status IN ('active', 'snoozed') AND run_time >= ?)
+        ''', (user_id, now, user_id, now, today_end, user_id, today_end)).fetchone()
+        return dict(zip(TIMELINE_GROUPS, row))
+
+    # Single-row writes take an optional user_id: when given, another user's
+    # row is left alone and the call returns False.
 
-    def update_reminder_time(self, reminder_id: int, run_time):
+    def update_reminder_time(self, reminder_id: int, run_time, user_id=None):
+        owner, owner_params = _owner_filter(user_id)
         conn = self._get_conn()
-        cursor = conn.cursor()
-        rt_str = run_time if isinstance(run_time, str) else run_time.strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute("UPDATE reminders SET run_time = ?, status = 'active', updated_at = CURRENT_TIMESTAMP WHERE id = ?", (rt_str, reminder_id))
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor = conn.execute(
+                f"UPDATE reminders SET run_time = ?, status = 'active', updated_at = CURRENT_TIMESTAMP WHERE id = ?{owner}",
+                (to_epoch(run_time), reminder_id, *owner_params)
+            )
+        return cursor.rowcount > 0
 
-    def update_status(self, reminder_id, status):
+    def update_status(self, reminder_id, status, user_id=None):
+        owner, owner_params = _owner_filter(user_id)
         conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE reminders SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (status, reminder_id))
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor = conn.execute(
+                f"UPDATE reminders SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?{owner}",
+                (status, reminder_id, *owner_params)
+            )
+        return cursor.rowcount > 0
 
-    def delete_reminder(self, reminder_id):
-        self.update_status(reminder_id, 'cancelled')
+    def delete_reminder(self, reminder_id, user_id=None):
+        return self.update_status(reminder_id, 'cancelled', user_id)
 
-    def complete_reminder(self, reminder_id):
+    def complete_reminder(self, reminder_id, user_id=None):
+        owner, owner_params = _owner_filter(user_id)
         conn = self._get_conn()
-        cursor = conn.cursor()
-        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute("UPDATE reminders SET status = 'done', completion_time = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (now, reminder_id))
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor = conn.execute(
+                f"UPDATE reminders SET status = 'done', completion_time = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?{owner}",
+                (int(time.time()), reminder_id, *owner_params)
+            )
+        return cursor.rowcount > 0
 
-    def snooze_reminder(self, reminder_id, snooze_until):
+    def snooze_reminder(self, reminder_id, snooze_until, user_id=None):
+        owner, owner_params = _owner_filter(user_id)
         conn = self._get_conn()
-        cursor = conn.cursor()
-        s_str = snooze_until if isinstance(snooze_until, str) else snooze_until.strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute("UPDATE reminders SET status = 'snoozed', snooze_until = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (s_str, reminder_id))
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor = conn.execute(
+                f"UPDATE reminders SET status = 'snoozed', snooze_until = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?{owner}",
+                (to_epoch(snooze_until), reminder_id, *owner_params)
+            )
+        return cursor.rowcount > 0
+
+    # --- Scheduler state ---
+
+    def get_state(self, key):
+        row = self._get_conn().execute("SELECT value FROM scheduler_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key, value):
+        conn = self._get_conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO scheduler_state (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
 
-    def _row_to_dict(self, row):
+    def delete_state(self, key):
+        conn = self._get_conn()
+        with conn:
+            conn.execute("DELETE FROM scheduler_state WHERE key = ?", (key,))
+
+    def stamp_state(self, key, offset_seconds=0):
+        """Store SQLite's CURRENT_TIMESTAMP (shifted by offset_seconds) under key."""
+        conn = self._get_conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO scheduler_state (key, value) VALUES (?, datetime('now', ?)) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, f"{offset_seconds:+d} seconds")
+            )
+
+    # --- Scheduler service ---
+
+    def acquire_lease(self, name, holder, ttl_seconds):
+        """Take or renew a named lease for ttl_seconds. True if holder now has it.
+
+        A lease is free once its holder stops renewing it and it expires.
+        """
+        now = int(time.time())
+        conn = self._get_conn()
+        with conn:
+            cursor = conn.execute('''
+                INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+                WHERE leases.holder = excluded.holder OR leases.expires_at < ?
+            ''', (name, holder, now + ttl_seconds, now))
+        return cursor.rowcount > 0
+
+    def release_lease(self, name, holder):
+        conn = self._get_conn()
+        with conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+
+    def enqueue_schedule_changes(self, reminder_ids):
+        conn = self._get_conn()
+        with conn:
+            conn.executemany("INSERT INTO schedule_queue (reminder_id) VALUES (?)", [(i,) for i in reminder_ids])
+
+    def get_schedule_changes(self, limit=500):
+        """Oldest queued changes as (last queue id, distinct reminder ids). Pass the id to ack_schedule_changes."""
+        rows = self._get_conn().execute(
+            "SELECT id, reminder_id FROM schedule_queue ORDER BY id LIMIT ?", (limit,)
+        ).fetchall()
+        if not rows:
+            return None, []
+        return rows[-1][0], list(dict.fromkeys(r[1] for r in rows))
+
+    def ack_schedule_changes(self, last_id):
+        conn = self._get_conn()
+        with conn:
+            conn.execute("DELETE FROM schedule_queue WHERE id <= ?", (last_id,))
+
+    # --- Retention ---
+
+    def notification_archive_bound(self, days):
+        """Id of the first notification created in the last `days` days (or one past the newest).
+
+        Ids grow with created_at, so everything below it is old enough to
+        archive. Walks the table from its oldest row and stops at the first
+        recent one, so the cost is the backlog, not the table.
+        """
+        conn = self._get_conn()
+        row = conn.execute(
+            "SELECT id FROM notifications WHERE created_at >= datetime('now', ?) ORDER BY id LIMIT 1", (f"-{days} days",)
+        ).fetchone()
+        if row:
+            return row[0]
+        return (conn.execute("SELECT MAX(id) FROM notifications").fetchone()[0] or 0) + 1
+
+    def archive_notifications(self, after_id, below_id, limit=500):
+        """Move the next `limit` read notifications with after_id < id < below_id to notifications_archive.
+
+        Returns (last id moved, to pass back as after_id, rows moved); the id
+        is None once there are none left.
+        """
+        conn = self._get_conn()
+        with conn:
+            last = conn.execute(
+                "SELECT MAX(id) FROM (SELECT id FROM notifications WHERE id > ? AND id < ? AND is_read = 1 ORDER BY id LIMIT ?)",
+                (after_id, below_id, limit)
+            ).fetchone()[0]
+            if last is None:
+                return None, 0
+            conn.execute(f'''
+                INSERT OR REPLACE INTO notifications_archive ({NOTIFICATION_COLUMNS}, archived_at)
+                SELECT {NOTIFICATION_COLUMNS}, CAST(strftime('%s', 'now') AS INTEGER) FROM notifications WHERE id > ? AND id <= ? AND is_read = 1
+            ''', (after_id, last))
+            cursor = conn.execute("DELETE FROM notifications WHERE id > ? AND id <= ? AND is_read = 1", (after_id, last))
+        return last, cursor.rowcount
+
+    def archive_reminders(self, days, limit=500):
+        """Move up to `limit` done/cancelled reminders unchanged for `days` days to reminders_archive.
+
+        Oldest first; returns how many moved. Deleting them bumps their
+        owners' data versions, so cached views reload without them.
+        """
+        conn = self._get_conn()
+        with conn:
+            # Without statistics the planner prefers idx_reminders_status_run_time,
+            # which visits every finished row and sorts them
+            ids = [r[0] for r in conn.execute(
+                "SELECT id FROM reminders INDEXED BY idx_reminders_finished "
+                "WHERE status IN ('done', 'cancelled') AND updated_at < datetime('now', ?) "
+                "ORDER BY updated_at LIMIT ?",
+                (f"-{days} days", limit)
+            )]
+            if not ids:
+                return 0
+            marks = ",".join("?" * len(ids))
+            conn.execute(f'''
+                INSERT OR REPLACE INTO reminders_archive ({REMINDER_COLUMNS}, archived_at)
+                SELECT {REMINDER_COLUMNS}, CAST(strftime('%s', 'now') AS INTEGER)
+                FROM reminders WHERE id IN ({marks}) AND +status IN ('done', 'cancelled')
+            ''', ids)
+            # Re-checked, since a reminder rescheduled after the SELECT is active again.
+            # The unary + keeps the planner on the id lookups: as an index term,
+            # status would send it through every finished row instead.
+            cursor = conn.execute(f"DELETE FROM reminders WHERE id IN ({marks}) AND +status IN ('done', 'cancelled')", ids)
+        return cursor.rowcount
+
+    def storage_stats(self):
+        """Page size, pages in the file, pages on the free list and the auto_vacuum mode (2 = incremental)."""
+        conn = self._get_conn()
         return {
-            'id': row[0],
-            'task': row[1],
-            'description': row[2],
-            'run_time': row[3], 
-            'repeat_type': row[4],
-            'repeat_payload': row[5],
-            'is_recurring': row[6],
-            'priority': row[7],
-            'status': row[8],
-            'snooze_until': row[9],
-            'completion_time': row[10],
-            'created_at': row[11],
-            'updated_at': row[12] if len(row) > 12 else None
+            name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ('page_size', 'page_count', 'freelist_count', 'auto_vacuum')
         }
 
+    def enable_incremental_vacuum(self):
+        """Convert a file created without auto_vacuum. A full VACUUM: rewrites the
+        whole file and holds the write lock until done. False if already incremental."""
+        conn = self._get_conn()
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+
+    def incremental_vacuum(self, pages):
+        """Return up to `pages` free pages to the filesystem by truncating the file."""
+        # executescript steps the pragma to completion; execute frees a single page
+        self._get_conn().executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+
+    # --- Change tracking ---
+
+    def get_data_version(self, user_id, name='reminders'):
+        """Counter that changes on every write to the user's rows of the table."""
+        row = self._get_conn().execute("SELECT version FROM data_versions WHERE name = ?", (f"{name}:{user_id}",)).fetchone()
+        return row[0] if row else 0
+
 # Global DB instance
 db = Database()
@@ -0,0 +1,79 @@
+import sqlite3
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new connection. WAL lets the scheduler thread write while
+# API threads keep reading, and NORMAL sync is safe under WAL.
+PRAGMAS = (
+    # Only takes effect on a new file, so it has to come before the switch to
+    # WAL writes the header; older files are converted by enable_incremental_vacuum
+    "PRAGMA auto_vacuum = INCREMENTAL",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",  # ~8 MB page cache per connection
+)
+
+class ConnectionPool:
+    """Thread-safe pool that keeps one reusable SQLite connection per thread.
+
+    FastAPI's threadpool and APScheduler's executor both reuse a bounded set of
+    worker threads, so each of them opens its connection once and keeps it
+    (together with its prepared-statement cache) for the life of the process.
+    """
+
+    def __init__(self, db_path, cached_statements=256):
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []  # (thread, connection) pairs
+        self.opened = 0
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            # Columns declared EPOCH come back as datetimes (database/times.py)
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+
+        with self._lock:
+            self._prune()
+            self._connections.append((threading.current_thread(), conn))
+            self.opened += 1
+        return conn
+
+    def _prune(self):
+        """Close connections whose owning thread has exited."""
+        alive = []
+        for thread, conn in self._connections:
+            if thread.is_alive():
+                alive.append((thread, conn))
+            else:
+                conn.close()
+        self._connections = alive
+
+    def close_all(self):
+        with self._lock:
+            for _, conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to close connection: {e}")
+            self._connections = []
+        # Force every thread (including this one) to reconnect on next use
+        self._local = threading.local()
@@ -0,0 +1,30 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Optional
+
+@dataclass(slots=True)
+class Reminder:
+    """One reminders row, fields in table column order.
+
+    Slots keep a row at a fraction of a per-row dict, and orjson serializes
+    slotted dataclasses natively, so list endpoints never build dicts.
+    """
+    id: int
+    task: str
+    description: Optional[str]
+    run_time: datetime
+    repeat_type: str
+    repeat_payload: Optional[str]
+    is_recurring: int
+    priority: int
+    status: str
+    snooze_until: Optional[datetime]
+    completion_time: Optional[datetime]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+    user_id: int
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in REMINDER_FIELDS}
+
+REMINDER_FIELDS = tuple(f.name for f in fields(Reminder))
@@ -0,0 +1,54 @@
+import sqlite3
+from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Reminder times (run_time, snooze_until, completion_time) are stored as
+# integer epoch seconds in columns declared EPOCH. The adapter below lets any
+# datetime be bound directly; the converter hands rows back as aware
+# datetimes in the app timezone, so nothing formats or parses strings.
+
+# The app's wall-clock zone (the scheduler runs in it). Without pytz the
+# scheduler falls back to the host zone and so does storage.
+try:
+    import pytz
+    KOLKATA = pytz.timezone('Asia/Kolkata')
+except ImportError:
+    KOLKATA = None
+
+# Same zone as zoneinfo, roughly ten times faster than pytz to convert with
+try:
+    _ZONE = ZoneInfo(KOLKATA.zone) if KOLKATA else None
+except ZoneInfoNotFoundError:
+    _ZONE = KOLKATA
+
+DB_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def to_epoch(value):
+    """Epoch seconds for a datetime, a 'YYYY-MM-DD HH:MM:SS' / ISO string or a number.
+
+    Naive values are wall-clock times in the app timezone.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        if _ZONE is None:
+            return int(value.timestamp())
+        value = KOLKATA.localize(value) if _ZONE is KOLKATA else value.replace(tzinfo=_ZONE)
+    return int(value.timestamp())
+
+def from_epoch(seconds):
+    """Aware datetime in the app timezone."""
+    if _ZONE is None:
+        return datetime.fromtimestamp(seconds).astimezone()
+    return datetime.fromtimestamp(seconds, _ZONE)
+
+def _convert_epoch(raw):
+    # Runs once per EPOCH value fetched, so it skips the from_epoch call
+    return datetime.fromtimestamp(int(raw), _ZONE) if _ZONE else from_epoch(int(raw))
+
+sqlite3.register_adapter(datetime, to_epoch)
+sqlite3.register_converter("EPOCH", _convert_epoch)
@@ -0,0 +1,163 @@
+import heapq
+import itertools
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from database.times import to_epoch
+
+logger = logging.getLogger(__name__)
+
+# Recent fire lags (seconds from a reminder's due time to firing) kept for reporting
+LAG_SAMPLES = 10_000
+# Rebuild the heap once cancelled/replaced entries outnumber the live ones by this much
+COMPACT_SLACK = 1024
+
+class _Timer:
+    __slots__ = ('reminder_id', 'task', 'repeat_type', 'priority', 'due', 'at', 'trigger')
+
+    def __init__(self, reminder_id, task, repeat_type, priority, due, trigger):
+        self.reminder_id = reminder_id
+        self.task = task
+        self.repeat_type = repeat_type
+        self.priority = priority
+        self.due = due
+        self.at = to_epoch(due)
+        self.trigger = trigger
+
+class ReminderDispatcher:
+    """Fires reminders from one in-memory heap instead of one APScheduler job each.
+
+    Heap entries are ordered by (epoch second due, -priority), so the thread
+    sleeps until the earliest is due, pops everything due by then as one
+    batch and hands it to fire() highest priority first. Rescheduling or
+    cancelling only swaps the reminder's entry in a dict; the stale heap
+    entry is skipped when it surfaces. Recurring reminders carry their
+    trigger and go back on the heap at the next occurrence after firing.
+    """
+
+    def __init__(self, fire):
+        self.fire = fire
+        self._heap = []
+        self._timers = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self.fired = 0
+        self.batches = 0
+        self.lags = deque(maxlen=LAG_SAMPLES)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self):
+        return len(self._timers)
+
+    def start(self):
+        if not self.running:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="reminder-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the thread; pending timers stay until the next start."""
+        if self.running:
+            with self._cond:
+                self._stopping = True
+                self._cond.notify()
+            self._thread.join()
+        self._thread = None
+
+    def add(self, reminder_id, task, repeat_type, priority, due, trigger=None):
+        """Fire reminder_id at due (an aware datetime), replacing any pending timer for it.
+
+        trigger, for recurring reminders, gives the occurrence after each firing.
+        """
+        timer = _Timer(reminder_id, task, repeat_type, priority or 1, due, trigger)
+        with self._cond:
+            self._push(timer)
+            # Only an earlier wake-up than the one the thread is waiting for matters
+            if self._heap[0][3] is timer:
+                self._cond.notify()
+
+    def cancel(self, reminder_id):
+        with self._cond:
+            self._timers.pop(reminder_id, None)
+
+    def clear(self):
+        with self._cond:
+            self._timers.clear()
+            self._heap.clear()
+
+    def _push(self, timer):
+        self._timers[timer.reminder_id] = timer
+        heapq.heappush(self._heap, (timer.at, -timer.priority, next(self._seq), timer))
+        if len(self._heap) > 2 * len(self._timers) + COMPACT_SLACK:
+            self._heap = [e for e in self._heap if self._timers.get(e[3].reminder_id) is e[3]]
+            heapq.heapify(self._heap)
+
+    def _pop_due(self, now):
+        batch = []
+        while self._heap and self._heap[0][0] <= now:
+            timer = heapq.heappop(self._heap)[3]
+            if self._timers.get(timer.reminder_id) is not timer:
+                continue
+            # Recurring timers stay registered until _rearm, so a cancel
+            # during delivery is still seen
+            if timer.trigger is None:
+                del self._timers[timer.reminder_id]
+            batch.append(timer)
+        # Sorted is stable: within a priority, earlier due still goes first
+        batch.sort(key=lambda t: -t.priority)
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopping and not (self._heap and self._heap[0][0] <= time.time()):
+                    self._cond.wait(self._heap[0][0] - time.time() if self._heap else None)
+                if self._stopping:
+                    return
+                batch = self._pop_due(time.time())
+            if batch:
+                self._deliver(batch)
+
+    def _deliver(self, batch):
+        fired_at = time.time()
+        self.lags.extend(fired_at - timer.at for timer in batch)
+        try:
+            self.fire(batch)
+        except Exception as e:
+            logger.error(f"❌ Dispatching {len(batch)} reminders failed: {e}")
+        self.fired += len(batch)
+        self.batches += 1
+        recurring = [timer for timer in batch if timer.trigger is not None]
+        if recurring:
+            self._rearm(recurring, datetime.fromtimestamp(fired_at, timezone.utc))
+
+    def _rearm(self, timers, now):
+        nexts = []
+        for timer in timers:
+            try:
+                # Occurrences that passed meanwhile are coalesced, as APScheduler does
+                due = timer.trigger.get_next_fire_time(timer.due, now)
+                while due is not None and due <= now:
+                    due = timer.trigger.get_next_fire_time(due, now)
+            except Exception as e:
+                logger.error(f"Failed to compute next occurrence of {timer.reminder_id}: {e}")
+                due = None
+            nexts.append((timer, due))
+        with self._cond:
+            for timer, due in nexts:
+                # Cancelled or rescheduled while it was firing: leave it be
+                if self._timers.get(timer.reminder_id) is not timer:
+                    continue
+                if due is None:
+                    del self._timers[timer.reminder_id]
+                else:
+                    self._push(_Timer(timer.reminder_id, timer.task, timer.repeat_type, timer.priority, due, timer.trigger))
+            self._cond.notify()
@@ -0,0 +1,117 @@
+import csv
+import io
+import re
+import logging
+from datetime import datetime
+from recurrence import from_rrule
+
+logger = logging.getLogger(__name__)
+
+# Each parser returns one dict per record: TaskCreate fields, or {'error': ...}
+# so a bad record is reported at its position without aborting the import.
+
+CSV_COLUMNS = ('task', 'run_time', 'description', 'repeat_type', 'priority')
+
+ICS_DATETIME_RE = re.compile(r'^(\d{8})(?:T(\d{6})(Z?))?$')
+
+def parse_csv(text: str):
+    """Rows of a CSV with a header; task and run_time columns are required."""
+    reader = csv.DictReader(io.StringIO(text))
+    header = [h.strip().lower() for h in (reader.fieldnames or [])]
+    missing = [c for c in ('task', 'run_time') if c not in header]
+    if missing:
+        return [{'error': f"CSV is missing column(s): {', '.join(missing)}"}]
+    reader.fieldnames = header
+
+    records = []
+    for row in reader:
+        record = {k: (row.get(k) or '').strip() for k in CSV_COLUMNS}
+        record = {k: v for k, v in record.items() if v}
+        if 'priority' in record:
+            try:
+                record['priority'] = int(record['priority'])
+            except ValueError:
+                records.append({'error': f"Invalid priority '{record['priority']}'"})
+                continue
+        records.append(record)
+    return records
+
+def parse_ics(text: str, tz=None):
+    """VEVENTs of an iCalendar file. Floating times are interpreted in tz (or server local)."""
+    records = []
+    event = None
+    for name, params, value in _ics_lines(text):
+        if name == 'BEGIN' and value.upper() == 'VEVENT':
+            event = {}
+        elif name == 'END' and value.upper() == 'VEVENT':
+            if event is not None:
+                records.append(_ics_event_to_record(event, tz))
+            event = None
+        elif event is not None:
+            event[name] = (params, value)
+    return records
+
+def _ics_lines(text):
+    # Unfold continuation lines (RFC 5545 3.1), then split NAME;PARAMS:VALUE
+    unfolded = re.sub(r'\r?\n[ \t]', '', text)
+    for line in unfolded.splitlines():
+        if ':' not in line:
+            continue
+        head, value = line.split(':', 1)
+        name, *params = head.split(';')
+        yield name.upper(), dict(p.split('=', 1) for p in params if '=' in p), value.strip()
+
+def _ics_unescape(value):
+    return value.replace('\\n', '\n').replace('\\N', '\n').replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\')
+
+def _ics_event_to_record(event, tz):
+    summary = _ics_unescape(event.get('SUMMARY', ({}, ''))[1]).strip()
+    if not summary:
+        return {'error': "Event has no SUMMARY"}
+    if 'DTSTART' not in event:
+        return {'error': f"Event '{summary}' has no DTSTART"}
+
+    params, value = event['DTSTART']
+    m = ICS_DATETIME_RE.match(value)
+    if not m:
+        return {'error': f"Event '{summary}' has an unreadable DTSTART '{value}'"}
+    day, clock, utc = m.groups()
+    # All-day events become reminders at 09:00
+    dt = datetime.strptime(day + (clock or '090000'), '%Y%m%d%H%M%S')
+
+    if utc:
+        run_time = dt.isoformat() + 'Z'
+    else:
+        zone = _ics_zone(params.get('TZID')) or tz
+        if zone is not None:
+            dt = zone.localize(dt) if hasattr(zone, 'localize') else dt.replace(tzinfo=zone)
+        run_time = dt.isoformat()
+
+    record = {'task': summary, 'run_time': run_time}
+    if 'DESCRIPTION' in event:
+        record['description'] = _ics_unescape(event['DESCRIPTION'][1])
+    if 'RRULE' in event:
+        try:
+            rule = from_rrule(event['RRULE'][1], dt.replace(tzinfo=None))
+        except ValueError as e:
+            return {'error': f"Event '{summary}': {e}"}
+        payload = rule.to_payload()
+        # The API anchors the series at run_time
+        del payload['start'], payload['freq']
+        record['repeat_type'] = rule.freq
+        if payload:
+            record['repeat_payload'] = payload
+    if event.get('PRIORITY', ({}, ''))[1] in ('1', '2', '3', '4'):
+        # iCalendar 1-4 is "high"
+        record['priority'] = 2
+    return record
+
+def _ics_zone(tzid):
+    if not tzid:
+        return None
+    try:
+        import pytz
+        return pytz.timezone(tzid)
+    except Exception:
+        logger.warning(f"Unknown TZID '{tzid}', using default timezone")
+        return None
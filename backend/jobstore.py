@@ -0,0 +1,107 @@
+import pickle
+import sqlite3
+import logging
+
+from apscheduler.job import Job
+from apscheduler.jobstores.base import BaseJobStore, ConflictingIdError, JobLookupError
+from apscheduler.util import datetime_to_utc_timestamp, utc_timestamp_to_datetime
+
+logger = logging.getLogger(__name__)
+
+class SQLiteJobStore(BaseJobStore):
+    """APScheduler job store in the app's own SQLite file.
+
+    Same layout as APScheduler's SQLAlchemyJobStore (id, next_run_time as a
+    UTC timestamp, pickled job state) but on the pooled sqlite3 connections,
+    so no extra dependency. The table is created by the database migrations.
+    """
+
+    def __init__(self, database, pickle_protocol=pickle.HIGHEST_PROTOCOL):
+        super().__init__()
+        self.db = database
+        self.pickle_protocol = pickle_protocol
+
+    def lookup_job(self, job_id):
+        row = self.db._get_conn().execute("SELECT job_state FROM apscheduler_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._reconstitute_job(row[0]) if row else None
+
+    def get_due_jobs(self, now):
+        return self._get_jobs("WHERE next_run_time <= ?", (datetime_to_utc_timestamp(now),))
+
+    def get_next_run_time(self):
+        row = self.db._get_conn().execute(
+            "SELECT next_run_time FROM apscheduler_jobs WHERE next_run_time IS NOT NULL ORDER BY next_run_time LIMIT 1"
+        ).fetchone()
+        return utc_timestamp_to_datetime(row[0]) if row else None
+
+    def get_all_jobs(self):
+        jobs = self._get_jobs()
+        self._fix_paused_jobs_sorting(jobs)
+        return jobs
+
+    def count_jobs(self):
+        return self.db._get_conn().execute("SELECT COUNT(*) FROM apscheduler_jobs").fetchone()[0]
+
+    def add_job(self, job):
+        conn = self.db._get_conn()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO apscheduler_jobs (id, next_run_time, job_state) VALUES (?, ?, ?)",
+                    (job.id, datetime_to_utc_timestamp(job.next_run_time), self._dump(job))
+                )
+        except sqlite3.IntegrityError:
+            raise ConflictingIdError(job.id)
+
+    def update_job(self, job):
+        conn = self.db._get_conn()
+        with conn:
+            cursor = conn.execute(
+                "UPDATE apscheduler_jobs SET next_run_time = ?, job_state = ? WHERE id = ?",
+                (datetime_to_utc_timestamp(job.next_run_time), self._dump(job), job.id)
+            )
+        if cursor.rowcount == 0:
+            raise JobLookupError(job.id)
+
+    def remove_job(self, job_id):
+        conn = self.db._get_conn()
+        with conn:
+            cursor = conn.execute("DELETE FROM apscheduler_jobs WHERE id = ?", (job_id,))
+        if cursor.rowcount == 0:
+            raise JobLookupError(job_id)
+
+    def remove_all_jobs(self):
+        conn = self.db._get_conn()
+        with conn:
+            conn.execute("DELETE FROM apscheduler_jobs")
+
+    def _dump(self, job):
+        return pickle.dumps(job.__getstate__(), self.pickle_protocol)
+
+    def _reconstitute_job(self, job_state):
+        job_state = pickle.loads(job_state)
+        job_state['jobstore'] = self
+        job = Job.__new__(Job)
+        job.__setstate__(job_state)
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+
+    def _get_jobs(self, where="", params=()):
+        conn = self.db._get_conn()
+        rows = conn.execute(f"SELECT id, job_state FROM apscheduler_jobs {where} ORDER BY next_run_time", params).fetchall()
+        jobs = []
+        failed = []
+        for job_id, job_state in rows:
+            try:
+                jobs.append(self._reconstitute_job(job_state))
+            except BaseException:
+                logger.exception(f"Unable to restore job '{job_id}' -- removing it")
+                failed.append((job_id,))
+        if failed:
+            with conn:
+                conn.executemany("DELETE FROM apscheduler_jobs WHERE id = ?", failed)
+        return jobs
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} (path={self.db.db_path})>"
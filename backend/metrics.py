@@ -0,0 +1,217 @@
+import bisect
+import functools
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Prometheus text exposition format, served by GET /metrics
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+FAST_BUCKETS = (.00005, .0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1, .25, 1)
+
+# Route label for requests that matched no endpoint, so 404 scans stay one series
+UNMATCHED = "<unmatched>"
+
+_registry = []
+_registry_lock = threading.Lock()
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+def _labels(pairs):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}" if pairs else ""
+
+def _number(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """A named family of series, one per combination of label values.
+
+    Recording is a dict lookup plus an update under the series' own lock;
+    nothing is formatted until render().
+    """
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def labels(self, *values):
+        series = self._series.get(values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, series in sorted(self._series.items()):
+            lines.extend(self._render_series(list(zip(self.labelnames, values)), series))
+        return lines
+
+class _CounterSeries:
+    __slots__ = ('value', 'lock')
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_series(self):
+        return _CounterSeries()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def _render_series(self, pairs, series):
+        return [f"{self.name}{_labels(pairs)} {_number(series.value)}"]
+
+class _HistogramSeries:
+    __slots__ = ('bounds', 'counts', 'sum', 'lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        # One slot per bucket plus the +Inf overflow; made cumulative on render
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[i] += 1
+            self.sum += value
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self):
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def _render_series(self, pairs, series):
+        with series.lock:
+            counts, total = list(series.counts), series.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_labels(pairs + [('le', _number(bound))])} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(pairs)} {_number(total)}")
+        lines.append(f"{self.name}_count{_labels(pairs)} {cumulative}")
+        return lines
+
+class Callback(_Metric):
+    """A gauge or counter read at scrape time, for values something else already keeps.
+
+    fn returns a number, or a dict of label-value tuples to numbers; None
+    leaves the metric out of that scrape.
+    """
+
+    def __init__(self, name, documentation, fn, labelnames=(), kind='gauge'):
+        super().__init__(name, documentation, labelnames)
+        self.fn = fn
+        self.kind = kind
+
+    def render(self):
+        try:
+            value = self.fn()
+        except Exception as e:
+            logger.warning(f"Metric {self.name} unavailable: {e}")
+            return []
+        if value is None:
+            return []
+        values = value if isinstance(value, dict) else {(): value}
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for label_values, v in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(list(zip(self.labelnames, label_values)))} {_number(v)}")
+        return lines
+
+def render():
+    """Every registered metric in the Prometheus text format."""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+def timed(series):
+    """Decorator: observe each call's duration (including ones that raise) in series."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                series.observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def instrument(cls, histogram):
+    """Time every public method defined on cls, labelled with the method name."""
+    for name, fn in list(vars(cls).items()):
+        if not name.startswith('_') and callable(fn):
+            setattr(cls, name, timed(histogram.labels(name))(fn))
+
+class RequestTimer:
+    """ASGI middleware observing each HTTP request's time to response start.
+
+    Labelled by method, route template (/tasks/{id}, not the raw path) and
+    status. Timing stops at the response start, so streams are measured by
+    how long they took to open rather than how long they stayed open.
+    """
+
+    def __init__(self, app, histogram):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        started = False
+
+        def observe(status):
+            route = getattr(scope.get("route"), "path", UNMATCHED)
+            self.histogram.labels(scope["method"], route, str(status)).observe(time.perf_counter() - start)
+
+        async def timed_send(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                observe(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        except Exception:
+            if not started:
+                observe(500)
+            raise
@@ -0,0 +1,123 @@
+import os
+import queue
+import threading
+import time
+import logging
+from database import db
+from notifier import notifier
+from reminder_cache import reminder_cache
+
+logger = logging.getLogger(__name__)
+
+# Fired reminders are coalesced for up to this long, then written in one transaction
+FLUSH_INTERVAL = int(os.getenv("NOTIFICATION_FLUSH_MS", "5")) / 1000
+MAX_BATCH = 500
+# Queue bound: once this many are waiting, submit() blocks the scheduler
+# worker instead of letting memory grow without limit
+MAX_PENDING = 10_000
+# How long submit() waits for room before writing the reminder itself
+SUBMIT_TIMEOUT = 5
+WRITE_ATTEMPTS = 3
+
+_STOP = object()
+
+class NotificationWriter:
+    """Single writer thread for notifications of fired reminders.
+
+    APScheduler worker threads call submit() and return immediately; the
+    writer drains the queue and stores each batch with db.record_fired, so a
+    burst of reminders due in the same minute costs a handful of
+    transactions instead of two per reminder.
+    """
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, max_batch=MAX_BATCH, max_pending=MAX_PENDING):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self.batches = 0
+        self.written = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    def start(self):
+        if not self.running:
+            self._thread = threading.Thread(target=self._run, name="notification-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Write everything queued so far, then stop the thread."""
+        if self.running:
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._thread = None
+
+    def flush(self):
+        """Block until every submitted reminder has been written."""
+        self._queue.join()
+
+    def submit(self, reminder_id, message, mark_done):
+        item = (reminder_id, message, mark_done)
+        if not self.running:
+            self._write([item])
+            return
+        try:
+            self._queue.put(item, timeout=SUBMIT_TIMEOUT)
+        except queue.Full:
+            logger.warning(f"⚠️  Notification queue full ({self._queue.maxsize}), writing directly.")
+            self._write([item])
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch):
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                stored = db.record_fired(batch)
+                break
+            except Exception as e:
+                logger.warning(f"Notification write failed (attempt {attempt}/{WRITE_ATTEMPTS}): {e}")
+                time.sleep(0.05 * attempt)
+        else:
+            logger.error(f"❌ Dropped {len(batch)} notifications after {WRITE_ATTEMPTS} attempts")
+            return
+        self.batches += 1
+        self.written += len(batch)
+        done = {}
+        for (notification_id, user_id), (reminder_id, message, mark_done) in zip(stored, batch):
+            notifier.publish({'id': notification_id, 'message': message}, user_id)
+            if mark_done:
+                done.setdefault(user_id, []).append(reminder_id)
+        # Fired one-offs leave their owners' active sets
+        for user_id, reminder_ids in done.items():
+            reminder_cache.wrote(user_id, reminder_ids)
+
+notification_writer = NotificationWriter()
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NotificationHub:
+    """In-process fan-out of new notifications to their user's connected stream clients.
+
+    Publishers (APScheduler worker threads) never touch asyncio directly: each
+    subscriber remembers the event loop it was created on and events are
+    handed over with call_soon_threadsafe.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        # user_id -> subscriptions, so a publish only visits that user's clients
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        """Register a subscriber for a user's events. Must be called from inside the event loop."""
+        sub = Subscription(self, asyncio.get_running_loop(), self.queue_size, user_id)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.user_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.user_id]
+
+    @property
+    def subscriber_count(self):
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def publish(self, event: dict, user_id):
+        """Deliver an event to the user's subscribers. Safe to call from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub._offer, event)
+            except RuntimeError:
+                # Loop already closed (worker shutting down)
+                self.unsubscribe(sub)
+
+class Subscription:
+    def __init__(self, hub, loop, queue_size, user_id):
+        self.hub = hub
+        self.loop = loop
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def _offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow client: drop it. It reconnects with Last-Event-ID and
+            # replays what it missed from the database.
+            logger.warning("⚠️  Notification subscriber overflowed, disconnecting.")
+            self.overflowed = True
+            self.hub.unsubscribe(self)
+
+    async def get(self, timeout):
+        """Next event, or None if nothing arrived within timeout seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+notifier = NotificationHub()
@@ -1,11 +1,79 @@
-import dateparser
-import dateparser.search
+import os
 import re
+import multiprocessing
+import threading
+import time
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from metrics import Histogram, timed
 
 logger = logging.getLogger(__name__)
 
+# Languages dateparser loads and tries, comma separated. Empty means auto-detect
+# across every language it ships, which is much slower to load and to search.
+PARSER_LANGUAGES = [l.strip() for l in os.getenv("PARSER_LANGUAGES", "en").split(",") if l.strip()] or None
+
+# Pre-process common phrases that parser might miss in sentence
+PHRASE_MAP = {
+    'tomorrow morning': 'at 9am tomorrow',
+    'tomorrow afternoon': 'at 2pm tomorrow', 
+    'tomorrow evening': 'at 7pm tomorrow',
+    'tonight': 'at 8pm today',
+    'later': 'in 4 hours', # basic default
+    'this evening': 'at 6pm today',
+    'next week': 'next monday at 9am'
+}
+
+# --- Precompiled patterns ---
+
+PM_24H_RE = re.compile(r'([1-2][0-9]):([0-5][0-9])\s*pm', re.IGNORECASE)
+PHRASE_RE = re.compile(r'\b(' + '|'.join(re.escape(p) for p in PHRASE_MAP) + r')\b', re.IGNORECASE)
+RECURRING_WORDS_RE = re.compile(r'(?i)\b(daily|every day|weekly|every week|every|day|week)\b')
+LEADING_FILLER_RE = re.compile(r'(?i)^(remind me (to|at)?|remind|me)\s*')
+TRAILING_FILLER_RE = re.compile(r'(?i)\s*(to|on|at|at)\s*$')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Fast path grammar: "in 20 minutes", "at 5pm", "tomorrow at 9", "at 7:30 am today".
+# Anything else (weekdays, dates, "next ...") goes to dateparser.
+IN_DELTA_RE = re.compile(
+    r'\bin\s+(?P<n>\d{1,4}|an?)\s+(?P<unit>minutes?|mins?|hours?|hrs?|days?|weeks?)\b',
+    re.IGNORECASE
+)
+AT_TIME_RE = re.compile(
+    r'\b(?:(?P<day_before>today|tomorrow)\s+)?at\s+'
+    r'(?P<hour>\d{1,2})(?::(?P<minute>[0-5]\d))?(?:\s*(?P<ampm>am|pm))?\b'
+    r'(?:\s+(?P<day_after>today|tomorrow)\b)?',
+    re.IGNORECASE
+)
+DATE_WORDS_RE = re.compile(
+    r'\b(mon|tues?|wed(nes)?|thu(rs?)?|fri|sat(ur)?|sun)(day)?\b|\bnext\b|\bon the\b|'
+    r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\s+\d|\d{1,4}[/-]\d{1,2}',
+    re.IGNORECASE
+)
+# dateparser matches that are offsets from "now" rather than wall-clock times
+RELATIVE_MATCH_RE = re.compile(r'\b(in|after|ago|from now)\b', re.IGNORECASE)
+
+UNIT_DELTAS = {
+    'min': timedelta(minutes=1), 'hou': timedelta(hours=1), 'hr': timedelta(hours=1),
+    'day': timedelta(days=1), 'wee': timedelta(weeks=1),
+}
+
+PARSE_CACHE_SIZE = 1024
+
+# Pool that runs parse() off the event loop. "process" sidesteps the GIL for
+# batch imports at the cost of one warm parser per worker.
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "4"))
+PARSE_POOL = os.getenv("PARSE_POOL", "thread")
+
+# Recorded in whichever process parses; with PARSE_POOL=process that is a
+# worker, and /metrics only shows what the API process parsed itself
+PARSE_DURATION = Histogram("reminder_parse_duration_seconds", "ReminderParser.parse duration.")
+DATEPARSER_DURATION = Histogram(
+    "dateparser_search_duration_seconds", "dateparser search_dates calls (parse cache misses off the fast path)."
+)
+
 class ReminderParser:
     def __init__(self):
         self.settings = {
@@ -14,45 +82,123 @@ class ReminderParser:
             'RETURN_AS_TIMEZONE_AWARE': False,
             'PARSERS': ['relative-time', 'absolute-time'] 
         }
+        self.languages = PARSER_LANGUAGES
+        self.use_fast_path = True
+        # Keyed on (normalized text, relative base truncated to the minute)
+        self._search_cached = lru_cache(maxsize=PARSE_CACHE_SIZE)(self._search_dates)
+        # dateparser is imported on first use (or by warm_up), not at import time
+        self._search_dates_fn = None
+        self._load_lock = threading.Lock()
+
+    def clear_cache(self):
+        self._search_cached.cache_clear()
+
+    def _dateparser_search(self):
+        if self._search_dates_fn is None:
+            with self._load_lock:
+                if self._search_dates_fn is None:
+                    import dateparser.search
+                    self._search_dates_fn = dateparser.search.search_dates
+        return self._search_dates_fn
+
+    def warm_up(self):
+        """Import dateparser and load its language data ahead of the first request."""
+        start = time.perf_counter()
+        try:
+            self._dateparser_search()
+            # Exercises both the relative and absolute parsers
+            self._search_dates("warm up on friday at 5pm in 2 hours", datetime.now())
+            logger.info(f"🔥 Parser warmed up in {time.perf_counter() - start:.2f}s (languages: {self.languages or 'all'}).")
+        except Exception as e:
+            logger.warning(f"Parser warm-up failed: {e}")
+
+    def _fast_parse(self, text, base, recurring):
+        """Hand-written grammar for the common forms. Returns (matched, run_time) or None."""
+        if DATE_WORDS_RE.search(text):
+            return None
+
+        deltas = list(IN_DELTA_RE.finditer(text))
+        times = list(AT_TIME_RE.finditer(text))
+        if len(deltas) + len(times) != 1:
+            return None
+
+        if deltas:
+            m = deltas[0]
+            n = m.group('n').lower()
+            count = 1 if n in ('a', 'an') else int(n)
+            unit = m.group('unit').lower()
+            step = UNIT_DELTAS.get(unit[:3]) or UNIT_DELTAS[unit[:2]]
+            return m.group(0), base + step * count
+
+        m = times[0]
+        day = (m.group('day_before') or m.group('day_after') or '').lower()
+        hour = int(m.group('hour'))
+        minute = int(m.group('minute') or 0)
+        ampm = (m.group('ampm') or '').lower()
+
+        if ampm:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if ampm == 'pm' else 0)
+        elif hour > 23:
+            return None
+        elif m.group('minute') is None and not day and not recurring:
+            # A bare "at 5" is ambiguous without a day or recurrence for context
+            return None
+
+        run_time = base.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if day == 'tomorrow':
+            run_time += timedelta(days=1)
+        elif not day and run_time <= base:
+            # Time of day only: next occurrence
+            run_time += timedelta(days=1)
+        return m.group(0), run_time
 
+    @timed(DATEPARSER_DURATION)
+    def _search_dates(self, text, base):
+        settings = self.settings.copy()
+        settings['RELATIVE_BASE'] = base
+        try:
+            dates = self._dateparser_search()(text, languages=self.languages, settings=settings)
+        except Exception:
+            dates = None
+        # Taking the last detected date often works best for "remind me on [date]"
+        return dates[-1] if dates else None
+
+    def _find_time(self, text, base, recurring):
+        if self.use_fast_path:
+            found = self._fast_parse(text, base, recurring)
+            if found:
+                return found
+
+        bucket = base.replace(second=0, microsecond=0)
+        found = self._search_cached(text, bucket)
+        if not found:
+            return None
+        matched_string, run_time = found
+        if RELATIVE_MATCH_RE.search(matched_string):
+            # Computed from the bucket start; shift onto the real base
+            run_time += base - bucket
+        return matched_string, run_time
+
+    @timed(PARSE_DURATION)
     def parse(self, text: str, local_time_str: str = None):
-        text = text.strip()
+        text = WHITESPACE_RE.sub(' ', text).strip()
         # Sanitize common user error: 22:58 pm -> 22:58
-        text = re.sub(r'([1-2][0-9]):([0-5][0-9])\s*pm', r'\1:\2', text, flags=re.IGNORECASE)
+        text = PM_24H_RE.sub(r'\1:\2', text)
         
         # Use current time as relative base for every parse
-        current_settings = self.settings.copy()
+        base_time = None
         if local_time_str:
             try:
                 # Handle simplified ISO format often sent by JS
                 base_time = datetime.fromisoformat(local_time_str.replace('Z', '+00:00')).replace(tzinfo=None)
-                current_settings['RELATIVE_BASE'] = base_time
             except Exception as e:
                 logger.warning(f"Failed to parse local_time '{local_time_str}', using server time. Error: {e}")
-                current_settings['RELATIVE_BASE'] = datetime.now()
-        else:
-            current_settings['RELATIVE_BASE'] = datetime.now()
+        if base_time is None:
+            base_time = datetime.now()
 
-        # Pre-process common phrases that parser might miss in sentence
-        text_proc = text.lower()
-        
-        # Improved mappings
-        phrase_map = {
-            'tomorrow morning': 'at 9am tomorrow',
-            'tomorrow afternoon': 'at 2pm tomorrow', 
-            'tomorrow evening': 'at 7pm tomorrow',
-            'tonight': 'at 8pm today',
-            'later': 'in 4 hours', # basic default
-            'this evening': 'at 6pm today',
-            'next week': 'next monday at 9am'
-        }
-        
-        for phrase, replacement in phrase_map.items():
-            if phrase in text_proc:
-                 # Only replace if it's not part of a larger time context? 
-                 # dateparser is smart, but let's help it.
-                 # Regex safe replacement?
-                 text = re.sub(f"\\b{phrase}\\b", replacement, text, flags=re.IGNORECASE)
+        text = PHRASE_RE.sub(lambda m: PHRASE_MAP[m.group(1).lower()], text)
 
         # 1. Detect recurrence
         repeat_type = 'once'
@@ -63,26 +209,21 @@ class ReminderParser:
             repeat_type = 'weekly'
         
         # 2. Extract time
-        try:
-            dates = dateparser.search.search_dates(text, settings=current_settings)
-        except Exception:
-            dates = None
-
-        if not dates:
+        found = self._find_time(text, base_time, repeat_type != 'once')
+        if not found:
             return {'error': "I couldn't quite catch the time. Try something like 'at 5pm' or 'tomorrow'."}
         
-        # Taking the last detected date often works best for "remind me on [date]"
-        matched_string, run_time = dates[-1]
+        matched_string, run_time = found
         
         # 3. Extract Task
         clean_text = text.replace(matched_string, '')
         
         # Remove recurring keywords from task name
-        clean_text = re.sub(r'(?i)\b(daily|every day|weekly|every week|every|day|week)\b', '', clean_text)
+        clean_text = RECURRING_WORDS_RE.sub('', clean_text)
         
-        clean_text = re.sub(r'(?i)^(remind me (to|at)?|remind|me)\s*', '', clean_text)
-        clean_text = re.sub(r'(?i)\s*(to|on|at|at)\s*$', '', clean_text)
-        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+        clean_text = LEADING_FILLER_RE.sub('', clean_text)
+        clean_text = TRAILING_FILLER_RE.sub('', clean_text)
+        clean_text = WHITESPACE_RE.sub(' ', clean_text).strip()
         
         task = clean_text if clean_text else "Reminder"
         if len(task) > 1:
@@ -95,7 +236,7 @@ class ReminderParser:
         
         # Safety check: if run_time is in the past, maybe they meant tomorrow?
         # But dateparser PREFER_DATES_FROM='future' usually handles this.
-        if run_time < current_settings['RELATIVE_BASE']:
+        if run_time < base_time:
              # Double check - if it was just seconds ago, it's fine (processing delay)
              # If hours ago, likely misinterpretation.
              pass 
@@ -111,3 +252,17 @@ class ReminderParser:
         }
 
 parser = ReminderParser()
+
+def parse_message(text, local_time_str=None):
+    """Module-level entry point so process pool workers can pickle the call."""
+    return parser.parse(text, local_time_str)
+
+def _warm_up_worker():
+    parser.warm_up()
+
+def create_parse_executor(workers=PARSE_WORKERS, kind=PARSE_POOL):
+    if kind == 'process':
+        # spawn, not fork: the API process already runs scheduler and warm-up
+        # threads whose held locks a forked child would inherit
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=_warm_up_worker)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
@@ -0,0 +1,242 @@
+import json
+import calendar
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from database.times import DB_TIME_FORMAT
+
+FREQUENCIES = ('daily', 'weekly', 'monthly')
+WEEKDAY_CODES = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+# COUNT is resolved to an end date once per rule by walking the series
+MAX_COUNT = 1000
+# Monthly rules on day 29-31 skip short months; a hundred eligible months
+# covers any leap-year cycle before we give up on finding an occurrence.
+MONTH_SCAN_LIMIT = 100
+
+class Recurrence:
+    """An RRULE-style series of naive local times, anchored at start.
+
+    Supports FREQ daily/weekly/monthly with INTERVAL, BYDAY (weekly,
+    0 = Monday), BYMONTHDAY (monthly, negative counts from the month's end),
+    UNTIL and COUNT. Occurrences keep start's time of day.
+
+    next_after() works out which period an instant falls in arithmetically,
+    so finding the next occurrence costs the same a day or ten years after
+    start; between() expands a range lazily from there.
+    """
+
+    def __init__(self, freq, start, interval=1, weekdays=None, month_days=None, until=None, count=None):
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unsupported frequency '{freq}'")
+        if not isinstance(interval, int) or interval < 1:
+            raise ValueError(f"Interval must be a positive integer, got {interval!r}")
+        if count is not None and not (isinstance(count, int) and 1 <= count <= MAX_COUNT):
+            raise ValueError(f"Count must be between 1 and {MAX_COUNT}, got {count!r}")
+        if weekdays and freq != 'weekly':
+            raise ValueError("Weekdays only apply to weekly recurrences")
+        if month_days and freq != 'monthly':
+            raise ValueError("Month days only apply to monthly recurrences")
+        if weekdays and not all(isinstance(d, int) and 0 <= d <= 6 for d in weekdays):
+            raise ValueError(f"Weekdays must be 0 (Monday) to 6 (Sunday), got {weekdays!r}")
+        if month_days and not all(isinstance(d, int) and 1 <= abs(d) <= 31 for d in month_days):
+            raise ValueError(f"Month days must be 1..31 or -31..-1, got {month_days!r}")
+
+        self.freq = freq
+        self.start = start.replace(microsecond=0)
+        self.interval = interval
+        self.weekdays = tuple(sorted(set(weekdays))) if weekdays else (self.start.weekday(),)
+        self.month_days = tuple(sorted(set(month_days))) if month_days else (self.start.day,)
+        self.until = until
+        self.count = count
+        self._time = self.start.time()
+        self._end = None
+        self._end_resolved = False
+
+    @classmethod
+    def from_payload(cls, payload, start=None):
+        """Build from the repeat_payload dict; 'start' in the payload wins over start."""
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        if not isinstance(payload, dict):
+            raise ValueError("Recurrence must be a JSON object")
+        unknown = set(payload) - {'freq', 'start', 'interval', 'weekdays', 'month_days', 'until', 'count'}
+        if unknown:
+            raise ValueError(f"Unknown recurrence field(s): {', '.join(sorted(unknown))}")
+        start = _to_datetime(payload.get('start') or start)
+        if start is None:
+            raise ValueError("Recurrence has no start time")
+        until = payload.get('until')
+        return cls(
+            payload.get('freq'), start,
+            interval=payload.get('interval', 1),
+            weekdays=payload.get('weekdays'),
+            month_days=payload.get('month_days'),
+            until=_to_datetime(until) if until else None,
+            count=payload.get('count'),
+        )
+
+    def to_payload(self):
+        payload = {'freq': self.freq, 'start': self.start.strftime(DB_TIME_FORMAT)}
+        if self.interval != 1:
+            payload['interval'] = self.interval
+        if self.freq == 'weekly' and self.weekdays != (self.start.weekday(),):
+            payload['weekdays'] = list(self.weekdays)
+        if self.freq == 'monthly' and self.month_days != (self.start.day,):
+            payload['month_days'] = list(self.month_days)
+        if self.until:
+            payload['until'] = self.until.strftime(DB_TIME_FORMAT)
+        if self.count:
+            payload['count'] = self.count
+        return payload
+
+    def to_json(self):
+        return json.dumps(self.to_payload(), sort_keys=True)
+
+    # --- Queries ---
+
+    def first_at_or_after(self, t):
+        """Earliest occurrence >= t, or None once the series has ended."""
+        occurrence = self._raw_at_or_after(max(t, self.start))
+        end = self.end
+        if occurrence is None or (end is not None and occurrence > end):
+            return None
+        return occurrence
+
+    def next_after(self, t):
+        """Earliest occurrence strictly after t, or None once the series has ended."""
+        # Occurrences are whole seconds
+        return self.first_at_or_after(t.replace(microsecond=0) + timedelta(seconds=1))
+
+    def between(self, start, end):
+        """Occurrences in [start, end), generated lazily."""
+        occurrence = self.first_at_or_after(start)
+        while occurrence is not None and occurrence < end:
+            yield occurrence
+            occurrence = self.next_after(occurrence)
+
+    @property
+    def end(self):
+        """Last instant the series may produce: UNTIL, or the COUNT-th occurrence."""
+        if not self._end_resolved:
+            end = self.until
+            if self.count:
+                occurrence = self._raw_at_or_after(self.start)
+                for _ in range(self.count - 1):
+                    if occurrence is None:
+                        break
+                    occurrence = self._raw_at_or_after(occurrence + timedelta(seconds=1))
+                if occurrence is not None and (end is None or occurrence < end):
+                    end = occurrence
+            self._end = end
+            self._end_resolved = True
+        return self._end
+
+    # --- Closed-form stepping, ignoring UNTIL/COUNT. t is never before start. ---
+
+    def _raw_at_or_after(self, t):
+        if self.freq == 'daily':
+            return self._daily(t)
+        if self.freq == 'weekly':
+            return self._weekly(t)
+        return self._monthly(t)
+
+    def _daily(self, t):
+        days = (t.date() - self.start.date()).days
+        day = days - days % self.interval
+        occurrence = datetime.combine(self.start.date() + timedelta(days=day), self._time)
+        if occurrence < t:
+            occurrence += timedelta(days=self.interval)
+        return occurrence
+
+    def _weekly(self, t):
+        first_monday = self.start.date() - timedelta(days=self.start.weekday())
+        week = (t.date() - first_monday).days // 7
+        # At most two passes: the rest of this week, then the next eligible one
+        while True:
+            if week % self.interval:
+                week += self.interval - week % self.interval
+            monday = first_monday + timedelta(weeks=week)
+            for weekday in self.weekdays:
+                occurrence = datetime.combine(monday + timedelta(days=weekday), self._time)
+                if occurrence >= t:
+                    return occurrence
+            week += 1
+
+    def _monthly(self, t):
+        first_month = self.start.year * 12 + self.start.month - 1
+        month = t.year * 12 + t.month - 1 - first_month
+        for _ in range(MONTH_SCAN_LIMIT):
+            if month % self.interval:
+                month += self.interval - month % self.interval
+            year, month_index = divmod(first_month + month, 12)
+            last_day = calendar.monthrange(year, month_index + 1)[1]
+            days = sorted({d if d > 0 else last_day + 1 + d for d in self.month_days if abs(d) <= last_day})
+            for day in days:
+                occurrence = datetime.combine(date(year, month_index + 1, day), self._time)
+                if occurrence >= t:
+                    return occurrence
+            month += 1
+        return None
+
+    def __repr__(self):
+        return f"<Recurrence {self.to_json()}>"
+
+def rule_for(repeat_type, repeat_payload=None, run_time=None):
+    """Recurrence for a reminder row, or None for one-offs.
+
+    Rows without a payload (plain 'daily'/'weekly') are anchored at run_time.
+    """
+    if not repeat_type or repeat_type == 'once':
+        return None
+    if isinstance(run_time, datetime):
+        if run_time.tzinfo is not None:
+            raise ValueError("run_time must be a naive local time")
+        run_time = run_time.strftime(DB_TIME_FORMAT)
+    return _cached_rule(repeat_type, repeat_payload or None, run_time)
+
+@lru_cache(maxsize=1024)
+def _cached_rule(repeat_type, repeat_payload, run_time):
+    payload = json.loads(repeat_payload) if repeat_payload else {}
+    payload.setdefault('freq', repeat_type)
+    if payload['freq'] != repeat_type:
+        raise ValueError(f"Recurrence freq '{payload['freq']}' does not match repeat_type '{repeat_type}'")
+    return Recurrence.from_payload(payload, run_time)
+
+def from_rrule(rrule, start):
+    """Recurrence for an iCalendar RRULE value (the subset Recurrence supports)."""
+    parts = dict(p.split('=', 1) for p in rrule.upper().split(';') if '=' in p)
+    unsupported = set(parts) - {'FREQ', 'INTERVAL', 'BYDAY', 'BYMONTHDAY', 'UNTIL', 'COUNT', 'WKST'}
+    if unsupported:
+        raise ValueError(f"Unsupported RRULE part(s): {', '.join(sorted(unsupported))}")
+
+    weekdays = None
+    if 'BYDAY' in parts:
+        codes = parts['BYDAY'].split(',')
+        if any(code not in WEEKDAY_CODES for code in codes):
+            # "1MO"-style ordinals belong to monthly rules we do not model
+            raise ValueError(f"Unsupported BYDAY '{parts['BYDAY']}'")
+        weekdays = [WEEKDAY_CODES.index(code) for code in codes]
+
+    until = None
+    if 'UNTIL' in parts:
+        value = parts['UNTIL'].rstrip('Z')
+        until = datetime.strptime(value, '%Y%m%dT%H%M%S' if 'T' in value else '%Y%m%d')
+        if 'T' not in value:
+            until = until.replace(hour=23, minute=59, second=59)
+
+    try:
+        return Recurrence(
+            parts.get('FREQ', '').lower(), start,
+            interval=int(parts.get('INTERVAL', '1')),
+            weekdays=weekdays,
+            month_days=[int(d) for d in parts['BYMONTHDAY'].split(',')] if 'BYMONTHDAY' in parts else None,
+            until=until,
+            count=int(parts['COUNT']) if 'COUNT' in parts else None,
+        )
+    except ValueError as e:
+        raise ValueError(f"Unsupported RRULE '{rrule}': {e}")
+
+def _to_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.strptime(str(value).replace('T', ' ').split('.')[0], DB_TIME_FORMAT)
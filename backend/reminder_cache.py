@@ -0,0 +1,195 @@
+import bisect
+import heapq
+import os
+import threading
+import logging
+from collections import OrderedDict
+from database import db, TIMELINE_GROUPS
+from database.times import to_epoch
+
+logger = logging.getLogger(__name__)
+
+# Users whose active reminders are held in memory; the least recently read go first
+CACHE_USERS = int(os.getenv("REMINDER_CACHE_USERS", "1000"))
+
+CACHED_STATUSES = ('active', 'snoozed')
+
+class _Slice:
+    """One user's active and snoozed reminders as of a data version.
+
+    Each status keeps its rows sorted by (epoch run_time, id), the timeline's
+    keyset order, with a parallel list of those keys to bisect.
+    """
+
+    def __init__(self, version, reminders):
+        self.version = version
+        self.keys = {status: [] for status in CACHED_STATUSES}
+        self.rows = {status: [] for status in CACHED_STATUSES}
+        self.where = {}
+        # Rows arrive in (run_time, id) order, so each status list does too
+        for r in reminders:
+            key = (to_epoch(r.run_time), r.id)
+            self.keys[r.status].append(key)
+            self.rows[r.status].append(r)
+            self.where[r.id] = (r.status, key)
+
+    def discard(self, reminder_id):
+        found = self.where.pop(reminder_id, None)
+        if found:
+            status, key = found
+            i = bisect.bisect_left(self.keys[status], key)
+            del self.keys[status][i]
+            del self.rows[status][i]
+
+    def add(self, r):
+        key = (to_epoch(r.run_time), r.id)
+        i = bisect.bisect_left(self.keys[r.status], key)
+        self.keys[r.status].insert(i, key)
+        self.rows[r.status].insert(i, r)
+        self.where[r.id] = (r.status, key)
+
+    def page(self, group, now, today_end, limit, cursor=None):
+        """Up to limit + 1 rows of a timeline bucket after cursor, in display order."""
+        if group == 'past':
+            keys = self.keys['active']
+            end = bisect.bisect_left(keys, (now,))
+            if cursor:
+                end = min(end, bisect.bisect_left(keys, tuple(cursor)))
+            return self.rows['active'][max(0, end - limit - 1):end][::-1]
+
+        lo, hi = (now, today_end) if group == 'today' else (today_end, None)
+        slices = []
+        for status in CACHED_STATUSES:
+            keys = self.keys[status]
+            start = bisect.bisect_left(keys, (lo,))
+            if cursor:
+                start = max(start, bisect.bisect_right(keys, tuple(cursor)))
+            end = len(keys) if hi is None else bisect.bisect_left(keys, (hi,))
+            slices.append(self.rows[status][start:min(end, start + limit + 1)])
+        # Merge the per-status runs back into one ordering
+        merged = heapq.merge(*slices, key=lambda r: (to_epoch(r.run_time), r.id))
+        return [r for r, _ in zip(merged, range(limit + 1))]
+
+    def counts(self, now, today_end):
+        def below(status, bound):
+            return bisect.bisect_left(self.keys[status], (bound,))
+        return {
+            'past': below('active', now),
+            'today': sum(below(s, today_end) - below(s, now) for s in CACHED_STATUSES),
+            'upcoming': sum(len(self.keys[s]) - below(s, today_end) for s in CACHED_STATUSES),
+        }
+
+    def reminders(self):
+        return sorted(
+            (r for status in CACHED_STATUSES for r in self.rows[status]),
+            key=lambda r: (to_epoch(r.run_time), r.id)
+        )
+
+class ActiveReminderCache:
+    """Per-user active/snoozed reminders in memory, serving the timeline without SQL.
+
+    Every read first checks the user's data version (one primary-key
+    lookup, bumped by a trigger on every write from any process), so a
+    slice is never served stale. The API's own writes go through wrote(),
+    which patches the slice in place instead of dropping it, provided the
+    version moved by exactly those writes; anything else reloads on the
+    next read.
+    """
+
+    def __init__(self, size=CACHE_USERS):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.invalidations = 0
+
+    def __contains__(self, user_id):
+        return user_id in self._entries
+
+    def _slice(self, user_id):
+        # Version first: rows loaded after it are at least as new, so a
+        # write in between only costs a reload on the next read
+        version = db.get_data_version(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry
+
+        entry = _Slice(version, db.get_active_reminders(user_id))
+        with self._lock:
+            self.misses += 1
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def timeline(self, user_id, now, today_end, limit, groups=TIMELINE_GROUPS, cursors=None):
+        """(pages, counts) from memory: what Database.get_timeline and count_timeline return.
+
+        Blocking; the version check reads the database.
+        """
+        cursors = cursors or {}
+        now, today_end = to_epoch(now), to_epoch(today_end)
+        entry = self._slice(user_id)
+        with self._lock:
+            pages = {}
+            for group in groups:
+                items = entry.page(group, now, today_end, limit, cursors.get(group))
+                pages[group] = (items[:limit], len(items) > limit)
+            return pages, entry.counts(now, today_end)
+
+    def wrote(self, user_id, reminder_ids):
+        """Write-through: this process just changed these reminders of user_id, one write each.
+
+        Blocking; run on the DB threads.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None:
+            return
+        rows = db.get_reminders(reminder_ids)
+        version = db.get_data_version(user_id)
+        with self._lock:
+            if self._entries.get(user_id) is not entry:
+                return
+            if version != entry.version + len(reminder_ids):
+                # Another writer got in as well; the next read reloads
+                del self._entries[user_id]
+                self.invalidations += 1
+                return
+            for reminder_id in reminder_ids:
+                entry.discard(reminder_id)
+                r = rows.get(reminder_id)
+                if r is not None and r.user_id == user_id and r.status in CACHED_STATUSES:
+                    entry.add(r)
+            entry.version = version
+            self.writes += 1
+
+    def verify(self, user_id):
+        """Consistency check: ids of reminders where the cached slice and the table disagree.
+
+        Compares against a fresh read at the slice's version; returns None if
+        the table has moved on since (the next read would reload anyway).
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            cached = {r.id: r for r in entry.reminders()} if entry else None
+        if cached is None:
+            return []
+        fresh = {r.id: r for r in db.get_active_reminders(user_id)}
+        # Read after the rows: any write they might include shows up here
+        version = db.get_data_version(user_id)
+        if version != entry.version:
+            return None
+        return sorted(i for i in cached.keys() | fresh.keys() if cached.get(i) != fresh.get(i))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+reminder_cache = ActiveReminderCache()
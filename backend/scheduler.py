@@ -1,31 +1,139 @@
 import os
+import time
 import urllib.request
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.base import BaseTrigger
 from apscheduler.triggers.date import DateTrigger
-from apscheduler.triggers.cron import CronTrigger
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.util import localize
+from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from database import db
-try:
-    import pytz
-    KOLKATA = pytz.timezone('Asia/Kolkata')
-except ImportError:
-    KOLKATA = None
+from database.times import KOLKATA, to_epoch
+from notifier import notifier
+from notification_writer import notification_writer
+from dispatcher import ReminderDispatcher
+from jobstore import SQLiteJobStore
+from recurrence import rule_for
+from metrics import Counter, Histogram
 
 logger = logging.getLogger(__name__)
 
+# One-off reminders are only held as APScheduler jobs once they fall inside
+# this rolling window; the refill job pulls the next slice from the database.
+# Recurring reminders are always registered, one job each whatever the horizon:
+# a RecurrenceTrigger computes the next occurrence from the rule after every firing.
+SCHEDULE_HORIZON = timedelta(minutes=int(os.getenv("SCHEDULE_HORIZON_MINUTES", "60")))
+# Must stay well below the horizon so the window never runs dry
+HORIZON_REFILL_INTERVAL = timedelta(minutes=int(os.getenv("HORIZON_REFILL_MINUTES", "10")))
+
+# Reminder jobs live in the SQLite job store and survive restarts; housekeeping
+# jobs (self-ping, refill, heartbeat, retention) are process-local and stay in memory.
+REMINDER_JOBSTORE = 'reminders'
+HEARTBEAT_INTERVAL = timedelta(seconds=60)
+
+# What to do with reminders that came due while the process was down:
+# "fire" delivers them in one batch on boot, "skip" just marks one-offs done.
+CATCH_UP_MODE = os.getenv("SCHEDULER_CATCH_UP", "fire")
+# Anything missed by more than this is never delivered late
+CATCH_UP_MAX_AGE = timedelta(hours=int(os.getenv("CATCH_UP_MAX_AGE_HOURS", "24")))
+
+# "embedded": each API process runs the scheduler (a single-worker deploy).
+# "external": API workers only queue changed reminder ids in the database and
+# scheduler_service.py, one elected process, fires reminders for all of them.
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "embedded")
+# How often the scheduler service drains the change queue
+CHANGE_POLL_INTERVAL = timedelta(milliseconds=int(os.getenv("SCHEDULE_QUEUE_POLL_MS", "1000")))
+CHANGE_BATCH = 500
+
+# How reminders fire. "apscheduler": each is its own APScheduler job, kept in
+# the persistent job store. "heap": one ReminderDispatcher thread fires them
+# from an in-memory heap rebuilt from the table on every boot, each second's
+# due reminders as one batch, highest priority first.
+DISPATCH_ENGINE = os.getenv("DISPATCH_ENGINE", "apscheduler")
+
+# Retention: read notifications and done/cancelled reminders older than this
+# many days move to the archive tables (so drop out of the calendar and the
+# notification list); 0 keeps them forever.
+RETENTION_NOTIFICATION_DAYS = int(os.getenv("RETENTION_NOTIFICATION_DAYS", "30"))
+RETENTION_REMINDER_DAYS = int(os.getenv("RETENTION_REMINDER_DAYS", "90"))
+RETENTION_INTERVAL = timedelta(hours=int(os.getenv("RETENTION_INTERVAL_HOURS", "6")))
+# Rows per transaction, and the pause after each that lets API writes in
+RETENTION_BATCH = int(os.getenv("RETENTION_BATCH", "500"))
+RETENTION_PAUSE = 0.05
+# Free pages handed back to the filesystem per incremental_vacuum step
+VACUUM_STEP = 1000
+# Files created before incremental auto_vacuum need one full VACUUM to convert;
+# it blocks writers for as long as it takes, so it only runs when asked for
+RETENTION_CONVERT_VACUUM = os.getenv("RETENTION_CONVERT_VACUUM", "0") == "1"
+
+FIRE_LAG = Histogram(
+    "reminder_fire_lag_seconds", "Delay from a reminder's run_time to its callback.",
+    buckets=(.01, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60, 300)
+)
+ARCHIVED = Counter("retention_archived_rows_total", "Rows retention moved to the archive tables.", ("table",))
+RECLAIMED = Counter("retention_reclaimed_bytes_total", "Bytes incremental vacuum returned to the filesystem.")
+
+class RecurrenceTrigger(BaseTrigger):
+    """Fires on a Recurrence's occurrences, read as wall-clock times in timezone.
+
+    Never fires before not_before (the reminder's pending run_time), which is
+    how completing an occurrence early skips it.
+    """
+
+    def __init__(self, rule, timezone, not_before=None):
+        self.rule = rule
+        self.timezone = timezone
+        self.not_before = not_before
+
+    def get_next_fire_time(self, previous_fire_time, now):
+        if previous_fire_time is not None:
+            occurrence = self.rule.next_after(self._wall_clock(previous_fire_time))
+        else:
+            after = self._wall_clock(now)
+            if self.not_before and self.not_before > after:
+                after = self.not_before
+            occurrence = self.rule.first_at_or_after(after)
+        return localize(occurrence, self.timezone) if occurrence else None
+
+    def _wall_clock(self, dt):
+        return dt.astimezone(self.timezone).replace(tzinfo=None)
+
+    def __str__(self):
+        return f"recurrence[{self.rule.to_json()}]"
+
+def fire_reminder(reminder_id, task, repeat_type):
+    """Job entry point. Module-level so the persistent job store can reference it by name."""
+    scheduler._job_callback(reminder_id, task, repeat_type)
+
 class SchedulerManager:
     def __init__(self):
         # Explicitly set timezone if available, otherwise default (local)
         tz = KOLKATA if KOLKATA else None
-        self.scheduler = BackgroundScheduler(timezone=tz)
+        self.jobstore = SQLiteJobStore(db)
+        self.scheduler = BackgroundScheduler(
+            timezone=tz,
+            jobstores={'default': MemoryJobStore(), REMINDER_JOBSTORE: self.jobstore}
+        )
         self.is_running = False
         self.app_url = os.getenv("APP_URL")
+        # Epoch seconds up to which one-off reminders are materialized.
+        # None until load_jobs_from_db runs: schedule everything directly.
+        self.loaded_until = None
+        self._horizon_lock = threading.Lock()
+        # Scheduling calls only queue the reminder id for the scheduler service
+        self.delegated = SCHEDULER_MODE == 'external'
+        self.dispatcher = ReminderDispatcher(self._fire_batch) if DISPATCH_ENGINE == 'heap' else None
+        self.scheduler.add_listener(self._record_fire_lag, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
 
     def start(self):
+        """Start paused; load_jobs_from_db reconciles the persisted jobs and resumes."""
         if not self.is_running:
-            self.scheduler.start()
+            notification_writer.start()
+            self.scheduler.start(paused=True)
             self.is_running = True
             if KOLKATA:
                  logger.info(f"🚀 Scheduler started (Timezone: {KOLKATA}).")
@@ -33,6 +141,17 @@ class SchedulerManager:
                  logger.info("🚀 Scheduler started (System Timezone).")
             self.schedule_self_ping()
 
+    def shutdown(self):
+        if self.is_running:
+            self.scheduler.shutdown(wait=True)
+            if self.dispatcher and self.dispatcher.running:
+                self.dispatcher.stop()
+                db.set_state('dispatched_at', str(to_epoch(self._now())))
+            # After the workers: flushes whatever they queued on the way out
+            notification_writer.stop()
+            self.is_running = False
+            logger.info("🛑 Scheduler stopped.")
+
     def schedule_self_ping(self):
         if not self.app_url:
             logger.warning("⚠️  APP_URL environment variable not set. Self-ping job skipped.")
@@ -58,66 +177,368 @@ class SchedulerManager:
         except Exception as e:
             logger.warning(f"❌ Self-ping failed: {e}")
 
-    def schedule_reminder(self, reminder_id, task, run_time, repeat_type):
+    def _build_trigger(self, run_time, repeat_type, repeat_payload=None):
+        if repeat_type == 'once':
+            return DateTrigger(run_date=run_time)
+        # Recurrences are computed in the scheduler's timezone, not the host's
+        tz = self.scheduler.timezone
+        wall_clock = run_time.astimezone(tz).replace(tzinfo=None) if run_time.tzinfo else run_time
+        return RecurrenceTrigger(rule_for(repeat_type, repeat_payload, wall_clock), tz, not_before=wall_clock)
+
+    def schedule_reminder(self, reminder_id, task, run_time, repeat_type, repeat_payload=None, priority=1):
+        if self.delegated:
+            db.enqueue_schedule_changes([reminder_id])
+            return
+
+        with self._horizon_lock:
+            if repeat_type == 'once' and self.loaded_until and to_epoch(run_time) >= self.loaded_until:
+                # Beyond the window: _refill_horizon picks it up from the DB later
+                self.cancel_job(reminder_id)
+                logger.info(f"Deferred task '{task}' for {run_time} (beyond schedule horizon)")
+                return
+            self._add_reminder_job(reminder_id, task, run_time, repeat_type, repeat_payload, priority)
+
+    def _add_reminder_job(self, reminder_id, task, run_time, repeat_type, repeat_payload=None, priority=1):
+        if self.dispatcher:
+            self._dispatch(reminder_id, task, run_time, repeat_type, repeat_payload, priority)
+            logger.info(f"Scheduled task '{task}' for {run_time} ({repeat_type})")
+            return
         job_id = f"reminder_{reminder_id}"
         
-        trigger = None
-        if repeat_type == 'daily':
-            trigger = CronTrigger(hour=run_time.hour, minute=run_time.minute, second=run_time.second)
-        elif repeat_type == 'weekly':
-            trigger = CronTrigger(day_of_week=run_time.weekday(), hour=run_time.hour, minute=run_time.minute, second=run_time.second)
-        else:
-            trigger = DateTrigger(run_date=run_time)
-
-        if self.scheduler.get_job(job_id):
-             self.scheduler.remove_job(job_id)
+        trigger = self._build_trigger(run_time, repeat_type, repeat_payload)
 
+        # replace_existing updates the stored job in place
         self.scheduler.add_job(
-            self._job_callback,
+            fire_reminder,
             trigger=trigger,
             id=job_id,
             args=[reminder_id, task, repeat_type],
+            jobstore=REMINDER_JOBSTORE,
             replace_existing=True,
             misfire_grace_time=60 # Give it a minute to catch up
         )
         logger.info(f"Scheduled task '{task}' for {run_time} ({repeat_type})")
 
+    def schedule_reminders(self, reminders):
+        """Register many (reminder_id, task, run_time, repeat_type, repeat_payload, priority) jobs in one pass.
+
+        Used for freshly inserted rows, so there is no existing job to look up;
+        replace_existing covers the rare re-import of an id.
+        """
+        if self.delegated:
+            db.enqueue_schedule_changes([r[0] for r in reminders])
+            return
+        count = 0
+        for reminder_id, task, run_time, repeat_type, repeat_payload, priority in reminders:
+            count += 1
+            if self.dispatcher:
+                self._dispatch(reminder_id, task, run_time, repeat_type, repeat_payload, priority)
+                continue
+            self.scheduler.add_job(
+                fire_reminder,
+                trigger=self._build_trigger(run_time, repeat_type, repeat_payload),
+                id=f"reminder_{reminder_id}",
+                args=[reminder_id, task, repeat_type],
+                jobstore=REMINDER_JOBSTORE,
+                replace_existing=True,
+                misfire_grace_time=60
+            )
+        logger.info(f"Scheduled {count} tasks in bulk")
+
+    def _dispatch(self, reminder_id, task, run_time, repeat_type, repeat_payload=None, priority=1, after=None):
+        """Hand a reminder to the dispatcher: at run_time, or at its recurrence's first occurrence from after (default now)."""
+        if repeat_type == 'once':
+            self.dispatcher.add(reminder_id, task, repeat_type, priority, run_time)
+            return
+        trigger = self._build_trigger(run_time, repeat_type, repeat_payload)
+        due = trigger.get_next_fire_time(None, after or self._now())
+        if due is None:
+            self.dispatcher.cancel(reminder_id)
+        else:
+            self.dispatcher.add(reminder_id, task, repeat_type, priority, due, trigger)
+
+    def _fire_batch(self, timers):
+        """Dispatcher callback: the reminders due in one tick, highest priority first."""
+        logger.info(f"🔔 TRIGGERED {len(timers)} reminders")
+        now = time.time()
+        for t in timers:
+            FIRE_LAG.observe(now - t.at)
+        # The writer keeps queue order, so higher priorities are stored and published first
+        for t in timers:
+            notification_writer.submit(t.reminder_id, f"🔔 Reminder: {t.task}", t.repeat_type == 'once')
+
     def _job_callback(self, reminder_id, task, repeat_type):
         logger.info(f"🔔 TRIGGERED: {task}")
-        db.add_notification(f"🔔 Reminder: {task}")
-        if repeat_type == 'once':
-            db.update_status(reminder_id, 'done')
+        # Written and published by the writer thread, batched with whatever
+        # else fires in the same few milliseconds
+        notification_writer.submit(reminder_id, f"🔔 Reminder: {task}", repeat_type == 'once')
+
+    def _record_fire_lag(self, event):
+        # Runs on the worker thread right after the job; the callback only queues a write
+        if event.job_id.startswith("reminder_"):
+            FIRE_LAG.observe(time.time() - event.scheduled_run_time.timestamp())
 
     def cancel_job(self, reminder_id):
+        if self.delegated:
+            db.enqueue_schedule_changes([reminder_id])
+            return
+        if self.dispatcher:
+            self.dispatcher.cancel(reminder_id)
+            return
         job_id = f"reminder_{reminder_id}"
         try:
             self.scheduler.remove_job(job_id)
         except Exception:
             pass
 
-    def load_jobs_from_db(self):
-        reminders = db.get_active_reminders()
+    def _now(self):
         # Ensure 'now' is timezone aware for comparison if using aware datetimes
-        if KOLKATA:
-            now = datetime.now(KOLKATA)
+        return datetime.now(KOLKATA) if KOLKATA else datetime.now()
+
+    def _localize(self, rt):
+        # If we are using timezone-aware scheduler, we must localize naive datetimes
+        if KOLKATA and rt.tzinfo is None:
+            rt = KOLKATA.localize(rt)
+        return rt
+
+    def load_jobs_from_db(self):
+        """Bring the persisted job store in line with the reminders table, then resume.
+
+        First boot (no watermark) builds the schedule from scratch. Later boots
+        only revisit rows changed since the last heartbeat, after catching up on
+        whatever came due while the process was down.
+        """
+        now = self._now()
+        reconciled_at = db.get_state('reconciled_at')
+
+        self._catch_up(now)
+        if self.dispatcher:
+            # The heap is not persisted: rebuild it every boot, and leave no
+            # watermark for a later APScheduler boot to trust its job store by
+            reconciled_at = None
+            db.delete_state('reconciled_at')
+        else:
+            db.delete_state('dispatched_at')
+
+        if reconciled_at is None:
+            self.jobstore.remove_all_jobs()
+            jobs = []
+            for r in db.get_recurring_reminders():
+                try:
+                    jobs.append((r.id, r.task, self._localize(r.run_time), r.repeat_type, r.repeat_payload, r.priority))
+                except Exception as e:
+                    logger.error(f"Failed to load job {r.id}: {e}")
+            if self.dispatcher:
+                after = self._dispatch_resume_time(now)
+                for job in jobs:
+                    self._dispatch(*job, after=after)
+            else:
+                self.schedule_reminders(jobs)
+            start = to_epoch(now)
+        else:
+            # Jobs up to the persisted horizon are already in the store
+            start = max(int(db.get_state('loaded_until') or 0), to_epoch(now))
+            self.loaded_until = start
+            self._reconcile(reconciled_at)
+
+        self._refill_horizon(start=start)
+        self.scheduler.add_job(
+            self._refill_horizon,
+            trigger=IntervalTrigger(seconds=HORIZON_REFILL_INTERVAL.total_seconds()),
+            id="horizon_refill_job",
+            replace_existing=True
+        )
+        self._heartbeat()
+        self.scheduler.add_job(
+            self._heartbeat,
+            trigger=IntervalTrigger(seconds=HEARTBEAT_INTERVAL.total_seconds()),
+            id="heartbeat_job",
+            replace_existing=True
+        )
+        # First pass soon after boot, so restarts more frequent than the interval still get one
+        self.scheduler.add_job(
+            self._apply_retention,
+            trigger=IntervalTrigger(seconds=RETENTION_INTERVAL.total_seconds()),
+            id="retention_job",
+            next_run_time=self._now() + timedelta(minutes=1),
+            replace_existing=True
+        )
+        if SCHEDULER_MODE == 'external':
+            # Changes API workers queued, including any made while no leader ran
+            self._drain_changes()
+            self.scheduler.add_job(
+                self._drain_changes,
+                trigger=IntervalTrigger(seconds=CHANGE_POLL_INTERVAL.total_seconds()),
+                id="change_queue_job",
+                replace_existing=True
+            )
+        self.scheduler.resume()
+        if self.dispatcher:
+            self.dispatcher.start()
+            logger.info(f"✅ Schedule loaded ({self.dispatcher.pending} reminders on the dispatcher heap).")
         else:
-            now = datetime.now()
-            
-        for r in reminders:
+            logger.info(f"✅ Schedule loaded ({self.jobstore.count_jobs()} persisted reminder jobs).")
+
+    def _catch_up(self, now):
+        """Deliver, in one transaction, reminders that came due while nothing was running."""
+        cutoff = now if CATCH_UP_MODE == 'skip' else now - CATCH_UP_MAX_AGE
+        expired = db.expire_missed_reminders(cutoff)
+        if expired:
+            logger.info(f"Marked {expired} long-missed one-off reminders as done")
+
+        fired = []
+        for r in db.get_missed_one_off_reminders(now):
+            fired.append((r.id, r.task, 'once'))
+            self.cancel_job(r.id)
+
+        # Recurring occurrences missed during downtime are still sitting in the
+        # job store with a past next_run_time
+        for job in self.jobstore.get_due_jobs(now):
+            reminder_id, task, repeat_type = job.args
+            if repeat_type == 'once':
+                continue
+            if job.next_run_time >= cutoff:
+                fired.append((reminder_id, task, repeat_type))
+            job._modify(next_run_time=job.trigger.get_next_fire_time(None, now))
+            self.jobstore.update_job(job)
+
+        if not fired:
+            return
+        messages = [f"🔔 Reminder: {task}" for _, task, _ in fired]
+        stored = db.record_fired([
+            (reminder_id, message, repeat_type == 'once')
+            for (reminder_id, _, repeat_type), message in zip(fired, messages)
+        ])
+        for (notification_id, user_id), message in zip(stored, messages):
+            notifier.publish({'id': notification_id, 'message': message}, user_id)
+        logger.info(f"🔔 Caught up on {len(fired)} reminders missed while offline")
+
+    def _dispatch_resume_time(self, now):
+        """Where recurring reminders resume on a heap boot: occurrences since then fire as missed.
+
+        The heartbeat stamps dispatched_at, so after a crash up to a
+        heartbeat's worth of recurring occurrences may fire again.
+        """
+        dispatched_at = db.get_state('dispatched_at')
+        if dispatched_at is None or CATCH_UP_MODE == 'skip':
+            return now
+        return max(datetime.fromtimestamp(int(dispatched_at), now.tzinfo), now - CATCH_UP_MAX_AGE)
+
+    def _reconcile(self, reconciled_at):
+        """Re-sync jobs for rows changed since the watermark."""
+        changed = db.get_reminders_updated_since(reconciled_at)
+        # The store only holds the horizon, so its ids are cheap to list
+        stored = {job.id for job in self.jobstore.get_all_jobs()}
+        self._sync_jobs(changed, stored)
+        logger.info(f"Reconciled {len(changed)} reminders changed since {reconciled_at}")
+
+    def _drain_changes(self):
+        """Apply the reminder changes API workers queued (SCHEDULER_MODE=external)."""
+        while True:
+            last_id, reminder_ids = db.get_schedule_changes(CHANGE_BATCH)
+            if not reminder_ids:
+                return
+            rows = db.get_reminders(reminder_ids)
+            self._sync_jobs(rows.values())
+            for reminder_id in reminder_ids:
+                if reminder_id not in rows:
+                    self.cancel_job(reminder_id)
+            # Acked only once applied: a crash in between replays the batch, which is idempotent
+            db.ack_schedule_changes(last_id)
+            logger.info(f"Applied {len(reminder_ids)} queued reminder changes")
+
+    def _sync_jobs(self, rows, stored=None):
+        """Schedule or cancel each row's job to match the row. stored (job ids), if known, skips needless cancels."""
+        jobs = []
+        stale = []
+        for r in rows:
             try:
-                rt = r['run_time']
-                if isinstance(rt, str):
-                    rt = datetime.strptime(rt.split('.')[0], '%Y-%m-%d %H:%M:%S')
-
-                # If we are using timezone-aware scheduler, we must localize our naive DB dates
-                if KOLKATA and rt.tzinfo is None:
-                    rt = KOLKATA.localize(rt)
-
-                if r['repeat_type'] == 'once' and rt < now:
-                    db.update_status(r['id'], 'done')
-                    continue
-                self.schedule_reminder(r['id'], r['task'], rt, r['repeat_type'])
+                due, repeat_type = r.run_time, r.repeat_type
+                if r.status == 'snoozed' and r.snooze_until:
+                    due, repeat_type = r.snooze_until, 'once'
+                wanted = r.status in ('active', 'snoozed') and (
+                    repeat_type != 'once' or to_epoch(due) < self.loaded_until
+                )
+                if wanted:
+                    jobs.append((r.id, r.task, self._localize(due), repeat_type, r.repeat_payload, r.priority))
+                elif stored is None or f"reminder_{r.id}" in stored:
+                    stale.append(r.id)
             except Exception as e:
-                logger.error(f"Failed to load job {r['id']}: {e}")
+                logger.error(f"Failed to reconcile job {r.id}: {e}")
+        self.schedule_reminders(jobs)
+        for reminder_id in stale:
+            self.cancel_job(reminder_id)
+
+    def _heartbeat(self):
+        if self.dispatcher:
+            db.set_state('dispatched_at', str(to_epoch(self._now())))
+            return
+        # Everything changed up to a minute ago is reflected in the job store;
+        # the margin covers a request that wrote the row but not yet the job.
+        db.stamp_state('reconciled_at', -60)
+
+    def _apply_retention(self):
+        """Archive old read notifications and finished reminders batch by batch, then shrink the file."""
+        started = time.perf_counter()
+        before = db.storage_stats()
+        notifications = reminders = 0
+        if RETENTION_NOTIFICATION_DAYS > 0:
+            bound = db.notification_archive_bound(RETENTION_NOTIFICATION_DAYS)
+            last = 0
+            while True:
+                last, moved = db.archive_notifications(last, bound, RETENTION_BATCH)
+                if last is None:
+                    break
+                notifications += moved
+                time.sleep(RETENTION_PAUSE)
+        if RETENTION_REMINDER_DAYS > 0:
+            while True:
+                moved = db.archive_reminders(RETENTION_REMINDER_DAYS, RETENTION_BATCH)
+                if not moved:
+                    break
+                reminders += moved
+                time.sleep(RETENTION_PAUSE)
+        ARCHIVED.labels("notifications").inc(notifications)
+        ARCHIVED.labels("reminders").inc(reminders)
+
+        if before['auto_vacuum'] != 2 and RETENTION_CONVERT_VACUUM:
+            logger.info("🧹 Converting the database to incremental auto_vacuum (full VACUUM)...")
+            db.enable_incremental_vacuum()
+        stats = db.storage_stats()
+        if stats['auto_vacuum'] == 2:
+            for _ in range(-(-stats['freelist_count'] // VACUUM_STEP)):
+                db.incremental_vacuum(VACUUM_STEP)
+                time.sleep(RETENTION_PAUSE)
+        elif stats['freelist_count']:
+            logger.warning(
+                f"⚠️  {stats['freelist_count']} free pages are reused but never returned: the database predates "
+                "incremental auto_vacuum (set RETENTION_CONVERT_VACUUM=1 to convert it)"
+            )
+        after = db.storage_stats()
+        reclaimed = max(0, (before['page_count'] - after['page_count']) * after['page_size'])
+        RECLAIMED.inc(reclaimed)
+        logger.info(
+            f"🧹 Retention archived {notifications} notifications and {reminders} reminders, "
+            f"reclaimed {reclaimed / 2**20:.1f} MB (file {before['page_count'] * before['page_size'] / 2**20:.1f} → "
+            f"{after['page_count'] * after['page_size'] / 2**20:.1f} MB) in {time.perf_counter() - started:.1f}s"
+        )
+
+    def _refill_horizon(self, start=None):
+        """Materialize one-off reminders that entered the window since the last refill."""
+        with self._horizon_lock:
+            start = start or self.loaded_until
+            end_time = self._now() + SCHEDULE_HORIZON
+            end = to_epoch(end_time)
+            jobs = []
+            for r in db.get_one_off_reminders_due(start, end):
+                try:
+                    rt = r.snooze_until if r.status == 'snoozed' else r.run_time
+                    jobs.append((r.id, r.task, self._localize(rt), 'once', None, r.priority))
+                except Exception as e:
+                    logger.error(f"Failed to load job {r.id}: {e}")
+            self.schedule_reminders(jobs)
+            self.loaded_until = end
+            db.set_state('loaded_until', str(end))
+        logger.info(f"Schedule horizon now extends to {end_time:%Y-%m-%d %H:%M:%S}")
 
 scheduler = SchedulerManager()
@@ -0,0 +1,81 @@
+"""Scheduler process for SCHEDULER_MODE=external.
+
+Run one or more next to the API workers (python scheduler_service.py from
+the backend directory). They elect a leader through a lease row in the
+shared database: the holder runs the scheduler and drains the change queue
+the API workers fill, the rest stand by and take over once its lease
+expires. A leader that cannot renew in time stops firing and exits.
+
+That holds as long as the leader keeps running to schedule: one stalled
+past its lease (a paused VM, a stuck write) may still fire whatever came
+due before it wakes up and sees the lease gone, while the new leader fires
+the same reminders. Keep SCHEDULER_LEASE_SECONDS well above any pause you
+expect.
+"""
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from database import db
+from scheduler import scheduler, SCHEDULER_MODE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("scheduler_service")
+
+LEASE_NAME = 'scheduler'
+# A standby takes over at most this long after the leader stops renewing
+LEASE_TTL_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "30"))
+# Renewals per lease period, so a slow write or two never loses the lease
+RENEW_INTERVAL = LEASE_TTL_SECONDS / 3
+
+def run(stop):
+    """Campaign for the lease, then lead until stop is set or the lease is lost.
+
+    Returns True on a clean stop, False if leadership was lost.
+    """
+    holder = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"🗳️  {holder} waiting for the scheduler lease...")
+    while not db.acquire_lease(LEASE_NAME, holder, LEASE_TTL_SECONDS):
+        if stop.wait(RENEW_INTERVAL):
+            return True
+
+    logger.info(f"👑 {holder} is the scheduler leader")
+    # This process does the scheduling the API workers hand off
+    scheduler.delegated = False
+    scheduler.start()
+    scheduler.load_jobs_from_db()
+    kept = True
+    expires = time.monotonic() + LEASE_TTL_SECONDS
+    try:
+        while not stop.wait(RENEW_INTERVAL):
+            try:
+                kept = db.acquire_lease(LEASE_NAME, holder, LEASE_TTL_SECONDS)
+                expires = time.monotonic() + LEASE_TTL_SECONDS
+            except Exception as e:
+                # Keep leading while the lease we hold is still good for another round
+                logger.warning(f"Lease renewal failed: {e}")
+                kept = time.monotonic() + RENEW_INTERVAL < expires
+            if not kept:
+                logger.error("❌ Lost the scheduler lease, stopping")
+                break
+    finally:
+        scheduler.shutdown()
+        if kept:
+            # Hand over now rather than after the lease times out
+            db.release_lease(LEASE_NAME, holder)
+    return kept
+
+def main():
+    if SCHEDULER_MODE != 'external':
+        logger.warning("⚠️  SCHEDULER_MODE is not 'external': API workers also run a scheduler and reminders fire twice.")
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    # A deposed leader exits non-zero; its supervisor restarts it as a standby
+    sys.exit(0 if run(stop) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import json
+from dataclasses import is_dataclass
+from datetime import datetime
+from fastapi.responses import Response
+
+# orjson serializes slotted dataclasses and datetimes natively, several times
+# faster than json plus FastAPI's jsonable_encoder; stdlib json is the fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if is_dataclass(obj):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(payload):
+    """Compact JSON bytes; Reminder records serialize as objects, datetimes as ISO 8601."""
+    if orjson:
+        return orjson.dumps(payload)
+    return json.dumps(payload, default=_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+def json_response(payload, status_code=200, headers=None):
+    """Pre-serialized response, skipping FastAPI's per-field validation and encoding."""
+    return Response(content=dumps(payload), status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# Tests import the backend modules directly, against a scratch database:
+# DB_PATH has to be set before anything imports database and opens it
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "tests.db")
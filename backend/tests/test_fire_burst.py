@@ -0,0 +1,68 @@
+"""10k reminders firing at once go through the batched notification writer.
+
+The scheduler callback is called from a pool the size of APScheduler's
+default executor, as at a 9:00 pile-up. Every reminder must produce exactly
+one notification, every one-off must end up done, and the writes must
+stay batched.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from database import db
+from notification_writer import notification_writer, MAX_BATCH
+from scheduler import scheduler
+
+TRIGGERS = 10_000
+WORKERS = 10  # APScheduler's default thread pool
+# Full batches would take TRIGGERS / MAX_BATCH; leave room for partial ones
+MAX_TRANSACTIONS = TRIGGERS // 20
+
+
+@pytest.fixture(scope="module")
+def burst():
+    user_id = db.get_user_id("burst")
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    ids = db.add_reminders([{'task': f"burst {i}", 'run_time': now} for i in range(TRIGGERS)], user_id)
+
+    # Each record_fired call is one write transaction
+    transactions = []
+    record_fired = db.record_fired
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(db, "record_fired", lambda fired: transactions.append(len(fired)) or record_fired(fired))
+        notification_writer.start()
+        try:
+            with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+                for i, reminder_id in enumerate(ids):
+                    pool.submit(scheduler._job_callback, reminder_id, f"burst {i}", 'once')
+            notification_writer.flush()
+        finally:
+            notification_writer.stop()
+    return user_id, ids, transactions
+
+
+def test_every_reminder_fires_once(burst):
+    user_id, _, _ = burst
+    conn = db._get_conn()
+    counts = conn.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT message) FROM notifications WHERE user_id = ?", (user_id,)
+    ).fetchone()
+    assert counts == (TRIGGERS, TRIGGERS)
+    messages = {m for (m,) in conn.execute("SELECT message FROM notifications WHERE user_id = ?", (user_id,))}
+    assert messages == {f"🔔 Reminder: burst {i}" for i in range(TRIGGERS)}
+
+
+def test_one_offs_end_up_done(burst):
+    user_id, _, _ = burst
+    statuses = dict(db._get_conn().execute(
+        "SELECT status, COUNT(*) FROM reminders WHERE user_id = ? GROUP BY status", (user_id,)
+    ).fetchall())
+    assert statuses == {'done': TRIGGERS}
+
+
+def test_writes_are_batched(burst):
+    _, _, transactions = burst
+    assert sum(transactions) == TRIGGERS
+    assert max(transactions) <= MAX_BATCH
+    assert len(transactions) <= MAX_TRANSACTIONS, f"{len(transactions)} transactions for {TRIGGERS} reminders"
@@ -0,0 +1,47 @@
+"""Only endpoints that store new reminders create the user a request names."""
+import asyncio
+
+import httpx
+
+from api import app
+from database import db
+
+
+def request(method, path, user, **kwargs):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(method, path, headers={"X-User": user}, **kwargs)
+    return asyncio.run(send())
+
+
+def user_count():
+    return db._get_conn().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+
+def test_chat_does_not_create_users():
+    before = user_count()
+    response = request("POST", "/chat", "chat-stranger", json={"message": "ok"})
+    assert response.status_code == 404
+    assert user_count() == before
+    assert db.find_user_id("chat-stranger") is None
+
+
+def test_reads_do_not_create_users():
+    before = user_count()
+    for path in ("/tasks/timeline", "/notifications"):
+        assert request("GET", path, "read-stranger").status_code == 404
+    assert user_count() == before
+
+
+def test_known_user_can_chat():
+    request("POST", "/users", "chatter")
+    response = request("POST", "/chat", "chatter", json={"message": "ok"})
+    assert response.status_code == 200
+    assert response.json()["message"] == "👍 Notifications silenced."
+
+
+def test_creating_a_task_creates_the_user():
+    response = request("POST", "/tasks", "creator", json={"task": "water the plants", "run_time": "2030-01-01T10:00:00Z"})
+    assert response.status_code == 200
+    assert db.find_user_id("creator") is not None
@@ -0,0 +1,89 @@
+"""Hot Database queries must not fall back to a full table scan or miss their index.
+
+Each method runs against a scratch database (see conftest.py) with sqlite3's
+trace callback attached; every SELECT/UPDATE it issues is then re-run under
+EXPLAIN QUERY PLAN.
+
+Run from the backend directory:  python -m pytest
+"""
+import pytest
+
+from database import db, DEFAULT_USER_ID as USER
+from database.times import to_epoch
+
+HOT_QUERIES = {
+    "get_active_reminders": lambda: db.get_active_reminders(),
+    "get_active_reminders (user)": lambda: db.get_active_reminders(USER),
+    "get_overdue_reminders": lambda: db.get_overdue_reminders(),
+    "get_reminders_by_date_range": lambda: db.get_reminders_by_date_range(
+        USER, "2030-01-01 00:00:00", "2030-02-01 00:00:00"
+    ),
+    "get_reminder (owned)": lambda: db.get_reminder(1, USER),
+    "get_unread_notifications": lambda: db.get_unread_notifications(USER),
+    "get_notifications_after": lambda: db.get_notifications_after(USER, 0),
+    "mark_notifications_read": lambda: db.mark_notifications_read(USER, [1], from_id=1, to_id=10),
+    "mark_all_notifications_read": lambda: db.mark_all_notifications_read(USER),
+    "get_recurring_reminders (user)": lambda: db.get_recurring_reminders(USER),
+    "get_recurring_reminders (all)": lambda: db.get_recurring_reminders(),
+    "get_one_off_reminders_due": lambda: db.get_one_off_reminders_due(
+        "2030-01-01 00:00:00", "2030-01-01 01:00:00"
+    ),
+    "expire_missed_reminders": lambda: db.expire_missed_reminders("2020-01-01 00:00:00"),
+    "get_data_version": lambda: db.get_data_version(USER),
+    "get_timeline": lambda: db.get_timeline(
+        USER, "2030-01-15 12:00:00", "2030-01-16 00:00:00", 50,
+        cursors={"past": (to_epoch("2030-01-15 10:00:00"), 9), "upcoming": (to_epoch("2030-01-20 00:00:00"), 9)},
+    ),
+    "count_timeline": lambda: db.count_timeline(USER, "2030-01-15 12:00:00", "2030-01-16 00:00:00"),
+    "archive_notifications": lambda: db.archive_notifications(0, 10),
+    "archive_reminders": lambda: db.archive_reminders(90),
+}
+
+# Queries that have a usable but worse index to fall back on
+EXPECTED_INDEXES = {
+    # idx_notifications_user_id also matches, but walks the user's read rows too
+    "get_unread_notifications": "idx_notifications_user_unread",
+    "mark_all_notifications_read": "idx_notifications_user_unread",
+    # idx_reminders_updated_at also matches, but walks active and snoozed rows too
+    "archive_reminders": "idx_reminders_finished",
+}
+
+
+def traced_statements(call):
+    conn = db._get_conn()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+    return [s for s in statements if s.lstrip().upper().startswith(("SELECT", "UPDATE"))]
+
+
+def plan(sql):
+    rows = db._get_conn().execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [r[3] for r in rows]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded():
+    # A few rows so ANALYZE-free planning still sees real tables
+    db.add_reminder("seed", "2030-01-15 09:00:00")
+    db.add_notification("seed")
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_query_uses_index(name):
+    statements = traced_statements(HOT_QUERIES[name])
+    assert statements, f"{name} issued no SELECT/UPDATE"
+    for sql in statements:
+        details = plan(sql)
+        # Scanning a subquery's co-routine output or a constant row is not a table scan
+        scans = [
+            d for d in details
+            if d.startswith("SCAN") and "USING" not in d and not d.startswith(("SCAN (", "SCAN CONSTANT ROW"))
+        ]
+        assert not scans, f"{name} scans a table: {' | '.join(details)}\n{sql}"
+        expected = EXPECTED_INDEXES.get(name)
+        if expected:
+            assert any(expected in d for d in details), f"{name} does not use {expected}: {' | '.join(details)}"
@@ -0,0 +1,170 @@
+"""Recurrence agrees with dateutil.rrule, RecurrenceTrigger fires on it,
+completing an occurrence reports the next one, and the parser's fast path
+agrees with dateparser on the forms it handles.
+
+Run from the backend directory:  python -m pytest
+"""
+from datetime import datetime, timedelta, timezone
+
+import asyncio
+
+import httpx
+import pytest
+from dateutil import rrule as du
+
+from api import app
+from database import db
+from database.times import KOLKATA
+from parser import ReminderParser
+from recurrence import Recurrence, from_rrule
+from scheduler import RecurrenceTrigger
+
+START = datetime(2024, 1, 31, 9, 30)
+
+# (Recurrence kwargs, equivalent dateutil rrule kwargs)
+RULES = {
+    "daily": ({'freq': 'daily'}, {'freq': du.DAILY}),
+    "every 3 days": ({'freq': 'daily', 'interval': 3}, {'freq': du.DAILY, 'interval': 3}),
+    "weekly": ({'freq': 'weekly'}, {'freq': du.WEEKLY}),
+    "weekly BYDAY": ({'freq': 'weekly', 'weekdays': [0, 2, 4]}, {'freq': du.WEEKLY, 'byweekday': (du.MO, du.WE, du.FR)}),
+    "fortnightly BYDAY": (
+        {'freq': 'weekly', 'interval': 2, 'weekdays': [1, 6]},
+        {'freq': du.WEEKLY, 'interval': 2, 'byweekday': (du.TU, du.SU), 'wkst': du.MO},
+    ),
+    # Starts on the 31st, so short months are skipped
+    "monthly": ({'freq': 'monthly'}, {'freq': du.MONTHLY}),
+    "monthly BYMONTHDAY": (
+        {'freq': 'monthly', 'month_days': [1, 15, -1]}, {'freq': du.MONTHLY, 'bymonthday': (1, 15, -1)},
+    ),
+    "quarterly on the 29th": (
+        {'freq': 'monthly', 'interval': 3, 'month_days': [29]}, {'freq': du.MONTHLY, 'interval': 3, 'bymonthday': 29},
+    ),
+    "daily until": (
+        {'freq': 'daily', 'until': datetime(2024, 2, 10, 9, 30)}, {'freq': du.DAILY, 'until': datetime(2024, 2, 10, 9, 30)},
+    ),
+    "weekly BYDAY count": (
+        {'freq': 'weekly', 'weekdays': [0, 3], 'count': 7}, {'freq': du.WEEKLY, 'byweekday': (du.MO, du.TH), 'count': 7},
+    ),
+    "monthly count": ({'freq': 'monthly', 'month_days': [-1], 'count': 14}, {'freq': du.MONTHLY, 'bymonthday': -1, 'count': 14}),
+}
+
+
+LIMIT = 200
+
+
+@pytest.mark.parametrize("ours, theirs", RULES.values(), ids=RULES.keys())
+def test_series_matches_rrule(ours, theirs):
+    rule = Recurrence(start=START, **ours)
+    want = list(du.rrule(dtstart=START, **theirs)[:LIMIT + 1])
+    ended = len(want) <= LIMIT
+    want = want[:LIMIT]
+    assert list(rule.between(START, want[-1] + timedelta(seconds=1))) == want
+    if ended:
+        assert rule.next_after(want[-1]) is None
+
+
+@pytest.mark.parametrize("ours, theirs", RULES.values(), ids=RULES.keys())
+def test_next_after_matches_rrule(ours, theirs):
+    rule = Recurrence(start=START, **ours)
+    series = du.rrule(dtstart=START, **theirs)
+    # Before the start, on an occurrence, between occurrences and years later
+    for t in (START - timedelta(days=3), START, START + timedelta(hours=1), START + timedelta(days=17, seconds=1),
+              datetime(2025, 2, 28, 23, 59, 59), datetime(2031, 6, 1)):
+        assert rule.next_after(t) == series.after(t), t
+
+
+def test_from_rrule_matches_rrule():
+    value = "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR;UNTIL=20240601"
+    rule = from_rrule(value, START)
+    want = list(du.rrulestr(value, dtstart=START, ignoretz=True))
+    # A date-only UNTIL covers the whole day
+    assert list(rule.between(START, datetime(2024, 6, 2))) == want
+
+
+def test_trigger_fires_on_occurrences():
+    rule = Recurrence('weekly', START, weekdays=[0, 2])
+    trigger = RecurrenceTrigger(rule, KOLKATA)
+    now = KOLKATA.localize(datetime(2024, 3, 6, 10, 0))  # Wednesday, after 9:30
+
+    first = trigger.get_next_fire_time(None, now)
+    assert first == KOLKATA.localize(datetime(2024, 3, 11, 9, 30))
+    assert first.utcoffset() == timedelta(hours=5, minutes=30)
+    assert trigger.get_next_fire_time(first, first) == KOLKATA.localize(datetime(2024, 3, 13, 9, 30))
+
+
+def test_trigger_reads_times_in_its_timezone():
+    trigger = RecurrenceTrigger(Recurrence('daily', START), KOLKATA)
+    # 04:00 UTC is 09:30 in Kolkata: that occurrence is the one just fired
+    fired = KOLKATA.localize(datetime(2024, 3, 6, 9, 30))
+    assert trigger.get_next_fire_time(fired.astimezone(timezone.utc), fired) == KOLKATA.localize(datetime(2024, 3, 7, 9, 30))
+
+
+def test_trigger_respects_not_before():
+    rule = Recurrence('daily', START)
+    # Completed early: the pending occurrence moved to the 8th
+    trigger = RecurrenceTrigger(rule, KOLKATA, not_before=datetime(2024, 3, 8, 9, 30))
+    now = KOLKATA.localize(datetime(2024, 3, 6, 8, 0))
+    assert trigger.get_next_fire_time(None, now) == KOLKATA.localize(datetime(2024, 3, 8, 9, 30))
+
+
+def test_trigger_stops_when_series_ends():
+    trigger = RecurrenceTrigger(Recurrence('daily', START, count=3), KOLKATA)
+    last = KOLKATA.localize(datetime(2024, 2, 2, 9, 30))
+    assert trigger.get_next_fire_time(last, last) is None
+    assert trigger.get_next_fire_time(None, last + timedelta(minutes=1)) is None
+
+
+def test_completing_an_occurrence_returns_the_next_one_with_its_offset():
+    user_id = db.get_user_id("completer")
+    start = datetime(2024, 1, 1, 9, 30)
+    reminder_id = db.add_reminder("water plants", start, 'daily', user_id=user_id)
+
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(f"/tasks/{reminder_id}/complete", headers={"X-User": "completer"})
+    body = asyncio.run(send()).json()
+
+    assert body["status"] == "next_scheduled"
+    next_run = datetime.fromisoformat(body["next_run"])
+    assert body["next_run"].endswith("+05:30")
+    assert next_run > datetime.now(KOLKATA)
+    assert (next_run.hour, next_run.minute) == (9, 30)
+    assert db.get_reminder(reminder_id, user_id).run_time == next_run
+
+
+# Messages the fast path handles, relative to BASE
+FAST_PATH_MESSAGES = [
+    "remind me to call mom in 20 minutes",
+    "stretch in an hour",
+    "submit report in 90 mins",
+    "pay rent in 3 days",
+    "review in 2 weeks",
+    "call bob at 5pm",
+    "tea at 12pm",
+    "standup at 10:15",
+    "at 7:30 am today water plants",
+    "water plants at 9 pm tomorrow",
+    "backup weekly at 23:00",
+]
+BASE = "2026-03-10T14:30:15"
+
+
+@pytest.fixture(scope="module")
+def parsers():
+    fast, slow = ReminderParser(), ReminderParser()
+    slow.use_fast_path = False
+    return fast, slow
+
+
+@pytest.mark.parametrize("message", FAST_PATH_MESSAGES)
+def test_fast_path_matches_dateparser(parsers, message):
+    fast, slow = parsers
+    assert fast._fast_parse(message, datetime.fromisoformat(BASE), False) is not None
+    assert fast.parse(message, BASE) == slow.parse(message, BASE)
+
+
+@pytest.mark.parametrize("message", ["dentist on friday at 4pm", "next week plan the sprint", "at 5 call"])
+def test_fast_path_defers_to_dateparser(parsers, message):
+    fast, _ = parsers
+    assert fast._fast_parse(message, datetime.fromisoformat(BASE), False) is None
@@ -0,0 +1,77 @@
+"""reminder_cache serves the same timeline as Database.get_timeline / count_timeline.
+
+Each API-style write is followed by wrote(), which patches the cached slice
+in place; after every step verify() must find no disagreement with the
+table and the cached pages must equal the SQL ones.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from database import db
+from database.times import KOLKATA
+from reminder_cache import ActiveReminderCache
+
+PAGE = 3
+
+
+@pytest.fixture
+def setup():
+    user_id = db.get_user_id("cached")
+    now = datetime.now(KOLKATA).replace(microsecond=0)
+    today_end = now.replace(hour=0, minute=0, second=0) + timedelta(days=1)
+    offsets = (-48, -3, -1, 0.5, 2, 30, 50, 100)
+    ids = db.add_reminders([{'task': f"t{h}", 'run_time': now + timedelta(hours=h)} for h in offsets], user_id)
+    cache = ActiveReminderCache()
+    return cache, user_id, now, today_end, ids
+
+
+def assert_consistent(cache, user_id, now, today_end):
+    pages, counts = cache.timeline(user_id, now, today_end, PAGE)
+    assert cache.verify(user_id) == []
+    assert pages == db.get_timeline(user_id, now, today_end, PAGE)
+    assert counts == db.count_timeline(user_id, now, today_end)
+
+
+def test_write_through_matches_sql(setup):
+    cache, user_id, now, today_end, ids = setup
+    assert_consistent(cache, user_id, now, today_end)
+
+    db.complete_reminder(ids[1], user_id)
+    cache.wrote(user_id, [ids[1]])
+    assert_consistent(cache, user_id, now, today_end)
+
+    db.snooze_reminder(ids[0], now + timedelta(minutes=10), user_id=user_id)
+    cache.wrote(user_id, [ids[0]])
+    assert_consistent(cache, user_id, now, today_end)
+
+    db.update_reminder_time(ids[5], now + timedelta(hours=1), user_id)
+    cache.wrote(user_id, [ids[5]])
+    assert_consistent(cache, user_id, now, today_end)
+
+    added = db.add_reminders([{'task': "late", 'run_time': now + timedelta(hours=5)}], user_id)
+    cache.wrote(user_id, added)
+    assert_consistent(cache, user_id, now, today_end)
+
+    db.delete_reminder(ids[7], user_id)
+    cache.wrote(user_id, [ids[7]])
+    assert_consistent(cache, user_id, now, today_end)
+    assert cache.invalidations == 0
+
+
+def test_writes_from_elsewhere_reload(setup):
+    cache, user_id, now, today_end, ids = setup
+    cache.timeline(user_id, now, today_end, PAGE)
+
+    # Another process: no wrote(), so the slice no longer matches the version
+    db.complete_reminder(ids[3], user_id)
+    assert cache.verify(user_id) is None
+    assert_consistent(cache, user_id, now, today_end)
+
+    # Our write plus someone else's: wrote() drops the slice instead of patching it
+    db.complete_reminder(ids[4], user_id)
+    db.complete_reminder(ids[6], user_id)
+    cache.wrote(user_id, [ids[4]])
+    assert user_id not in cache
+    assert cache.invalidations == 1
+    assert_consistent(cache, user_id, now, today_end)
@@ -10,7 +10,18 @@ const api = axios.create({
     },
 });
 
+// The backend scopes reminders and notifications to the user named here
+const currentUser = () => localStorage.getItem('user') || 'default';
+
+api.interceptors.request.use((config) => {
+    config.headers['X-User'] = currentUser();
+    return config;
+});
+
 export const assistantApi = {
+    // Reads 404 for a user the backend has never seen, so login registers the name first
+    registerUser: () => api.post('/users'),
+
     // Chat & AI
     chat: (message, preview = false) => api.post('/chat', {
         message,
@@ -20,7 +31,8 @@ export const assistantApi = {
 
     // Task Management
     createTask: (data) => api.post('/tasks', data),
-    getTimeline: () => api.get('/tasks/timeline'),
+    // Without params: first page of every bucket. With { group, cursor }: the next page of one bucket.
+    getTimeline: (params = {}) => api.get('/tasks/timeline', { params }),
     getCalendar: (month, year) => api.get(`/tasks/calendar?month=${month}&year=${year}`),
     updateTask: (id, data) => api.put(`/tasks/${id}`, data),
     deleteTask: (id) => api.delete(`/tasks/${id}`),
@@ -30,8 +42,11 @@ export const assistantApi = {
     snoozeTask: (id, minutes = 10) => api.post(`/tasks/${id}/snooze`, null, { params: { minutes } }),
 
     // Notifications & System
-    getNotifications: () => api.get('/notifications'),
+    getNotifications: (sinceId = 0, limit = 100) => api.get('/notifications', { params: { since_id: sinceId, limit } }),
+    // EventSource cannot set headers, so the stream names the user in the query
+    notificationStreamUrl: () => `${API_BASE_URL}/notifications/stream?user=${encodeURIComponent(currentUser())}`,
     markRead: (id) => api.post(`/notifications/${id}/read`),
+    markReadBulk: (ids) => api.post('/notifications/read', { ids }),
     checkHealth: () => api.get('/health'),
 };
 
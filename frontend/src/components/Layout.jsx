@@ -98,6 +98,7 @@ const Layout = ({ children }) => {
 
     const handleLogout = () => {
         localStorage.removeItem('isLoggedIn');
+        localStorage.removeItem('user');
         navigate('/login');
     };
 
@@ -1,5 +1,6 @@
 import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
+import assistantApi from '../api/assistantApi';
 import { Lock, User, ArrowRight } from 'lucide-react';
 
 const LoginForm = () => {
@@ -12,7 +13,9 @@ const LoginForm = () => {
         e.preventDefault();
         if (username === 'medisure' && password === 'medisure@2026') {
             localStorage.setItem('isLoggedIn', 'true');
-            navigate('/home');
+            // Sent as X-User on every API call; the backend scopes all data by it
+            localStorage.setItem('user', username);
+            assistantApi.registerUser().finally(() => navigate('/home'));
         } else {
             setError('Invalid credentials for Medisure Node');
         }
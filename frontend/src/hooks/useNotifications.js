@@ -3,8 +3,10 @@ import assistantApi from '../api/assistantApi';
 import useReminderStore from '../store/reminderStore';
 import voiceOutput from '../utils/voiceOutput';
 
+const POLL_INTERVAL_MS = 2000;
+
 const useNotifications = () => {
-    const { setNotifications, setReminders } = useReminderStore();
+    const { setNotifications } = useReminderStore();
     const permissionRequested = useRef(false);
 
     const requestPermission = async () => {
@@ -44,27 +46,25 @@ const useNotifications = () => {
         }
     };
 
-    const syncSystem = async () => {
-        try {
-            const [remindersRes, notifsRes] = await Promise.all([
-                assistantApi.getReminders(),
-                assistantApi.getNotifications()
-            ]);
+    const deliver = (unread) => {
+        if (unread.length === 0) return;
+        setNotifications(unread);
+        unread.forEach(showNotification);
+        setTimeout(() => setNotifications([]), 8000);
+    };
 
-            setReminders(remindersRes.data);
+    // Fallback when EventSource is unavailable or the stream keeps failing
+    const pollNotifications = async () => {
+        try {
+            const notifsRes = await assistantApi.getNotifications();
             const unread = notifsRes.data || [];
-
+            deliver(unread);
             if (unread.length > 0) {
-                setNotifications(unread);
-                for (const notif of unread) {
-                    showNotification(notif);
-                    try {
-                        await assistantApi.markRead(notif.id);
-                    } catch (err) {
-                        console.error("Failed to mark read:", err);
-                    }
+                try {
+                    await assistantApi.markReadBulk(unread.map((n) => n.id));
+                } catch (err) {
+                    console.error("Failed to mark read:", err);
                 }
-                setTimeout(() => setNotifications([]), 8000);
             }
         } catch (error) {
             console.error("Sync error:", error);
@@ -72,9 +72,40 @@ const useNotifications = () => {
     };
 
     useEffect(() => {
-        syncSystem();
-        const interval = setInterval(syncSystem, 2000);
-        return () => clearInterval(interval);
+        let pollTimer = null;
+        let source = null;
+
+        const startPolling = () => {
+            if (pollTimer) return;
+            pollNotifications();
+            pollTimer = setInterval(pollNotifications, POLL_INTERVAL_MS);
+        };
+
+        if (typeof EventSource === 'undefined') {
+            startPolling();
+        } else {
+            // The server marks streamed notifications read on delivery and the
+            // browser resumes with Last-Event-ID after a dropped connection.
+            source = new EventSource(assistantApi.notificationStreamUrl());
+            source.onmessage = (event) => {
+                try {
+                    deliver([JSON.parse(event.data)]);
+                } catch (err) {
+                    console.error("Bad notification event:", err);
+                }
+            };
+            source.onerror = () => {
+                // CLOSED means the browser gave up reconnecting
+                if (source.readyState === EventSource.CLOSED) {
+                    startPolling();
+                }
+            };
+        }
+
+        return () => {
+            if (source) source.close();
+            if (pollTimer) clearInterval(pollTimer);
+        };
     }, []);
 
     return {
@@ -1,20 +1,31 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { motion } from 'framer-motion';
 import { assistantApi } from '../api/assistantApi';
-import { format, startOfMonth, endOfMonth, eachDayOfInterval, isSameMonth, isSameDay, addMonths, subMonths, parseISO, startOfWeek, endOfWeek } from 'date-fns';
+import { format, startOfMonth, endOfMonth, eachDayOfInterval, isSameMonth, isSameDay, addMonths, subMonths, startOfWeek, endOfWeek } from 'date-fns';
 import { ChevronLeft, ChevronRight, Plus } from 'lucide-react';
 
 const Calendar = () => {
     const [currentDate, setCurrentDate] = useState(new Date());
-    const [tasks, setTasks] = useState([]);
+    // { 'yyyy-MM-dd': [{ id, task, time, repeat_type, status, priority }] }
+    const [days, setDays] = useState({});
     const [selectedDate, setSelectedDate] = useState(new Date());
+    // Months already seen, shown instantly while the browser revalidates (ETag/304)
+    const monthCache = useRef(new Map());
+    const shownMonth = useRef(null);
 
     const fetchTasks = async (date) => {
         const month = date.getMonth() + 1;
         const year = date.getFullYear();
+        const key = `${year}-${month}`;
+        shownMonth.current = key;
+        setDays(monthCache.current.get(key) || {});
         try {
             const res = await assistantApi.getCalendar(month, year);
-            setTasks(res.data);
+            monthCache.current.set(key, res.data.days);
+            // Ignore a late response for a month the user has already left
+            if (shownMonth.current === key) {
+                setDays(res.data.days);
+            }
         } catch (e) {
             console.error(e);
         }
@@ -35,9 +46,7 @@ const Calendar = () => {
 
     const calendarDays = eachDayOfInterval({ start: startDate, end: endDate });
 
-    const getTasksForDay = (day) => {
-        return tasks.filter(task => isSameDay(parseISO(task.run_time), day));
-    };
+    const getTasksForDay = (day) => days[format(day, 'yyyy-MM-dd')] || [];
 
     return (
         <div className="p-6 max-w-5xl mx-auto pb-24 h-screen flex flex-col">
@@ -93,7 +102,7 @@ const Calendar = () => {
 
                             <div className="flex flex-col gap-1 overflow-y-auto max-h-[80px] scrollbar-thin">
                                 {dayTasks.slice(0, 3).map(task => (
-                                    <div key={task.id} className="text-[10px] px-1.5 py-0.5 rounded bg-blue-500/20 text-blue-200 truncate border-l-2 border-blue-400">
+                                    <div key={`${task.id}-${task.time}`} className="text-[10px] px-1.5 py-0.5 rounded bg-blue-500/20 text-blue-200 truncate border-l-2 border-blue-400">
                                         {task.task}
                                     </div>
                                 ))}
@@ -28,6 +28,7 @@ const Home = () => {
 
     const handleLogout = () => {
         localStorage.removeItem('isLoggedIn');
+        localStorage.removeItem('user');
         window.location.href = '/login';
     };
 
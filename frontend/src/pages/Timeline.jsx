@@ -4,9 +4,7 @@ import { assistantApi } from '../api/assistantApi';
 import { format, isToday, isPast, isTomorrow, parseISO } from 'date-fns';
 import { CheckCircle2, Clock, Calendar as CalIcon, AlertCircle, Trash2 } from 'lucide-react';
 
-const TaskItem = ({ task, onComplete, onDelete }) => {
-    const isOverdue = task.group === 'past';
-
+const TaskItem = ({ task, isOverdue, onComplete, onDelete }) => {
     return (
         <motion.div
             layout
@@ -57,11 +55,11 @@ const TaskItem = ({ task, onComplete, onDelete }) => {
     );
 };
 
-const SectionData = ({ title, tasks, icon: Icon, onComplete, onDelete, color }) => (
+const SectionData = ({ title, tasks, total, hasMore, onLoadMore, overdue, icon: Icon, onComplete, onDelete, color }) => (
     <div className="mb-8">
         <h3 className={`text-xl font-bold mb-4 flex items-center gap-2 ${color}`}>
             <Icon size={20} />
-            {title} ({tasks.length})
+            {title} ({total ?? tasks.length})
         </h3>
         <div className="space-y-2">
             <AnimatePresence>
@@ -75,16 +73,24 @@ const SectionData = ({ title, tasks, icon: Icon, onComplete, onDelete, color })
                     </motion.div>
                 ) : (
                     tasks.map(task => (
-                        <TaskItem key={task.id} task={task} onComplete={onComplete} onDelete={onDelete} />
+                        <TaskItem key={task.id} task={task} isOverdue={overdue} onComplete={onComplete} onDelete={onDelete} />
                     ))
                 )}
             </AnimatePresence>
+            {hasMore && (
+                <button
+                    onClick={onLoadMore}
+                    className="w-full py-2 rounded-xl bg-white/5 hover:bg-white/10 text-white/50 text-sm transition"
+                >
+                    Load more
+                </button>
+            )}
         </div>
     </div>
 );
 
 const Timeline = () => {
-    const [data, setData] = useState({ past: [], today: [], upcoming: [] });
+    const [data, setData] = useState({ past: [], today: [], upcoming: [], counts: {}, next: {} });
     const [loading, setLoading] = useState(true);
 
     const fetchData = async () => {
@@ -105,6 +111,19 @@ const Timeline = () => {
         return () => clearInterval(interval);
     }, []);
 
+    const loadMore = async (group) => {
+        try {
+            const res = await assistantApi.getTimeline({ group, cursor: data.next[group] });
+            setData(prev => ({
+                ...prev,
+                [group]: [...prev[group], ...res.data[group]],
+                next: { ...prev.next, [group]: res.data.next[group] },
+            }));
+        } catch (e) {
+            console.error("Failed to load more", e);
+        }
+    };
+
     const handleComplete = async (id) => {
         // Optimistic update
         // We'll just refreshing data for simplicity in MVP, or complex filtering locally.
@@ -137,6 +156,10 @@ const Timeline = () => {
                         <SectionData
                             title="Overdue & Past"
                             tasks={data.past}
+                            total={data.counts.past}
+                            hasMore={Boolean(data.next.past)}
+                            onLoadMore={() => loadMore('past')}
+                            overdue
                             icon={AlertCircle}
                             color="text-red-400"
                             onComplete={handleComplete}
@@ -147,6 +170,9 @@ const Timeline = () => {
                     <SectionData
                         title="Today"
                         tasks={data.today}
+                        total={data.counts.today}
+                        hasMore={Boolean(data.next.today)}
+                        onLoadMore={() => loadMore('today')}
                         icon={CheckCircle2}
                         color="text-emerald-400"
                         onComplete={handleComplete}
@@ -156,6 +182,9 @@ const Timeline = () => {
                     <SectionData
                         title="Upcoming"
                         tasks={data.upcoming}
+                        total={data.counts.upcoming}
+                        hasMore={Boolean(data.next.upcoming)}
+                        onLoadMore={() => loadMore('upcoming')}
                         icon={CalIcon}
                         color="text-blue-400"
                         onComplete={handleComplete}